@@ -5,15 +5,14 @@ Plugin de Regras Corporativas - AcmeCorp
 Implementa regras específicas da empresa para validação de código Odoo.
 
 Regras implementadas:
-1. Modelos devem ter prefixo 'acme_' no _name
+1. Modelos devem ter prefixo 'acme_' no _name (acme_corporate_rules.toml)
 2. Campos monetários devem ter currency_field definido
-3. Métodos de ação devem ter docstrings descritivos
-4. Views devem seguir padrão de nomenclatura específico
+3. Métodos de ação devem ter docstrings descritivos (acme_corporate_rules.toml)
+4. Views devem seguir padrão de nomenclatura específico (acme_corporate_rules.toml)
 5. Segurança deve incluir grupos corporativos específicos
 """
 
 import re
-import ast
 from pathlib import Path
 import sys
 
@@ -26,17 +25,15 @@ from framework.validator.plugin import BaseValidatorPlugin, ValidationContext, V
 class AcmeCorporateRulesPlugin(BaseValidatorPlugin):
     name = "acme_corporate_rules"
     description = "Regras corporativas AcmeCorp para desenvolvimento Odoo"
+    # Arquivos processados por este plugin (roteados pelo PluginManager)
+    file_patterns = ('.py', '.xml', 'ir.model.access.csv')
+    # Só guarda configuração em self; pode validar vários módulos ao mesmo tempo
+    reentrant = True
 
     def __init__(self):
         # Configurações da empresa
         self.company_prefix = "acme_"
         self.required_groups = ["acme_base.group_user", "acme_base.group_manager"]
-        self.forbidden_patterns = ["print(", "breakpoint(", "pdb.set_trace"]
-        self.required_docstring_methods = ["action_", "button_", "compute_"]
-
-    def supports(self, file_path: Path, context: ValidationContext) -> bool:
-        """Define quais arquivos este plugin deve processar"""
-        return file_path.suffix in {'.py', '.xml', '.csv'} or file_path.name == '__manifest__.py'
 
     def validate_file(self, file_path: Path, context: ValidationContext):
         """Validação principal do arquivo"""
@@ -56,7 +53,7 @@ class AcmeCorporateRulesPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             
             # Verificar se o nome do módulo segue padrão corporativo
             if context.module_name and not context.module_name.startswith(self.company_prefix):
@@ -88,24 +85,12 @@ class AcmeCorporateRulesPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # 1. Verificar padrões proibidos
-            for pattern in self.forbidden_patterns:
-                if pattern in content:
-                    result.add_error(
-                        f"Padrão proibido '{pattern}' encontrado em {file_path}"
-                    )
+            content = context.get_source(file_path).text
             
-            # 2. Verificar modelos com prefixo corporativo
-            models = re.findall(r"_name\s*=\s*['\"]([^'\"]+)['\"]", content)
-            for model in models:
-                if not model.startswith(self.company_prefix):
-                    result.add_error(
-                        f"Model '{model}' deve ter prefixo corporativo '{self.company_prefix}' em {file_path}"
-                    )
-            
-            # 3. Verificar campos monetários
+            # Padrões proibidos, prefixo de modelos e docstrings de métodos de ação
+            # estão em acme_corporate_rules.toml.
+
+            # Verificar campos monetários
             monetary_fields = re.findall(r"(\w+)\s*=\s*fields\.Monetary\([^)]*\)", content)
             for field_name in monetary_fields:
                 if 'currency_field' not in content:
@@ -113,20 +98,6 @@ class AcmeCorporateRulesPlugin(BaseValidatorPlugin):
                         f"Campo monetário '{field_name}' deve especificar currency_field em {file_path}"
                     )
             
-            # 4. Verificar docstrings em métodos de ação
-            try:
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        for prefix in self.required_docstring_methods:
-                            if node.name.startswith(prefix):
-                                if not ast.get_docstring(node):
-                                    result.add_warning(
-                                        f"Método '{node.name}' deve ter docstring descritivo em {file_path}"
-                                    )
-            except SyntaxError:
-                pass  # Ignora erros de sintaxe, outros validadores cuidam disso
-                
         except Exception as exc:
             result.add_error(f"Erro ao validar Python {file_path}: {exc}")
             
@@ -137,25 +108,11 @@ class AcmeCorporateRulesPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             
-            # 1. Verificar padrão de nomenclatura de views
-            view_ids = re.findall(r'<record[^>]+id="([^"]+)"[^>]*model="ir\.ui\.view"', content)
-            for view_id in view_ids:
-                if not view_id.startswith(self.company_prefix):
-                    result.add_warning(
-                        f"View ID '{view_id}' deve ter prefixo corporativo '{self.company_prefix}' em {file_path}"
-                    )
-            
-            # 2. Verificar actions com padrão corporativo
-            action_ids = re.findall(r'<record[^>]+id="([^"]+)"[^>]*model="ir\.actions\.act_window"', content)
-            for action_id in action_ids:
-                if not action_id.startswith(self.company_prefix):
-                    result.add_warning(
-                        f"Action ID '{action_id}' deve ter prefixo corporativo '{self.company_prefix}' em {file_path}"
-                    )
-            
-            # 3. Verificar se menuitem tem grupos apropriados
+            # Prefixos de IDs de views e actions estão em acme_corporate_rules.toml.
+
+            # Verificar se menuitem tem grupos apropriados
             menuitems = re.findall(r'<menuitem[^>]*groups="([^"]+)"', content)
             for groups in menuitems:
                 has_corporate_group = any(group.strip().startswith('acme_') for group in groups.split(','))
@@ -174,7 +131,7 @@ class AcmeCorporateRulesPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             lines = content.strip().split('\n')
             
             if len(lines) < 2:  # Header + pelo menos uma linha
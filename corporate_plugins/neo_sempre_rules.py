@@ -28,6 +28,10 @@ from framework.validator.plugin import BaseValidatorPlugin, ValidationContext, V
 class NeoSempreValidationPlugin(BaseValidatorPlugin):
     name = "neo_sempre_rules"
     description = "Regras corporativas Neo Sempre para sistema INSS de beneficiários"
+    # Arquivos processados por este plugin (roteados pelo PluginManager)
+    file_patterns = ('.py', '.xml', 'ir.model.access.csv')
+    # Só guarda configuração em self; pode validar vários módulos ao mesmo tempo
+    reentrant = True
 
     def __init__(self):
         # Configurações da empresa Neo Sempre
@@ -51,16 +55,11 @@ class NeoSempreValidationPlugin(BaseValidatorPlugin):
         self.monetary_fields = ['margem_consignavel', 'valor_beneficio', 'comprometimento_emprestimo']
 
     def supports(self, file_path: Path, context: ValidationContext) -> bool:
-        """Define quais arquivos este plugin deve processar"""
-        # Processa apenas arquivos de módulos Neo Sempre
-        module_path = str(file_path)
-        
-        # Verifica se está em um dos módulos da empresa
-        for prefix in self.allowed_module_prefixes:
-            if f"/{prefix}/" in module_path or f"\\{prefix}\\" in module_path:
-                return file_path.suffix in {'.py', '.xml', '.csv'} or file_path.name == '__manifest__.py'
-        
-        return False
+        """Filtro fino: apenas arquivos de módulos Neo Sempre.
+
+        O tipo de arquivo já é filtrado por ``file_patterns``.
+        """
+        return any(part in self.allowed_module_prefixes for part in file_path.parts)
 
     def validate_file(self, file_path: Path, context: ValidationContext):
         """Validação principal do arquivo"""
@@ -80,7 +79,7 @@ class NeoSempreValidationPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             
             # Verificar se tem autor definido
             if self.company_name not in content and 'author' in content:
@@ -122,7 +121,7 @@ class NeoSempreValidationPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             
             # Verificar se usa campo correto para CPF
             if 'cpf' in content.lower() and 'field' in content.lower():
@@ -182,7 +181,7 @@ class NeoSempreValidationPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             
             # Verificar uso correto de <list> em vez de <tree> (Odoo 18+)
             if '<tree' in content and 'string=' in content:
@@ -226,7 +225,7 @@ class NeoSempreValidationPlugin(BaseValidatorPlugin):
         result = ValidationResult()
         
         try:
-            content = file_path.read_text(encoding='utf-8')
+            content = context.get_source(file_path).text
             lines = content.strip().split('\n')
             
             if not lines or len(lines) < 2:
@@ -11,6 +11,8 @@ from typing import Dict, Iterable, List, Optional
 
 from .rules import DEPRECATED_DEPENDENCIES, LEGACY_DIRECTORIES, LEGACY_JS_PATTERNS, MIGRATION_TASKS
 from framework.validator import Odoo18Validator
+from framework.validator.module_graph import parse_manifest
+from framework.validator.source import SourceFile
 
 
 @dataclass
@@ -247,13 +249,7 @@ class MigrationAnalyzer:
 
     # ------------------------------------------------------------------
     def _parse_manifest(self, manifest: Path) -> Dict[str, object]:
-        text = manifest.read_text(encoding='utf-8')
-        module = ast.parse(text, filename=str(manifest))
-        for node in module.body:
-            if isinstance(node, ast.Assign):
-                value = getattr(node, 'value', None)
-                if isinstance(value, ast.Dict):
-                    return ast.literal_eval(value)
-            if isinstance(node, ast.Expr) and isinstance(getattr(node, 'value', None), ast.Dict):
-                return ast.literal_eval(node.value)
-        raise ValueError("Manifest must assign a dict to a variable or expose a dict literal")
+        data = parse_manifest(SourceFile(manifest))
+        if data is None:
+            raise ValueError("Manifest must assign a dict to a variable or expose a dict literal")
+        return data
@@ -1,14 +1,43 @@
-"""Validator package exposing the pluggable API."""
-
-from .plugin import ValidationContext, ValidationResult, ValidatorPlugin
-from .plugin_manager import PluginManager
-from .validate import Odoo18Validator, validate_path
-
-__all__ = [
-    "Odoo18Validator",
-    "ValidationContext",
-    "ValidationResult",
-    "ValidatorPlugin",
-    "PluginManager",
-    "validate_path",
-]
+"""Validator package exposing the pluggable API.
+
+The names below are imported on first use, so that importing one module of
+the package (e.g. the daemon ``client``) does not load all of them.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "Diagnostic": ".diagnostics",
+    "FileInventory": ".inventory",
+    "FileSymbols": ".symbols",
+    "Odoo18Validator": ".validate",
+    "ValidationCache": ".cache",
+    "ValidationContext": ".plugin",
+    "ValidationResult": ".plugin",
+    "ValidatorPlugin": ".plugin",
+    "VirtualFileTree": ".virtual",
+    "PluginManager": ".plugin_manager",
+    "Profiler": ".profiling",
+    "RulePack": ".rulepacks",
+    "RulePackPlugin": ".rulepacks",
+    "SourceFile": ".source",
+    "SymbolIndex": ".symbols",
+    "load_rule_pack": ".rulepacks",
+    "validate_path": ".validate",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> Any:
+    return sorted([*globals(), *_EXPORTS])
@@ -0,0 +1,73 @@
+"""Modules of an Odoo addons path, as configured in ``odoo.conf`` (``validate.py --odoo-conf``)."""
+
+from __future__ import annotations
+
+import configparser
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+
+class AddonsPathError(ValueError):
+    """Raised when an ``odoo.conf`` has no usable ``addons_path``."""
+
+
+class AddonsPath:
+    """Addons directories, in priority order, and the modules they provide."""
+
+    def __init__(self, directories: Iterable[Path]) -> None:
+        self.directories: List[Path] = []
+        for directory in directories:
+            if directory not in self.directories:
+                self.directories.append(directory)
+        # Missing directories and shadowed modules noticed by ``modules``.
+        self.issues: List[str] = []
+
+    @classmethod
+    def from_conf(cls, conf_path: Path) -> "AddonsPath":
+        """Read ``addons_path`` from the ``[options]`` section of ``conf_path``.
+
+        Odoo resolves relative entries against its working directory; projects
+        run Odoo from the directory holding ``odoo.conf``, so they are
+        resolved against that directory here.
+        """
+        parser = configparser.RawConfigParser()
+        try:
+            with open(conf_path, encoding='utf-8') as handle:
+                parser.read_file(handle)
+        except (OSError, configparser.Error) as exc:
+            raise AddonsPathError(f"{conf_path}: cannot read Odoo configuration ({exc})") from exc
+        value = parser.get('options', 'addons_path', fallback='').strip()
+        if not value:
+            raise AddonsPathError(f"{conf_path}: no addons_path in the [options] section")
+        base = conf_path.parent
+        return cls(
+            base / os.path.expanduser(os.path.expandvars(entry.strip()))
+            for entry in value.split(',')
+            if entry.strip()
+        )
+
+    def modules(self) -> List[Path]:
+        """Module roots (directories holding a ``__manifest__.py``), directory by directory.
+
+        Like Odoo, a module name provided by an earlier directory hides the
+        modules of the same name further down the path; those are skipped.
+        """
+        self.issues = []
+        found: Dict[str, Path] = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as iterator:
+                    names = sorted(entry.name for entry in iterator if entry.is_dir() and not entry.name.startswith('.'))
+            except OSError:
+                self.issues.append(f"Addons directory not found: {directory}")
+                continue
+            for name in names:
+                root = directory / name
+                if not (root / '__manifest__.py').is_file():
+                    continue
+                if name in found:
+                    self.issues.append(f"Skipped module {root}: shadowed by {found[name]} earlier in addons_path")
+                    continue
+                found[name] = root
+        return list(found.values())
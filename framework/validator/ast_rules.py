@@ -0,0 +1,171 @@
+"""Single-pass AST rule engine for Python checks.
+
+Rules register handlers for the node types they care about. The engine then
+walks a module's tree once and dispatches every node to its handlers, so the
+total cost stays linear in the size of the file regardless of how many rules
+are active.
+"""
+
+from __future__ import annotations
+
+import ast
+from collections import defaultdict
+from time import perf_counter
+from typing import Any, Callable, DefaultDict, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+Handler = Callable[[ast.AST, "VisitScope"], None]
+Reporter = Callable[[str, ast.AST, str], None]
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+class Frame:
+    """An enclosing class or function plus scratch space for rules."""
+
+    __slots__ = ('node', 'data')
+
+    def __init__(self, node: ast.AST) -> None:
+        self.node = node
+        self.data: Dict[str, Any] = {}
+
+
+class VisitScope:
+    """Traversal state handed to rule handlers."""
+
+    def __init__(self, reporter: Reporter) -> None:
+        self.classes: List[Frame] = []
+        self.functions: List[Frame] = []
+        self.rule_id = ''
+        self._reporter = reporter
+
+    @property
+    def function(self) -> Optional[Frame]:
+        return self.functions[-1] if self.functions else None
+
+    @property
+    def klass(self) -> Optional[Frame]:
+        return self.classes[-1] if self.classes else None
+
+    def report(self, node: ast.AST, message: str) -> None:
+        self._reporter(self.rule_id, node, message)
+
+
+class PythonRuleEngine:
+    """Registry of node-type handlers evaluated in one traversal."""
+
+    def __init__(self) -> None:
+        self._enter: DefaultDict[Type[ast.AST], List[Tuple[str, Handler]]] = defaultdict(list)
+        self._leave: DefaultDict[Type[ast.AST], List[Tuple[str, Handler]]] = defaultdict(list)
+
+    def register(
+        self,
+        rule_id: str,
+        node_types: Union[Type[ast.AST], Iterable[Type[ast.AST]]],
+        handler: Handler,
+        *,
+        on_leave: bool = False,
+    ) -> None:
+        """Call ``handler`` for each node of ``node_types``, before or after its children."""
+        if isinstance(node_types, type):
+            node_types = (node_types,)
+        table = self._leave if on_leave else self._enter
+        for node_type in node_types:
+            table[node_type].append((rule_id, handler))
+
+    def rule(self, rule_id: str, *node_types: Type[ast.AST], on_leave: bool = False) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.register(rule_id, node_types, handler, on_leave=on_leave)
+            return handler
+        return decorator
+
+    @property
+    def rule_ids(self) -> List[str]:
+        seen: Dict[str, None] = {}
+        for table in (self._enter, self._leave):
+            for handlers in table.values():
+                for rule_id, _ in handlers:
+                    seen.setdefault(rule_id)
+        return list(seen)
+
+    def run(self, tree: ast.AST, reporter: Reporter, *, timings: Optional[Dict[str, List[float]]] = None) -> None:
+        """Walk ``tree`` once; with ``timings``, add ``[calls, seconds]`` per rule id to it."""
+        enter, leave = self._enter, self._leave
+        if timings is not None:
+            enter = _timed_handlers(enter, timings)
+            leave = _timed_handlers(leave, timings)
+        RuleVisitor(enter, leave, VisitScope(reporter)).visit(tree)
+
+
+def _timed_handlers(
+    table: Dict[Type[ast.AST], List[Tuple[str, Handler]]],
+    timings: Dict[str, List[float]],
+) -> Dict[Type[ast.AST], List[Tuple[str, Handler]]]:
+    """Copy of a handler table whose handlers record their calls and time in ``timings``."""
+    def timed(rule_id: str, handler: Handler) -> Handler:
+        stats = timings.setdefault(rule_id, [0, 0.0])
+
+        def run_handler(node: ast.AST, scope: VisitScope) -> None:
+            started = perf_counter()
+            try:
+                handler(node, scope)
+            finally:
+                stats[0] += 1
+                stats[1] += perf_counter() - started
+        return run_handler
+
+    return {
+        node_type: [(rule_id, timed(rule_id, handler)) for rule_id, handler in handlers]
+        for node_type, handlers in table.items()
+    }
+
+
+class RuleVisitor(ast.NodeVisitor):
+    """Depth-first visitor dispatching nodes to registered handlers.
+
+    Traversal uses an explicit stack so deeply nested expressions (long
+    string concatenations, generated code) cannot hit the recursion limit.
+    """
+
+    def __init__(
+        self,
+        enter: Dict[Type[ast.AST], List[Tuple[str, Handler]]],
+        leave: Dict[Type[ast.AST], List[Tuple[str, Handler]]],
+        scope: VisitScope,
+    ) -> None:
+        self._enter = enter
+        self._leave = leave
+        self.scope = scope
+
+    def visit(self, node: ast.AST) -> None:
+        scope = self.scope
+        enter = self._enter
+        leave = self._leave
+        stack: List[Tuple[ast.AST, bool]] = [(node, False)]
+        while stack:
+            current, leaving = stack.pop()
+            node_type = type(current)
+            if leaving:
+                for rule_id, handler in leave.get(node_type, ()):
+                    scope.rule_id = rule_id
+                    handler(current, scope)
+                if node_type is ast.ClassDef:
+                    scope.classes.pop()
+                elif node_type in FUNCTION_NODES:
+                    scope.functions.pop()
+                continue
+
+            if node_type is ast.ClassDef:
+                scope.classes.append(Frame(current))
+                stack.append((current, True))
+            elif node_type in FUNCTION_NODES:
+                scope.functions.append(Frame(current))
+                stack.append((current, True))
+            elif node_type in leave:
+                stack.append((current, True))
+            for rule_id, handler in enter.get(node_type, ()):
+                scope.rule_id = rule_id
+                handler(current, scope)
+
+            children = list(ast.iter_child_nodes(current))
+            children.reverse()
+            stack.extend((child, False) for child in children)
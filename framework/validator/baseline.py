@@ -0,0 +1,135 @@
+"""Known-findings baseline for legacy code (``validate.py --baseline``).
+
+A baseline file stores a fingerprint for every error and warning of an
+earlier run. Each fingerprint hashes the rule id (or the message when the
+finding has no rule), the file path relative to the working directory, the
+message with paths and line numbers removed, and the whitespace-normalized
+source line, except for file-level findings, whose line is no anchor. Line
+numbers themselves are left out, so the fingerprints survive code being
+added above a finding. Findings whose fingerprint is in the baseline are
+dropped with one set lookup each; only new findings are reported. Counts
+are kept per fingerprint, so a second identical finding is still reported
+as new.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .diagnostics import ERROR, FIX, Diagnostic, DiagnosticStore
+from .plugin import ValidationResult
+
+DEFAULT_BASELINE_PATH = Path('.neodoo') / 'baseline.json'
+
+# Bump when the fingerprint composition changes; older baselines are then rejected.
+BASELINE_FORMAT = 2
+
+# Rules that report on a whole file, at its first line: whatever that line
+# holds is not what they found, so it is left out of their fingerprints.
+FILE_LEVEL_RULES = frozenset({'utf8_header'})
+
+_LOCATION = re.compile(r'<path>(?::\d+){1,2}')
+_SPACES = re.compile(r'\s+')
+
+
+class BaselineError(ValueError):
+    """Raised when a baseline file cannot be read."""
+
+
+class Baseline:
+    """Fingerprints of known findings, with how many times each was seen."""
+
+    def __init__(self, counts: Optional[Dict[str, int]] = None) -> None:
+        self.counts: Dict[str, int] = dict(counts or {})
+        self._seen: Dict[str, int] = {}
+        self._lines_path: Optional[str] = None
+        self._lines: List[str] = []
+        self.suppressed = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Baseline":
+        """Read ``path``; a missing file is an empty baseline."""
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as exc:
+            raise BaselineError(f"{path}: cannot read baseline ({exc})") from exc
+        if not isinstance(data, dict) or data.get('format') != BASELINE_FORMAT:
+            raise BaselineError(f"{path}: unsupported baseline format; regenerate it with --update-baseline")
+        return cls(data.get('fingerprints') or {})
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'format': BASELINE_FORMAT, 'fingerprints': dict(sorted(self.counts.items()))}
+        path.write_text(json.dumps(data, indent=1) + '\n', encoding='utf-8')
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    # ------------------------------------------------------------------
+    def record(self, result: ValidationResult) -> None:
+        """Add the errors and warnings of ``result`` to the baseline."""
+        for diagnostic in result.diagnostics:
+            if diagnostic.severity != 'fix':
+                key = self.fingerprint(diagnostic)
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def filter(self, result: ValidationResult) -> ValidationResult:
+        """Drop the findings of ``result`` that are in the baseline (in place); returns ``result``."""
+        store = result.diagnostics
+        keep: List[int] = []
+        for index in range(len(store)):
+            if store.severities[index] == FIX:
+                keep.append(index)
+                continue
+            key = self.fingerprint(store[index])
+            seen = self._seen.get(key, 0) + 1
+            self._seen[key] = seen
+            if seen > self.counts.get(key, 0):
+                keep.append(index)
+        if len(keep) == len(store):
+            return result
+        self.suppressed += len(store) - len(keep)
+        kept = DiagnosticStore()
+        for index in keep:
+            kept.append(
+                store.severities[index], store.templates[index], store.args[index] or (),
+                store.rules[index], store.paths[index], store.lines[index], store.cols[index],
+            )
+        result.diagnostics = kept
+        result.is_valid = not kept.count(ERROR)
+        return result
+
+    # ------------------------------------------------------------------
+    def fingerprint(self, diagnostic: Diagnostic) -> str:
+        path = str(diagnostic.path) if diagnostic.path is not None else ''
+        message = diagnostic.message
+        if path:
+            message = message.replace(os.path.abspath(path), '<path>').replace(path, '<path>')
+            message = _LOCATION.sub('<path>', message)
+        if diagnostic.line:
+            message = re.sub(rf'\b{diagnostic.line}\b', '#', message)
+        relative = os.path.relpath(os.path.abspath(path)).replace(os.sep, '/') if path else ''
+        anchored = path and diagnostic.line and diagnostic.rule not in FILE_LEVEL_RULES
+        snippet = self._snippet(path, diagnostic.line) if anchored else ''
+        digest = hashlib.sha1('\0'.join((diagnostic.rule or '', relative, message, snippet)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _snippet(self, path: str, line: int) -> str:
+        # Results arrive file by file, so remembering the last file read is enough.
+        if path != self._lines_path:
+            try:
+                with open(path, encoding='utf-8', errors='replace') as handle:
+                    self._lines = handle.read().split('\n')
+            except OSError:
+                self._lines = []
+            self._lines_path = path
+        if line > len(self._lines):
+            return ''
+        return _SPACES.sub(' ', self._lines[line - 1]).strip()
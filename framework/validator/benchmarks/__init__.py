@@ -0,0 +1,13 @@
+"""Validator throughput benchmarks over synthetic Odoo module trees."""
+
+from .corpus import Corpus, CorpusSpec, generate_corpus
+from .runner import SCENARIOS, compare, run_benchmarks
+
+__all__ = [
+    "Corpus",
+    "CorpusSpec",
+    "SCENARIOS",
+    "compare",
+    "generate_corpus",
+    "run_benchmarks",
+]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Run the validator benchmarks: ``python3 -m framework.validator.benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from framework.validator.benchmarks.corpus import CorpusSpec, generate_corpus  # type: ignore[import-not-found]
+    from framework.validator.benchmarks.runner import DEFAULT_TOLERANCE, SCENARIOS, compare, format_report, run_benchmarks, same_corpus  # type: ignore[import-not-found]
+else:
+    from .corpus import CorpusSpec, generate_corpus
+    from .runner import DEFAULT_TOLERANCE, SCENARIOS, compare, format_report, run_benchmarks, same_corpus
+
+DEFAULT_CORPUS_DIR = Path('.neodoo') / 'benchmark-corpus'
+DEFAULT_BASELINE = Path('.neodoo') / 'benchmark-baseline.json'
+
+
+def main() -> None:
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description="Benchmark the Neodoo18Framework validator on a synthetic addons tree")
+    parser.add_argument('--corpus-dir', default=str(DEFAULT_CORPUS_DIR), help=f"Where to generate the corpus (default: {DEFAULT_CORPUS_DIR})")
+    parser.add_argument('--modules', type=int, default=defaults.modules, help=f"Number of modules (default: {defaults.modules})")
+    parser.add_argument('--models', type=int, default=defaults.models, help=f"Models per module (default: {defaults.models})")
+    parser.add_argument('--fields', type=int, default=defaults.fields, help=f"Generated fields per model (default: {defaults.fields})")
+    parser.add_argument('--records', type=int, default=defaults.records, help=f"Data records per model (default: {defaults.records})")
+    parser.add_argument('--seed', type=int, default=defaults.seed, help="Seed of the corpus generator")
+    parser.add_argument('--regenerate', action='store_true', help="Regenerate the corpus even if one with the same spec exists")
+    parser.add_argument('--generate-only', action='store_true', help="Generate the corpus and exit")
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help="Scenario to run; repeatable (default: all)")
+    parser.add_argument('--jobs', '-j', type=int, default=0, help="Worker processes for the parallel scenario (0 = one per CPU)")
+    parser.add_argument('--repeat', type=int, default=1, help="Run each scenario N times and keep the fastest")
+    parser.add_argument('--output', '-o', metavar='FILE', help="Write the JSON report to FILE")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help=f"Baseline report to compare against (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the new baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help=f"Allowed relative regression per metric (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(modules=args.modules, models=args.models, fields=args.fields, records=args.records, seed=args.seed)
+    if min(spec.modules, spec.models) < 1 or min(spec.fields, spec.records) < 0:
+        parser.error("--modules and --models must be at least 1, --fields and --records at least 0")
+    corpus = generate_corpus(Path(args.corpus_dir), spec, force=args.regenerate)
+    print(f"Corpus at {corpus.root}: {corpus.files} files, {corpus.bytes / 1e6:.1f} MB")
+    if args.generate_only:
+        sys.exit(0)
+
+    report = run_benchmarks(corpus, scenarios=args.scenario or list(SCENARIOS), jobs=args.jobs, repeat=args.repeat)
+    print(format_report(report))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        print(f"Baseline written to {baseline_path}")
+        sys.exit(0)
+    if not baseline_path.is_file():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to store one")
+        sys.exit(0)
+
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    if not same_corpus(report, baseline):
+        print(f"Baseline {baseline_path} was measured on a different corpus spec; not compared")
+        sys.exit(0)
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print("Performance regressions against the baseline:")
+        for line in regressions:
+            print(f" - {line}")
+        sys.exit(1)
+    print(f"No regressions against {baseline_path} (tolerance {args.tolerance:.0%})")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Synthetic addons trees for the validator benchmarks.
+
+``generate_corpus`` writes ``CorpusSpec.modules`` modules built from the
+``templates/advanced`` module: every model is a copy of ``template_model.py``
+with extra generated fields, its views, menus and security are the template's
+with the names substituted, and each model gets a data file of
+``CorpusSpec.records`` records. Output depends only on the spec, so two runs
+with the same spec produce byte-identical trees.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[3] / 'templates' / 'advanced'
+
+# Written at the corpus root; lets the runner reuse a tree generated from the same spec.
+SPEC_FILE = '.neodoo-benchmark.json'
+
+_FIELD_TYPES = (
+    ('Char', "fields.Char(string='{label}')", 'Value {n}'),
+    ('Text', "fields.Text(string='{label}')", 'Generated description {n} for benchmarking the validator.'),
+    ('Integer', "fields.Integer(string='{label}')", '{n}'),
+    ('Float', "fields.Float(string='{label}', digits=(16, 2))", '{n}.5'),
+    ('Boolean', "fields.Boolean(string='{label}')", None),
+    ('Date', "fields.Date(string='{label}')", None),
+    ('Many2one', "fields.Many2one('res.partner', string='{label}')", None),
+)
+_STATES = ('draft', 'confirmed', 'done')
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a generated corpus."""
+
+    modules: int = 20
+    models: int = 5  # per module
+    fields: int = 20  # generated fields per model, on top of the template's
+    records: int = 200  # data records per model
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class Corpus:
+    """A generated tree: its root, spec, and the files and bytes it holds."""
+
+    root: Path
+    spec: CorpusSpec
+    files: int
+    bytes: int
+
+
+def module_name(index: int) -> str:
+    return f"bench_mod_{index:03d}"
+
+
+def generate_corpus(target: Path, spec: CorpusSpec, *, force: bool = False) -> Corpus:
+    """Write the corpus described by ``spec`` under ``target``.
+
+    An existing corpus generated from the same spec is reused unless
+    ``force`` is set; any other content of ``target`` is replaced.
+    """
+    target = Path(target)
+    marker = target / SPEC_FILE
+    if not force and marker.is_file():
+        try:
+            stored = json.loads(marker.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            stored = None
+        if stored and stored.get('spec') == spec.to_dict():
+            return Corpus(target, spec, stored['files'], stored['bytes'])
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+
+    templates = _read_templates()
+    files = 0
+    size = 0
+    for index in range(spec.modules):
+        for relative, content in _module_files(index, spec, templates):
+            path = target / module_name(index) / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = content.encode('utf-8')
+            path.write_bytes(data)
+            files += 1
+            size += len(data)
+    marker.write_text(json.dumps({'spec': spec.to_dict(), 'files': files, 'bytes': size}, indent=2) + '\n', encoding='utf-8')
+    return Corpus(target, spec, files, size)
+
+
+# ----------------------------------------------------------------------
+def _read_templates() -> Dict[str, str]:
+    names = (
+        '__manifest__.py',
+        'models/template_model.py',
+        'views/views.xml',
+        'views/menu.xml',
+        'security/security.xml',
+        'demo/demo_data.xml',
+        'tests/test_template_model.py',
+    )
+    return {name: (TEMPLATE_DIR / name).read_text(encoding='utf-8') for name in names}
+
+
+def _module_files(index: int, spec: CorpusSpec, templates: Dict[str, str]) -> List[Tuple[str, str]]:
+    name = module_name(index)
+    rng = random.Random(f"{spec.seed}:{name}")
+    models = [_model(name, k, spec.fields, rng) for k in range(spec.models)]
+    first = models[0]
+
+    files: List[Tuple[str, str]] = []
+    data_files = ['security/security.xml', 'security/ir.model.access.csv']
+    for model in models:
+        data_files += [f"views/{model.stem}_views.xml", f"views/{model.stem}_menu.xml", f"data/{model.stem}_data.xml"]
+        files.append((f"models/{model.stem}.py", _python_model(templates['models/template_model.py'], model)))
+        files.append((f"views/{model.stem}_views.xml", _views(templates['views/views.xml'], model)))
+        files.append((f"views/{model.stem}_menu.xml", model.substitute(templates['views/menu.xml'])))
+        files.append((f"data/{model.stem}_data.xml", _data(model, spec.records, rng)))
+
+    # Earlier modules only, so the dependency graph stays acyclic.
+    depends = ['base', 'mail'] + [module_name(dep) for dep in sorted(rng.sample(range(index), min(index, 2)))]
+    files += [
+        ('__manifest__.py', _manifest(templates['__manifest__.py'], name, depends, data_files)),
+        ('__init__.py', "# -*- coding: utf-8 -*-\nfrom . import models\nfrom . import wizard\n"),
+        ('models/__init__.py', "# -*- coding: utf-8 -*-\n" + ''.join(f"from . import {m.stem}\n" for m in models)),
+        ('wizard/__init__.py', "# -*- coding: utf-8 -*-\n# Empty init file for wizard directory\n"),
+        ('security/security.xml', first.substitute(templates['security/security.xml']).replace('group_template_', f"group_{name}_")),
+        ('security/ir.model.access.csv', _access_csv(name, models)),
+        ('demo/demo_data.xml', first.substitute(templates['demo/demo_data.xml'])),
+        ('tests/__init__.py', "# -*- coding: utf-8 -*-\nfrom . import test_template_model\n"),
+        ('tests/test_template_model.py', first.substitute(templates['tests/test_template_model.py'])),
+    ]
+    return files
+
+
+class _Model:
+    """Names of one generated model and its extra ``(name, type)`` fields."""
+
+    def __init__(self, module: str, index: int, fields: List[Tuple[str, int]]) -> None:
+        self.name = f"{module}.record{index}"
+        self.stem = self.name.replace('.', '_')
+        self.class_name = ''.join(part.title() for part in self.stem.split('_'))
+        self.fields = fields
+
+    def substitute(self, text: str) -> str:
+        text = text.replace('template.model', self.name)
+        text = text.replace('template_model', self.stem)
+        text = text.replace('TemplateModel', self.class_name)
+        return text.replace('menu_template_', f"menu_{self.stem}_")
+
+
+def _model(module: str, index: int, count: int, rng: random.Random) -> _Model:
+    return _Model(module, index, [(f"x_field_{n:03d}", rng.randrange(len(_FIELD_TYPES))) for n in range(count)])
+
+
+def _python_model(template: str, model: _Model) -> str:
+    lines = []
+    for name, kind in model.fields:
+        label = name.replace('_', ' ').title()
+        lines.append(f"    {name} = {_FIELD_TYPES[kind][1].format(label=label)}\n")
+    text = model.substitute(template).rstrip('\n') + '\n'
+    # The template ends inside the class body, so the fields land in the class.
+    return text + '\n' + ''.join(lines)
+
+
+def _views(template: str, model: _Model) -> str:
+    text = model.substitute(template)
+    list_fields = ''.join(f'                <field name="{name}" optional="show"/>\n' for name, _ in model.fields[:8])
+    form_fields = ''.join(f'                            <field name="{name}"/>\n' for name, _ in model.fields)
+    text = re.sub(r'(<list string="[^"]*">\n)', lambda m: m.group(1) + list_fields, text, count=1)
+    return text.replace('                            <!-- Additional fields can be added here -->\n', form_fields, 1)
+
+
+def _data(model: _Model, count: int, rng: random.Random) -> str:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<odoo>\n    <data noupdate="1">\n']
+    for n in range(count):
+        parts.append(f'        <record id="{model.stem}_data_{n}" model="{model.name}">\n')
+        parts.append(f'            <field name="name">Record {n}</field>\n')
+        parts.append(f'            <field name="state">{_STATES[rng.randrange(3)]}</field>\n')
+        parts.append(f"""            <field name="date" eval="(DateTime.today() - timedelta(days={rng.randrange(365)})).strftime('%Y-%m-%d')"/>\n""")
+        for name, kind in model.fields:
+            value = _FIELD_TYPES[kind][2]
+            if kind == 4:
+                parts.append(f'            <field name="{name}" eval="{rng.random() < 0.5}"/>\n')
+            elif kind == 6:
+                parts.append(f'            <field name="{name}" ref="base.partner_admin"/>\n')
+            elif value is not None:
+                parts.append(f'            <field name="{name}">{value.format(n=rng.randrange(100000))}</field>\n')
+        parts.append('        </record>\n')
+    parts.append('    </data>\n</odoo>\n')
+    return ''.join(parts)
+
+
+def _access_csv(module: str, models: List[_Model]) -> str:
+    rows = ['id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink']
+    for model in models:
+        rows.append(f"access_{model.stem}_user,access_{model.stem}_user,model_{model.stem},group_{module}_user,1,1,1,0")
+        rows.append(f"access_{model.stem}_manager,access_{model.stem}_manager,model_{model.stem},group_{module}_manager,1,1,1,1")
+    return '\n'.join(rows) + '\n'
+
+
+def _manifest(template: str, module: str, depends: List[str], data_files: List[str]) -> str:
+    replacements = {
+        '{{MODULE_NAME}}': module.replace('_', ' ').title(),
+        '{{CATEGORY}}': 'Benchmark',
+        '{{SUMMARY}}': 'Synthetic module for validator benchmarks',
+        '{{AUTHOR}}': 'Neodoo18Framework',
+        '{{WEBSITE}}': 'https://example.com',
+    }
+    for placeholder, value in replacements.items():
+        template = template.replace(placeholder, value)
+    template = re.sub(
+        r"'depends': \[.*?\]",
+        lambda _: "'depends': [\n" + ''.join(f"        '{dep}',\n" for dep in depends) + "    ]",
+        template,
+        count=1,
+        flags=re.S,
+    )
+    return re.sub(
+        r"'data': \[.*?\]",
+        lambda _: "'data': [\n" + ''.join(f"        '{path}',\n" for path in data_files) + "    ]",
+        template,
+        count=1,
+        flags=re.S,
+    )
@@ -0,0 +1,184 @@
+"""Timed validator runs over a generated corpus, and baseline comparison.
+
+Each scenario runs ``Odoo18Validator.validate_directory`` on every module of
+the corpus in a forked child process, so its peak RSS (including pool
+workers) is not inflated by earlier scenarios. Where ``fork`` is not
+available the scenarios run in-process and peak RSS is reported as ``None``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+from ..validate import Odoo18Validator
+from .corpus import Corpus
+
+CORPORATE_PLUGINS_DIR = Path(__file__).resolve().parents[3] / 'corporate_plugins'
+
+SCENARIOS = ('cold', 'warm', 'parallel', 'corporate')
+
+# Metrics compared against the baseline, and whether higher values are better.
+METRICS = {'files_per_sec': True, 'mb_per_sec': True, 'peak_rss_mb': False}
+
+DEFAULT_TOLERANCE = 0.15
+
+
+def run_benchmarks(
+    corpus: Corpus,
+    *,
+    scenarios: List[str] = list(SCENARIOS),
+    jobs: int = 0,
+    repeat: int = 1,
+) -> Dict[str, object]:
+    """Run ``scenarios`` on ``corpus`` and return the JSON-ready report.
+
+    With ``repeat`` > 1 each scenario runs that many times and the fastest
+    run is kept, which filters out noise from other processes.
+    """
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    results: Dict[str, Dict[str, object]] = {}
+    cache_dir = Path(tempfile.mkdtemp(prefix='neodoo-bench-cache-'))
+    try:
+        for name in scenarios:
+            if name == 'warm':
+                # Prime the cache in its own process so it does not count towards the warm run's peak RSS.
+                _run_isolated(lambda: _validate_corpus(_build_validator('warm', jobs, cache_dir), corpus))
+            best: Optional[Dict[str, object]] = None
+            for _ in range(max(1, repeat)):
+                measured = _run_isolated(lambda: _validate_corpus(_build_validator(name, jobs, cache_dir), corpus))
+                if best is None or measured['seconds'] < best['seconds']:  # type: ignore[operator]
+                    best = measured
+            results[name] = best  # type: ignore[assignment]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return {
+        'corpus': {**corpus.spec.to_dict(), 'files': corpus.files, 'bytes': corpus.bytes},
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'jobs': jobs,
+        'scenarios': results,
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Describe every metric of ``report`` that is worse than ``baseline`` by more than ``tolerance``.
+
+    Scenarios or metrics missing from either side are skipped, as is any
+    comparison when the two reports were run on different corpus specs.
+    """
+    if not same_corpus(report, baseline):
+        return []
+    regressions: List[str] = []
+    base_scenarios = baseline.get('scenarios') or {}
+    for name, measured in report['scenarios'].items():  # type: ignore[union-attr]
+        previous = base_scenarios.get(name)  # type: ignore[union-attr]
+        if not previous:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            now, then = measured.get(metric), previous.get(metric)
+            if not now or not then:
+                continue
+            change = (now - then) / then
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{name}: {metric} {then:g} -> {now:g} ({change:+.1%}, tolerance {tolerance:.0%})")
+    return regressions
+
+
+def same_corpus(report: Dict[str, object], baseline: Dict[str, object]) -> bool:
+    """Whether both reports were measured on corpora generated from the same spec."""
+    def spec(data: Dict[str, object]) -> Dict[str, object]:
+        corpus = data.get('corpus') or {}
+        return {key: value for key, value in corpus.items() if key not in ('files', 'bytes')}  # type: ignore[union-attr]
+    return spec(report) == spec(baseline)
+
+
+def format_report(report: Dict[str, object]) -> str:
+    corpus = report['corpus']
+    lines = [
+        f"Corpus: {corpus['modules']} modules x {corpus['models']} models, "  # type: ignore[index]
+        f"{corpus['files']} files, {corpus['bytes'] / 1e6:.1f} MB; jobs={report['jobs']}",  # type: ignore[index]
+        f"{'scenario':<10} {'seconds':>9} {'files/s':>9} {'MB/s':>8} {'peak RSS MB':>12}",
+    ]
+    for name, measured in report['scenarios'].items():  # type: ignore[union-attr]
+        rss = measured['peak_rss_mb']
+        lines.append(
+            f"{name:<10} {measured['seconds']:>9.3f} {measured['files_per_sec']:>9.1f} "
+            f"{measured['mb_per_sec']:>8.2f} {'n/a' if rss is None else f'{rss:.1f}':>12}"
+        )
+    return '\n'.join(lines)
+
+
+# ----------------------------------------------------------------------
+def _validate_corpus(validator: Odoo18Validator, corpus: Corpus) -> Dict[str, object]:
+    modules = sorted(path for path in corpus.root.iterdir() if path.is_dir())
+    started = time.perf_counter()
+    findings = 0
+    for module in modules:
+        for result in validator.validate_directory(module):
+            findings += len(result.errors) + len(result.warnings)
+    seconds = time.perf_counter() - started
+    validator.close()
+    return {
+        'seconds': round(seconds, 6),
+        'files_per_sec': round(corpus.files / seconds, 3),
+        'mb_per_sec': round(corpus.bytes / 1e6 / seconds, 3),
+        'findings': findings,
+    }
+
+
+def _build_validator(scenario: str, jobs: int, cache_dir: Path) -> Odoo18Validator:
+    if scenario == 'warm':
+        return Odoo18Validator(cache_dir=cache_dir)
+    if scenario == 'parallel':
+        return Odoo18Validator(jobs=jobs)
+    if scenario == 'corporate':
+        return Odoo18Validator(plugin_dirs=[CORPORATE_PLUGINS_DIR])
+    return Odoo18Validator()
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _run_isolated(run: Callable[[], Dict[str, object]]) -> Dict[str, object]:
+    """Call ``run`` in a forked child and return its result with the child's peak RSS."""
+    if not hasattr(os, 'fork'):
+        return {**run(), 'peak_rss_mb': _peak_rss_mb()}
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        os.close(read_fd)
+        status = 0
+        try:
+            payload = {**run(), 'peak_rss_mb': _peak_rss_mb()}
+        except BaseException:
+            payload = {'error': traceback.format_exc()}
+            status = 1
+        with os.fdopen(write_fd, 'w', encoding='utf-8') as handle:
+            json.dump(payload, handle)
+        os._exit(status)
+    os.close(write_fd)
+    with os.fdopen(read_fd, encoding='utf-8') as handle:
+        raw = handle.read()
+    os.waitpid(pid, 0)
+    payload = json.loads(raw) if raw else {'error': 'benchmark process exited without a result'}
+    if 'error' in payload:
+        raise RuntimeError(f"Benchmark scenario failed:\n{payload['error']}")
+    return payload
@@ -0,0 +1,211 @@
+"""Persistent per-file result cache (and symbol index store) for the Neodoo validator."""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .plugin import ValidationContext, ValidationResult, ValidatorPlugin
+
+DEFAULT_CACHE_DIR = Path('.neodoo') / 'validator-cache'
+
+# Bump when the stored payload layout or key composition changes.
+CACHE_FORMAT = 2
+
+# Returned by ``ValidationCache.get`` when no entry exists (``None`` is a valid cached value).
+MISS = object()
+
+
+def source_digest(*modules: ModuleType) -> str:
+    """Hash the source files of ``modules`` for use in ``cache_fingerprint``."""
+    digest = hashlib.sha256()
+    for module in modules:
+        try:
+            digest.update(Path(inspect.getfile(module)).read_bytes())
+        except (TypeError, OSError):
+            digest.update(module.__name__.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def plugin_fingerprint(plugin: ValidatorPlugin) -> str:
+    """Identify a plugin's behaviour: name, version, source code and runtime config."""
+    # Imported here so that reading the cache settings (``validate.py --daemon``) does not load the plugin machinery.
+    from .plugin_manager import LazyPlugin
+
+    if isinstance(plugin, LazyPlugin):
+        plugin = plugin.resolve()
+    digest = hashlib.sha256()
+    digest.update(plugin.name.encode('utf-8'))
+    digest.update(str(getattr(plugin, 'version', '')).encode('utf-8'))
+    try:
+        source = Path(inspect.getfile(type(plugin)))
+        digest.update(source.read_bytes())
+    except (TypeError, OSError):
+        digest.update(type(plugin).__qualname__.encode('utf-8'))
+    config = getattr(plugin, 'cache_fingerprint', None)
+    if callable(config):
+        digest.update(str(config()).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """SQLite-backed store of plugin results keyed by file content.
+
+    Each entry holds what one plugin returned for one file. Its key combines the
+    file path and content hash, the plugin fingerprint and the context flags.
+    Entries are evicted least-recently-used once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, *, max_entries: int = 100_000) -> None:
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fingerprints: Dict[int, str] = {}
+        self._now = int(time.time())
+
+    # ------------------------------------------------------------------
+    def keys_for(
+        self,
+        file_path: Path,
+        plugins: Sequence[ValidatorPlugin],
+        context: ValidationContext,
+    ) -> List[Optional[str]]:
+        """Return one cache key per plugin, or ``None`` where caching is not allowed."""
+        try:
+            content_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
+        except OSError:
+            return [None] * len(plugins)
+
+        base = json.dumps([
+            CACHE_FORMAT,
+            str(file_path),
+            content_hash,
+            context.module_name,
+            context.strict,
+            context.template_mode,
+            context.verbose,
+        ])
+        keys: List[Optional[str]] = []
+        for plugin in plugins:
+            is_cacheable = getattr(plugin, 'is_cacheable', None)
+            if callable(is_cacheable) and not is_cacheable(file_path):
+                keys.append(None)
+                continue
+            fingerprint = self._fingerprint(plugin)
+            keys.append(hashlib.sha256(f"{base}|{fingerprint}".encode('utf-8')).hexdigest())
+        return keys
+
+    def get(self, key: str) -> object:
+        """Return the cached result (possibly ``None``) or the ``MISS`` sentinel."""
+        row = self._connection().execute('SELECT payload FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return MISS
+        self.hits += 1
+        self._connection().execute('UPDATE entries SET used = ? WHERE key = ?', (self._now, key))
+        payload = json.loads(row[0])
+        return ValidationResult.from_dict(payload) if payload is not None else None
+
+    def put(self, key: str, result: Optional[ValidationResult]) -> None:
+        payload = json.dumps(result.to_dict() if result is not None else None)
+        self._connection().execute(
+            'INSERT OR REPLACE INTO entries (key, payload, used) VALUES (?, ?, ?)',
+            (key, payload, self._now),
+        )
+
+    def flush(self) -> None:
+        """Commit pending writes and evict the least recently used entries."""
+        if self._conn is None:
+            return
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used ASC LIMIT ?)',
+                (overflow,),
+            )
+        self._conn.commit()
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def clear(self) -> None:
+        self._connection().execute('DELETE FROM entries')
+        self._connection().execute('DELETE FROM symbols')
+        self._connection().commit()
+
+    # ------------------------------------------------------------------
+    def load_symbols(self) -> List[Tuple[Path, Path, Dict[str, object]]]:
+        """Stored ``(file, module root, symbols)`` of every file unchanged since it was indexed.
+
+        Entries of files that were deleted or modified since are dropped.
+        """
+        entries: List[Tuple[Path, Path, Dict[str, object]]] = []
+        stale: List[Tuple[str]] = []
+        for path, root, mtime_ns, size, payload in self._connection().execute(
+            'SELECT path, root, mtime_ns, size, payload FROM symbols'
+        ):
+            try:
+                stat = Path(path).stat()
+            except OSError:
+                stale.append((path,))
+                continue
+            if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+                stale.append((path,))
+                continue
+            entries.append((Path(path), Path(root), json.loads(payload)))
+        if stale:
+            self._connection().executemany('DELETE FROM symbols WHERE path = ?', stale)
+        return entries
+
+    def put_symbols(self, file_path: Path, root: Path, symbols: Optional[Dict[str, object]]) -> None:
+        """Store the symbols of ``file_path``, or forget them when ``symbols`` is ``None``."""
+        if symbols is None:
+            self._connection().execute('DELETE FROM symbols WHERE path = ?', (str(file_path),))
+            return
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return
+        self._connection().execute(
+            'INSERT OR REPLACE INTO symbols (path, root, mtime_ns, size, payload) VALUES (?, ?, ?, ?, ?)',
+            (str(file_path), str(root), stat.st_mtime_ns, stat.st_size, json.dumps(symbols)),
+        )
+
+    def stats(self) -> Tuple[int, int]:
+        return self.hits, self.misses
+
+    # ------------------------------------------------------------------
+    def _fingerprint(self, plugin: ValidatorPlugin) -> str:
+        fingerprint = self._fingerprints.get(id(plugin))
+        if fingerprint is None:
+            fingerprint = plugin_fingerprint(plugin)
+            self._fingerprints[id(plugin)] = fingerprint
+        return fingerprint
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.directory / 'results.sqlite3'), timeout=30)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, payload TEXT NOT NULL, used INTEGER NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS entries_used ON entries (used)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS symbols '
+                '(path TEXT PRIMARY KEY, root TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, payload TEXT NOT NULL)'
+            )
+        return self._conn
+
@@ -0,0 +1,67 @@
+"""Git helpers that narrow a validation run to the files touched since a ref."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+
+class ChangeDetectionError(Exception):
+    """Raised when git cannot tell which files changed."""
+
+
+def _git(args: List[str], cwd: Path) -> str:
+    try:
+        completed = subprocess.run(
+            ['git', *args],
+            cwd=str(cwd),
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError as exc:
+        raise ChangeDetectionError("git executable not found") from exc
+    except subprocess.CalledProcessError as exc:
+        message = (exc.stderr or exc.stdout or '').strip()
+        raise ChangeDetectionError(f"git {' '.join(args)} failed: {message}") from exc
+    return completed.stdout
+
+
+def _display_path(path: Path) -> Path:
+    try:
+        return path.relative_to(Path.cwd())
+    except ValueError:
+        return path
+
+
+def changed_files(ref: str, within: Optional[Path] = None) -> List[Path]:
+    """Files added, modified, renamed or deleted since ``ref``, plus untracked files.
+
+    The comparison starts from the merge base of ``ref`` and ``HEAD`` and runs
+    up to the working tree, so it covers both the commits on the branch and
+    uncommitted edits, like a pull-request diff. Deleted files are included
+    so callers can re-run module-level checks for the modules that lost them.
+    When ``within`` is given, only paths below it are returned.
+    """
+    cwd = (within or Path.cwd()).resolve()
+    if cwd.is_file():
+        cwd = cwd.parent
+    top = Path(_git(['rev-parse', '--show-toplevel'], cwd).strip())
+    base = _git(['merge-base', ref, 'HEAD'], top).strip()
+
+    names = _git(['diff', '--name-only', '--no-renames', '-z', '--diff-filter=ACMRD', base], top).split('\0')
+    names += _git(['ls-files', '--others', '--exclude-standard', '-z'], top).split('\0')
+
+    scope = within.resolve() if within is not None else None
+    seen = set()
+    paths: List[Path] = []
+    for name in names:
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        path = top / name
+        if scope is not None and scope != path and scope not in path.parents:
+            continue
+        paths.append(_display_path(path))
+    return sorted(paths)
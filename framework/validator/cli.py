@@ -0,0 +1,332 @@
+"""Command line of ``validate.py``: arguments, requests and the run report.
+
+This module, like ``client``, does not import the plugin machinery, so a
+``--daemon`` request can be sent and reported (``daemon_main``) before
+``validate.py`` loads any of it. ``validate.py`` uses the same pieces for
+runs in-process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .baseline import DEFAULT_BASELINE_PATH, Baseline, BaselineError
+from .cache import DEFAULT_CACHE_DIR
+from .changes import ChangeDetectionError, changed_files
+from .client import DEFAULT_SOCKET_PATH, OPTION_NAMES, DaemonClient, DaemonUnavailable, plugin_directories, plugin_set_fingerprint
+from .plugin import ValidationResult
+from .profiling import Profiler
+from .writers import WRITERS
+
+logger = logging.getLogger(__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Neodoo18Framework Universal Validator")
+    parser.add_argument('path', nargs='?', help="File or directory to validate")
+    parser.add_argument('--auto-fix', action='store_true', help="Auto-fix issues when possible")
+    parser.add_argument('--fix-diff', action='store_true', help="Print auto-fixes as a unified patch instead of modifying files")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Show detailed validation information")
+    parser.add_argument('--strict', action='store_true', help="Enable strict mode (promote selected warnings to errors)")
+    parser.add_argument('--template-mode', action='store_true', help="Permit template placeholders and missing optional files as warnings")
+    parser.add_argument('--plugins-dir', action='append', default=[], help="Additional directory to load validator plugins from")
+    parser.add_argument('--rule-pack', action='append', default=[], metavar='FILE', help="Load a declarative rule pack (TOML, JSON or YAML); repeatable")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Validate files with N worker processes (0 = one per CPU)")
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help=f"Directory for the incremental result cache (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--timeout', type=float, default=0, metavar='SECONDS', help="Time budget per plugin and file; files that exceed it are reported as 'timeout' and skipped (0 = no limit)")
+    parser.add_argument('--no-cache', action='store_true', help="Re-validate every file instead of replaying cached results")
+    parser.add_argument('--files-from', metavar='FILE', help="Validate the files listed in FILE, one per line ('-' reads stdin)")
+    parser.add_argument('--changed-since', metavar='REF', help="Only validate files changed since git REF (e.g. origin/main) and their modules' checks")
+    parser.add_argument('--odoo-conf', metavar='FILE', help="Validate every module on the addons_path of an Odoo configuration file, with seconds per module")
+    parser.add_argument('--list-affected', action='store_true', help="With --odoo-conf, print the modules to validate (with --changed-since: changed modules and their dependents) in dependency order and exit")
+    parser.add_argument('--format', choices=['text', *WRITERS], default='text', help="Report format: text log (default), JSON Lines, SARIF 2.1.0 or JUnit XML")
+    parser.add_argument('--output', '-o', metavar='FILE', help="Write the --format report to FILE instead of stdout")
+    parser.add_argument('--fail-fast', nargs='?', type=int, const=1, default=0, metavar='N', help="Stop after the first error, or after N errors")
+    parser.add_argument('--baseline', nargs='?', const=str(DEFAULT_BASELINE_PATH), metavar='FILE', help=f"Only report findings missing from the baseline FILE (default: {DEFAULT_BASELINE_PATH})")
+    parser.add_argument('--update-baseline', action='store_true', help="Record every finding of this run in the --baseline file instead of reporting them")
+    parser.add_argument('--profile', action='store_true', help="Report time, calls and bytes per plugin hook and rule, and the slowest files")
+    parser.add_argument('--profile-json', metavar='FILE', help="Also write the --profile report as JSON to FILE (implies --profile)")
+    parser.add_argument('--serve', action='store_true', help="Run a long-lived validator daemon on --socket")
+    parser.add_argument('--daemon', action='store_true', help="Send the request to a running daemon, validating in-process if none answers")
+    parser.add_argument('--socket', default=str(DEFAULT_SOCKET_PATH), help=f"Unix socket of the validator daemon (default: {DEFAULT_SOCKET_PATH})")
+    parser.add_argument('--watch', action='store_true', help="Validate path, then revalidate changed files until interrupted")
+    parser.add_argument('--watch-polling', action='store_true', help="With --watch, poll modification times instead of using inotify")
+    parser.add_argument('--lsp', action='store_true', help="Speak the Language Server Protocol on stdio")
+    parser.add_argument('--list-plugins', action='store_true', help="List available validator plugins and exit")
+    return parser
+
+
+def check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject option combinations that make no sense (``parser.error`` exits)."""
+    args.profile = args.profile or bool(args.profile_json)
+
+    if args.output and args.format == 'text':
+        parser.error("--output requires --format jsonl, sarif or junit")
+    if args.fix_diff and args.format != 'text' and not args.output:
+        parser.error("--fix-diff prints the patch on stdout; write the --format report with --output")
+
+    if args.profile and (args.lsp or args.serve or args.watch):
+        parser.error("--profile profiles one run; send --daemon requests with --profile to profile the daemon")
+
+    if (args.baseline or args.update_baseline) and (args.lsp or args.serve or args.watch):
+        parser.error("--baseline and --update-baseline apply to one validation run")
+
+    if args.odoo_conf:
+        if args.lsp or args.serve or args.watch:
+            parser.error("--odoo-conf applies to one validation run")
+        if args.path or args.files_from:
+            parser.error("--odoo-conf takes the place of path and --files-from")
+    elif args.list_affected:
+        parser.error("--list-affected requires --odoo-conf")
+
+
+def load_baseline(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Tuple[Optional[Baseline], Path]:
+    baseline_path = Path(args.baseline or DEFAULT_BASELINE_PATH)
+    if not (args.baseline or args.update_baseline):
+        return None, baseline_path
+    if args.update_baseline:
+        return Baseline(), baseline_path
+    try:
+        return Baseline.load(baseline_path), baseline_path
+    except BaselineError as exc:
+        parser.error(str(exc))
+        raise  # unreachable: parser.error exits
+
+
+def read_file_list(source: str) -> List[Path]:
+    stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        return [Path(line.strip()) for line in stream if line.strip()]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def file_request(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Tuple[str, Dict[str, object]]:
+    """The request for ``--changed-since``, ``--files-from`` or a path, as ``(method, params)``."""
+    if args.changed_since:
+        try:
+            changed = changed_files(args.changed_since, Path(args.path) if args.path else None)
+        except ChangeDetectionError as exc:
+            parser.error(str(exc))
+        if args.verbose:
+            logger.info(f"{len(changed)} file(s) changed since {args.changed_since}")
+        return 'validate_changes', {'paths': [str(path) for path in changed]}
+    if args.files_from:
+        return 'validate_files', {'paths': [str(path) for path in read_file_list(args.files_from)]}
+    if args.path:
+        return 'validate_directory', {'path': args.path}
+    parser.error("path is required unless --list-plugins, --files-from or --changed-since is provided")
+    raise AssertionError  # unreachable: parser.error exits
+
+
+# ----------------------------------------------------------------------
+
+class RunTotals:
+    """Running counts of a validation run, so results need not be kept to summarise it."""
+
+    def __init__(self) -> None:
+        self.valid = True
+        self.errors = 0
+        self.warnings = 0
+        self.fixes = 0
+
+    def add(self, result: ValidationResult) -> None:
+        self.valid = self.valid and result.is_valid
+        self.errors += result.count('error')
+        self.warnings += result.count('warning')
+        self.fixes += result.count('fix')
+
+
+def log_details(result: ValidationResult) -> None:
+    for message in result.errors:
+        logger.error(f"  - {message}")
+    for message in result.warnings:
+        logger.warning(f"  - {message}")
+    for message in result.auto_fixes:
+        logger.info(f"  ✓ {message}")
+
+
+def log_totals(totals: RunTotals) -> None:
+    if not totals.valid:
+        logger.error(f"Validation failed: {totals.errors} errors, {totals.warnings} warnings")
+    elif totals.warnings:
+        logger.warning(f"Validation passed with {totals.warnings} warnings")
+    else:
+        logger.info("Validation passed")
+
+
+def report_profile(profiler: Profiler, wall_seconds: float, json_path: Optional[str]) -> None:
+    table = profiler.format_table()
+    sys.stderr.write(f"Profile (wall time {wall_seconds:.3f}s):\n{table or '  nothing was profiled'}\n")
+    if json_path:
+        report = profiler.report(limit=50)
+        report['wall_seconds'] = round(wall_seconds, 6)
+        with open(json_path, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+
+
+def report_module_seconds(module_seconds: Dict[Path, float], limit: Optional[int]) -> None:
+    ordered = sorted(module_seconds.items(), key=lambda item: item[1], reverse=True)
+    shown = ordered if limit is None else ordered[:limit]
+    title = "Seconds per module" if len(shown) == len(ordered) else f"Seconds per module ({len(shown)} slowest of {len(ordered)}; -v for all)"
+    lines = [f"{title}, summed over workers:"]
+    lines.extend(f"  {seconds:>10.4f}  {root.name:<40} {root.parent}" for root, seconds in shown)
+    sys.stderr.write('\n'.join(lines) + '\n')
+
+
+def report_run(
+    args: argparse.Namespace,
+    results: Iterable[ValidationResult],
+    *,
+    method: str,
+    baseline: Optional[Baseline],
+    baseline_path: Path,
+    started: float,
+    validator: Optional[Any] = None,
+    client: Optional[DaemonClient] = None,
+) -> int:
+    """Consume ``results`` and report the run as asked by ``args``; returns the exit status.
+
+    ``validator`` is the in-process ``Odoo18Validator`` (closed here), or
+    ``client`` the daemon client that produced the results.
+    """
+    stream: Optional[TextIO] = None
+    writer = None
+    if args.format != 'text':
+        stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        writer = WRITERS[args.format](stream)
+
+    # Results are streamed: machine formats write each one as it arrives, and
+    # verbose text output logs it immediately. Otherwise only the results
+    # needed for the final failure report are kept.
+    totals = RunTotals()
+    kept: List[ValidationResult] = []
+    stopped = False
+    iterator = iter(results)
+    try:
+        for result in iterator:
+            if baseline is not None:
+                if args.update_baseline:
+                    baseline.record(result)
+                    continue
+                had_messages = result.has_messages()
+                if had_messages and not baseline.filter(result).has_messages():
+                    continue
+            totals.add(result)
+            if writer is not None:
+                writer.write(result)
+            elif args.verbose:
+                log_details(result)
+            else:
+                kept.append(result)
+            if args.fail_fast and totals.errors >= args.fail_fast:
+                stopped = True
+                break
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        if validator is not None:
+            validator.close()
+        if writer is not None:
+            writer.close()
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    if validator is not None and validator.patches:
+        sys.stdout.write(''.join(validator.patches))
+        sys.stdout.flush()
+
+    if args.profile:
+        profiler = Profiler()
+        if validator is not None and validator.profiler is not None:
+            profiler.merge(validator.profiler.to_dict())
+        elif client is not None:
+            profiler.merge(client.profile)
+        report_profile(profiler, time.perf_counter() - started, args.profile_json)
+
+    if validator is not None and method == 'validate_modules' and validator.module_seconds:
+        report_module_seconds(validator.module_seconds, None if args.verbose else 20)
+
+    if baseline is not None:
+        if args.update_baseline:
+            baseline.save(baseline_path)
+            logger.info(f"Recorded {len(baseline)} finding(s) in baseline {baseline_path}")
+        elif baseline.suppressed:
+            logger.info(f"Suppressed {baseline.suppressed} finding(s) known in baseline {baseline_path}")
+
+    if stopped:
+        logger.error(f"Stopped after {totals.errors} error(s) (--fail-fast)")
+    log_totals(totals)
+    if writer is None and not args.verbose and not totals.valid:
+        for result in kept:
+            log_details(result)
+    if totals.fixes and args.fix_diff:
+        logger.info(f"{totals.fixes} auto-fixes available (diff written)")
+    elif totals.fixes:
+        logger.info(f"Applied {totals.fixes} auto-fixes")
+
+    if totals.valid:
+        logger.info("✅ Validation successful!")
+        return 0
+    logger.error("❌ Validation failed!")
+    return 1
+
+
+# ----------------------------------------------------------------------
+
+def run_daemon_request(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Optional[int]:
+    """Send the run described by ``args`` to the daemon and report it.
+
+    Returns the exit status, or ``None`` when the run must happen
+    in-process: the options need it (``--fix-diff``, ``--odoo-conf``, the
+    long-running modes) or no daemon can serve it.
+    """
+    # The daemon has no whole-addons-path method and writes no patches.
+    if not args.daemon or args.fix_diff or args.odoo_conf or args.lsp or args.serve or args.watch or args.list_plugins:
+        return None
+    baseline, baseline_path = load_baseline(parser, args)
+    # A list read from stdin is put back, for an in-process run to read again.
+    stdin_text = sys.stdin.read() if args.files_from == '-' else None
+    if stdin_text is not None:
+        sys.stdin = io.StringIO(stdin_text)
+    method, params = file_request(parser, args)
+
+    started = time.perf_counter()
+    options = {name: bool(getattr(args, name)) for name in OPTION_NAMES}
+    plugins = plugin_set_fingerprint(
+        plugin_directories(Path(directory) for directory in args.plugins_dir),
+        [Path(pack) for pack in args.rule_pack],
+        args.timeout,
+    )
+    client = DaemonClient(Path(args.socket))
+    try:
+        results = client.validate(method, options, plugins, **({**params, 'profile': True} if args.profile else params))
+    except DaemonUnavailable as exc:
+        if args.verbose:
+            logger.info(f"Validating in-process ({exc})")
+        if stdin_text is not None:
+            sys.stdin = io.StringIO(stdin_text)
+        return None
+    return report_run(
+        args, results, method=method, baseline=baseline, baseline_path=baseline_path, started=started, client=client,
+    )
+
+
+def daemon_main() -> None:
+    """Entry point of ``validate.py --daemon``: exits once the daemon has served the run, returns otherwise."""
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(parser, args)
+    status = run_daemon_request(parser, args)
+    if status is not None:
+        sys.exit(status)
@@ -0,0 +1,135 @@
+"""Client side of the validator daemon (``validate.py --daemon``).
+
+This module only imports what a request needs: no plugin, rule pack or
+entry point is loaded, since avoiding that start-up cost is what the daemon
+is for. The daemon checks that the client would have loaded the same
+plugins from ``plugin_set_fingerprint``, which is built from the plugin
+directories, rule packs and time budget alone, with the size and
+modification time of each plugin file standing in for its contents.
+Plugins installed as entry points are not part of it: client and daemon
+are expected to run from the same installation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .plugin import ValidationResult
+
+DEFAULT_SOCKET_PATH = Path('.neodoo') / 'validator.sock'
+
+# Options that change what the validator reports. A daemon started with
+# different options refuses the request so the client validates in-process.
+OPTION_NAMES = ('auto_fix', 'strict', 'template_mode', 'verbose')
+
+# Environment variable listing extra plugin directories, separated by ``os.pathsep``.
+PLUGIN_DIRS_ENV = 'NEODOO_VALIDATOR_PLUGINS'
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket, or it cannot serve this request."""
+
+
+def plugin_directories(plugin_dirs: Optional[Iterable[Path]] = None) -> List[Path]:
+    """Directories to load plugins from: those of ``NEODOO_VALIDATOR_PLUGINS``, then ``plugin_dirs``."""
+    directories: List[Path] = []
+    env_dirs = os.environ.get(PLUGIN_DIRS_ENV, "")
+    if env_dirs:
+        directories.extend(
+            Path(entry).expanduser()
+            for entry in env_dirs.split(os.pathsep)
+            if entry.strip()
+        )
+    if plugin_dirs:
+        directories.extend(Path(directory) for directory in plugin_dirs)
+    return directories
+
+
+def _stat_line(path: Path) -> str:
+    try:
+        stat = path.stat()
+    except OSError:
+        return f"{path}\0missing"
+    return f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}"
+
+
+def plugin_set_fingerprint(
+    plugin_dirs: Sequence[Path],
+    rule_packs: Sequence[Path],
+    timeout: Optional[float],
+) -> str:
+    """Identify the plugin configuration of a run without loading any of it.
+
+    Covers the resolved plugin directories and rule packs, in order, the
+    size and modification time of every file directly in those directories
+    (where plugins are discovered), and the time budget.
+    """
+    digest = hashlib.sha256()
+    for directory in plugin_dirs:
+        directory = directory.expanduser().resolve()
+        digest.update(f"dir\0{directory}\n".encode('utf-8'))
+        try:
+            with os.scandir(directory) as entries:
+                names = sorted(entry.name for entry in entries if entry.is_file())
+        except OSError:
+            continue
+        for name in names:
+            digest.update(f"file\0{_stat_line(directory / name)}\n".encode('utf-8'))
+    for pack in rule_packs:
+        digest.update(f"pack\0{_stat_line(pack.expanduser().resolve())}\n".encode('utf-8'))
+    digest.update(f"timeout\0{timeout if timeout and timeout > 0 else None}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class DaemonClient:
+    """Minimal client for ``ValidatorServer``; raises ``DaemonUnavailable`` when it cannot be used."""
+
+    def __init__(self, socket_path: Path = DEFAULT_SOCKET_PATH, *, timeout: Optional[float] = None) -> None:
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+        self._next_id = 0
+        # Profiling counts returned with the last response, when it was requested.
+        self.profile: Optional[Dict[str, Any]] = None
+
+    def request(self, method: str, **params: Any) -> Any:
+        self._next_id += 1
+        payload = json.dumps({'id': self._next_id, 'method': method, 'params': params}).encode('utf-8') + b'\n'
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(str(self.socket_path))
+                sock.sendall(payload)
+                with sock.makefile('rb') as stream:
+                    line = stream.readline()
+        except OSError as exc:
+            raise DaemonUnavailable(f"No validator daemon on {self.socket_path}: {exc}") from exc
+        if not line:
+            raise DaemonUnavailable(f"Validator daemon on {self.socket_path} closed the connection")
+
+        response = json.loads(line)
+        if 'error' in response:
+            raise DaemonUnavailable(response['error'])
+        self.profile = response.get('profile')
+        return response.get('result')
+
+    def validate(
+        self,
+        method: str,
+        options: Dict[str, bool],
+        plugins: Optional[str] = None,
+        **params: Any,
+    ) -> List[ValidationResult]:
+        """Run a validation ``method`` on the daemon from the caller's working directory.
+
+        ``plugins`` is the caller's ``plugin_set_fingerprint``; the daemon
+        refuses the request when its own differs.
+        """
+        if plugins is not None:
+            params['plugins'] = plugins
+        data = self.request(method, cwd=os.getcwd(), options=options, **params)
+        return [ValidationResult.from_dict(item) for item in data]
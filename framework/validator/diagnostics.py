@@ -0,0 +1,222 @@
+"""Structured validation findings kept in a compact columnar store.
+
+A run can produce tens of thousands of findings, so ``ValidationResult`` does
+not keep one object or formatted string per finding. ``DiagnosticStore``
+holds parallel columns (severity codes, rule ids, paths, line/column numbers,
+message templates and arguments). ``Diagnostic`` objects are short-lived row
+views built only when a finding is read. Messages follow the ``logging``
+convention: ``add_error("Unknown field %s", name)`` stores the template and
+its arguments, and the text is only formatted when someone reads it.
+"""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+ERROR = 0
+WARNING = 1
+FIX = 2
+SEVERITY_NAMES = ('error', 'warning', 'fix')
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITY_NAMES)}
+
+PathLike = Union[str, Path]
+
+
+def _format(template: str, args: Optional[Tuple[Any, ...]]) -> str:
+    if not args:
+        return template
+    try:
+        return template % args
+    except (TypeError, ValueError):
+        return ' '.join([template, *map(str, args)])
+
+
+class Diagnostic:
+    """One finding: severity, rule id, location and a lazily formatted message."""
+
+    __slots__ = ('severity', 'rule', 'path', 'line', 'col', '_template', '_args', '_message')
+
+    def __init__(
+        self,
+        severity: str,
+        message: str,
+        *args: Any,
+        rule: Optional[str] = None,
+        path: Optional[PathLike] = None,
+        line: Optional[int] = None,
+        col: Optional[int] = None,
+    ) -> None:
+        self.severity = severity
+        self.rule = rule
+        self.path = path
+        self.line = line
+        self.col = col
+        self._template = message
+        self._args = args or None
+        self._message: Optional[str] = None
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = _format(self._template, self._args)
+        return self._message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'severity': self.severity,
+            'rule': self.rule,
+            'path': str(self.path) if self.path is not None else None,
+            'line': self.line,
+            'col': self.col,
+            'message': self.message,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Diagnostic":
+        return cls(
+            data.get('severity', 'error'),
+            data.get('message', ''),
+            rule=data.get('rule'),
+            path=data.get('path'),
+            line=data.get('line'),
+            col=data.get('col'),
+        )
+
+    def __repr__(self) -> str:
+        location = f"{self.path}:{self.line or 0}:{self.col or 0}" if self.path is not None else '-'
+        return f"Diagnostic({self.severity}, {self.rule or '-'}, {location}, {self.message!r})"
+
+
+class DiagnosticStore:
+    """Column-oriented list of findings; 0 in ``lines``/``cols`` means "unknown"."""
+
+    __slots__ = ('severities', 'rules', 'paths', 'lines', 'cols', 'templates', 'args')
+
+    def __init__(self) -> None:
+        self.severities = bytearray()
+        self.rules: List[Optional[str]] = []
+        self.paths: List[Optional[PathLike]] = []
+        self.lines = array('i')
+        self.cols = array('i')
+        self.templates: List[str] = []
+        self.args: List[Optional[Tuple[Any, ...]]] = []
+
+    def append(
+        self,
+        severity: int,
+        template: str,
+        args: Tuple[Any, ...] = (),
+        rule: Optional[str] = None,
+        path: Optional[PathLike] = None,
+        line: Optional[int] = None,
+        col: Optional[int] = None,
+    ) -> None:
+        self.severities.append(severity)
+        self.rules.append(rule)
+        self.paths.append(path)
+        self.lines.append(line or 0)
+        self.cols.append(col or 0)
+        self.templates.append(template)
+        self.args.append(args or None)
+
+    def add(self, diagnostic: Diagnostic) -> None:
+        self.append(
+            SEVERITY_CODES[diagnostic.severity],
+            diagnostic._template,
+            diagnostic._args or (),
+            diagnostic.rule,
+            diagnostic.path,
+            diagnostic.line,
+            diagnostic.col,
+        )
+
+    def extend(self, other: "DiagnosticStore") -> None:
+        self.severities.extend(other.severities)
+        self.rules.extend(other.rules)
+        self.paths.extend(other.paths)
+        self.lines.extend(other.lines)
+        self.cols.extend(other.cols)
+        self.templates.extend(other.templates)
+        self.args.extend(other.args)
+
+    def __len__(self) -> int:
+        return len(self.severities)
+
+    def __getitem__(self, index: int) -> Diagnostic:
+        diagnostic = Diagnostic(
+            SEVERITY_NAMES[self.severities[index]],
+            self.templates[index],
+            rule=self.rules[index],
+            path=self.paths[index],
+            line=self.lines[index] or None,
+            col=self.cols[index] or None,
+        )
+        diagnostic._args = self.args[index]
+        return diagnostic
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        for index in range(len(self.severities)):
+            yield self[index]
+
+    def count(self, severity: int) -> int:
+        return self.severities.count(severity)
+
+    def messages(self, severity: int) -> List[str]:
+        """Formatted messages of one severity, in insertion order."""
+        return [
+            _format(self.templates[index], self.args[index])
+            for index, code in enumerate(self.severities)
+            if code == severity
+        ]
+
+    def positions(self, severity: int) -> List[int]:
+        """Indexes of the findings of one severity, in insertion order."""
+        return [index for index, code in enumerate(self.severities) if code == severity]
+
+    def message(self, index: int) -> str:
+        return _format(self.templates[index], self.args[index])
+
+    def insert(self, index: int, severity: int, template: str) -> None:
+        """Insert a finding with no rule or location before ``index``."""
+        self.severities.insert(index, severity)
+        self.rules.insert(index, None)
+        self.paths.insert(index, None)
+        self.lines.insert(index, 0)
+        self.cols.insert(index, 0)
+        self.templates.insert(index, template)
+        self.args.insert(index, None)
+
+    def set_message(self, index: int, message: str) -> None:
+        """Replace the text of a finding, keeping its rule and location."""
+        self.templates[index] = message
+        self.args[index] = None
+
+    def permute(self, positions: List[int], order: List[int]) -> None:
+        """Reorder the findings at ``positions`` so the ``order[k]``-th of them comes ``k``-th."""
+        for column in (self.severities, self.rules, self.paths, self.lines, self.cols, self.templates, self.args):
+            values = [column[positions[k]] for k in order]
+            for position, value in zip(positions, values):
+                column[position] = value
+
+    def delete(self, index: int) -> None:
+        for column in (self.severities, self.rules, self.paths, self.lines, self.cols, self.templates, self.args):
+            del column[index]
+
+    def remove(self, severity: int) -> None:
+        keep = [index for index, code in enumerate(self.severities) if code != severity]
+        self.severities = bytearray(self.severities[index] for index in keep)
+        self.rules = [self.rules[index] for index in keep]
+        self.paths = [self.paths[index] for index in keep]
+        self.lines = array('i', (self.lines[index] for index in keep))
+        self.cols = array('i', (self.cols[index] for index in keep))
+        self.templates = [self.templates[index] for index in keep]
+        self.args = [self.args[index] for index in keep]
+
+    def fill_path(self, path: PathLike) -> None:
+        """Attribute findings reported without a path to ``path`` (the file or module being checked)."""
+        paths = self.paths
+        for index, current in enumerate(paths):
+            if current is None:
+                paths[index] = path
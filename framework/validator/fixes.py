@@ -0,0 +1,159 @@
+"""Transactional auto-fix engine.
+
+Plugins do not rewrite files themselves. They attach ``TextEdit`` operations
+(a span of the validated text and its replacement) to their results with
+``ValidationResult.add_edit``, and the validator hands every result to a
+``FixEngine``. At the end of the run the engine merges the edits of each
+file, skips the ones that overlap an earlier edit, and writes the file once:
+to a temporary file in the same directory, then renamed over the original.
+In diff mode nothing is written; the engine produces a unified patch.
+
+Edits are ordered by position and, for equal positions, by the order in which
+they were reported (plugin order, then rule order inside a plugin), so the
+outcome is the same on every run.
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .diagnostics import PathLike
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    """Replace ``text[start:end]`` of ``path`` (as read by ``SourceFile.text``) with ``replacement``."""
+
+    path: PathLike
+    start: int
+    end: int
+    replacement: str
+    rule: Optional[str] = None
+
+
+@dataclass
+class FileFix:
+    """Outcome of committing the edits of one file."""
+
+    path: Path
+    applied: List[TextEdit]
+    skipped: List[Tuple[TextEdit, TextEdit]]  # (skipped edit, edit it overlaps)
+    patch: str = ''
+
+
+def read_text(path: Path) -> str:
+    """Read ``path`` the way ``SourceFile.text`` does, so edit offsets line up."""
+    text = path.read_bytes().decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def merge_edits(edits: List[TextEdit]) -> Tuple[List[TextEdit], List[Tuple[TextEdit, TextEdit]]]:
+    """Order ``edits`` by position and drop duplicates and overlaps.
+
+    ``edits`` must be in report order; that order breaks ties between edits at
+    the same position. An edit that overlaps one already accepted is skipped.
+    Insertions (``start == end``) at the end of an accepted edit are allowed.
+    """
+    ordered = sorted(enumerate(edits), key=lambda item: (item[1].start, item[1].end, item[0]))
+    applied: List[TextEdit] = []
+    skipped: List[Tuple[TextEdit, TextEdit]] = []
+    for _, edit in ordered:
+        if applied:
+            last = applied[-1]
+            if (edit.start, edit.end, edit.replacement) == (last.start, last.end, last.replacement):
+                continue
+            if edit.start < last.end:
+                skipped.append((edit, last))
+                continue
+        applied.append(edit)
+    return applied, skipped
+
+
+def apply_edits(text: str, edits: List[TextEdit]) -> str:
+    """Apply merged, position-ordered ``edits`` to ``text``."""
+    parts: List[str] = []
+    position = 0
+    for edit in edits:
+        parts.append(text[position:edit.start])
+        parts.append(edit.replacement)
+        position = edit.end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` via a temporary file and ``os.replace``."""
+    fd, temp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        shutil.copymode(str(path), temp_name)
+        os.replace(temp_name, str(path))
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class FixEngine:
+    """Collect edits during a run and apply them once per file on ``commit``."""
+
+    def __init__(self, *, write: bool = True) -> None:
+        self.write = write
+        self._pending: Dict[Path, List[TextEdit]] = {}
+
+    def add(self, edit: TextEdit) -> None:
+        self._pending.setdefault(Path(edit.path), []).append(edit)
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def commit(self) -> List[FileFix]:
+        """Apply (or, in diff mode, render) every pending edit and reset the engine."""
+        pending, self._pending = self._pending, {}
+        outcomes: List[FileFix] = []
+        for path in sorted(pending):
+            applied, skipped = merge_edits(pending[path])
+            outcome = FileFix(path, applied, skipped)
+            outcomes.append(outcome)
+            original = read_text(path)
+            updated = apply_edits(original, applied)
+            if updated == original:
+                continue
+            if self.write:
+                write_atomic(path, updated)
+            else:
+                outcome.patch = unified_patch(path, original, updated)
+        return outcomes
+
+
+def patch_path(path: Path) -> str:
+    """``path`` as named in patch headers: relative to the working directory, where the patch is applied."""
+    try:
+        return Path(os.path.relpath(path)).as_posix()
+    except ValueError:  # on another drive (Windows)
+        return path.as_posix().lstrip('/')
+
+
+def unified_patch(path: Path, original: str, updated: str) -> str:
+    """``git apply``-compatible diff of one file, including missing final newlines."""
+    name = patch_path(path)
+    lines = difflib.unified_diff(
+        original.splitlines(keepends=True),
+        updated.splitlines(keepends=True),
+        fromfile=f'a/{name}',
+        tofile=f'b/{name}',
+    )
+    return ''.join(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n' for line in lines)
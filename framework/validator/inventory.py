@@ -0,0 +1,218 @@
+"""Indexed file inventory built from a single pruned directory walk."""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# Directory names never worth descending into.
+DEFAULT_PRUNE = frozenset({
+    '.git', '.hg', '.svn', '.venv', 'venv', '.tox', '.nox', 'node_modules',
+    '__pycache__', '.mypy_cache', '.pytest_cache', '.ruff_cache', '.neodoo',
+})
+# Relative path endings pruned wherever they appear (vendored web assets).
+DEFAULT_PRUNE_PATHS = ('static/lib',)
+IGNORE_FILES = ('.gitignore', '.neodooignore')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (``*``, ``?``, ``[...]``, ``**``) to a regex body."""
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i):
+                if pattern.startswith('**/', i):
+                    out.append('(?:.*/)?')
+                    i += 3
+                    continue
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return ''.join(out)
+
+
+class IgnoreRules:
+    """Subset of gitignore semantics: comments, negation, anchoring, ``**`` and dir-only patterns.
+
+    Rules are evaluated in order and the last match wins. A directory that is
+    ignored is pruned as a whole, so its contents cannot be re-included.
+    """
+
+    def __init__(self) -> None:
+        self._rules: List[Tuple[Pattern[str], bool, bool]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def add_file(self, ignore_file: Path, base: str) -> None:
+        """Load ``ignore_file`` whose patterns are relative to ``base`` (posix, '' for the root)."""
+        try:
+            lines = ignore_file.read_text(encoding='utf-8').splitlines()
+        except (OSError, UnicodeDecodeError):
+            return
+        for line in lines:
+            self.add(line, base)
+
+    def add(self, line: str, base: str = '') -> None:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            return
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.strip('/') if dir_only else line
+        anchored = '/' in line
+        line = line.lstrip('/')
+        if not line:
+            return
+        prefix = re.escape(base + '/') if base else ''
+        body = _glob_to_regex(line)
+        regex = f'^{prefix}{body}$' if anchored else f'^{prefix}(?:.*/)?{body}$'
+        self._rules.append((re.compile(regex), negate, dir_only))
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+class FileInventory:
+    """Every file under ``root`` indexed by suffix, basename, parent directory and module.
+
+    Built once per run and exposed as ``ValidationContext.inventory`` so
+    plugins answer "where is ir.model.access.csv?" with a lookup instead of
+    walking the tree again.
+    """
+
+    def __init__(self, root: Path, files: Sequence[Path], module_roots: Iterable[Path] = ()) -> None:
+        self.root = root
+        self.files: List[Path] = sorted(files)
+        self.module_roots: List[Path] = sorted(module_roots)
+        self._by_suffix: Dict[str, List[Path]] = {}
+        self._by_name: Dict[str, List[Path]] = {}
+        self._by_parent: Dict[Path, List[Path]] = {}
+        self._by_module: Dict[Optional[Path], List[Path]] = {}
+        self._module_of: Dict[Path, Optional[Path]] = {}
+        self._roots = set(self.module_roots)
+
+        for path in self.files:
+            self._by_suffix.setdefault(path.suffix, []).append(path)
+            self._by_name.setdefault(path.name, []).append(path)
+            self._by_parent.setdefault(path.parent, []).append(path)
+            module = self._nearest_module(path.parent)
+            self._by_module.setdefault(module, []).append(path)
+        self._members = set(self.files)
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def scan(
+        cls,
+        root: Path,
+        *,
+        prune: Iterable[str] = DEFAULT_PRUNE,
+        prune_paths: Sequence[str] = DEFAULT_PRUNE_PATHS,
+        ignore_files: Sequence[str] = IGNORE_FILES,
+    ) -> "FileInventory":
+        """Walk ``root`` once with ``os.scandir``, pruning ignored subtrees."""
+        prune = frozenset(prune)
+        rules = IgnoreRules()
+        files: List[Path] = []
+        module_roots: List[Path] = []
+        pending: List[Tuple[str, str]] = [(str(root), '')]
+
+        while pending:
+            directory, rel_dir = pending.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                continue
+
+            names = {entry.name for entry in entries}
+            for ignore_name in ignore_files:
+                if ignore_name in names:
+                    rules.add_file(Path(directory) / ignore_name, rel_dir)
+            if '__manifest__.py' in names:
+                module_roots.append(Path(directory))
+
+            for entry in entries:
+                rel = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry.name in prune or any(rel == p or rel.endswith('/' + p) for p in prune_paths):
+                        continue
+                    if rules and rules.ignored(rel, True):
+                        continue
+                    pending.append((entry.path, rel))
+                elif entry.is_file():
+                    if rules and rules.ignored(rel, False):
+                        continue
+                    files.append(Path(entry.path))
+
+        return cls(root, files, module_roots)
+
+    # ------------------------------------------------------------------
+    def with_suffix(self, suffix: str) -> List[Path]:
+        return list(self._by_suffix.get(suffix, ()))
+
+    def named(self, name: str) -> List[Path]:
+        return list(self._by_name.get(name, ()))
+
+    def in_directory(self, directory: Path, suffix: Optional[str] = None) -> List[Path]:
+        """Files directly inside ``directory`` (not recursive)."""
+        files = self._by_parent.get(directory, ())
+        return [path for path in files if suffix is None or path.suffix == suffix]
+
+    def in_module(self, module_root: Optional[Path]) -> List[Path]:
+        return list(self._by_module.get(module_root, ()))
+
+    def module_root_of(self, path: Path) -> Optional[Path]:
+        return self._nearest_module(path.parent if path in self._members else path)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._members
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    # ------------------------------------------------------------------
+    def _nearest_module(self, directory: Path) -> Optional[Path]:
+        if directory in self._module_of:
+            return self._module_of[directory]
+        module: Optional[Path] = None
+        if directory in self._roots:
+            module = directory
+        elif directory != self.root and len(directory.parts) > len(self.root.parts):
+            module = self._nearest_module(directory.parent)
+        self._module_of[directory] = module
+        return module
@@ -0,0 +1,190 @@
+"""Just enough of the Language Server Protocol to publish validator diagnostics.
+
+``validate.py --lsp`` speaks LSP over stdio. Editors send document text on
+open/change/save and receive ``textDocument/publishDiagnostics`` built from
+the validator's messages. The process lives as long as the editor session,
+so plugins are discovered once, as with ``--serve``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from .plugin import ValidationResult
+
+# LSP DiagnosticSeverity values.
+SEVERITIES = {'error': 1, 'warning': 2, 'fix': 3}
+
+# Full document sync: every change notification carries the whole text.
+TEXT_DOCUMENT_SYNC_FULL = 1
+
+# JSON-RPC error code for requests the server does not implement.
+METHOD_NOT_FOUND = -32601
+
+logger = logging.getLogger(__name__)
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlparse(uri).path))
+
+
+def to_diagnostics(results: List[ValidationResult], path: Path) -> List[Dict[str, Any]]:
+    """LSP diagnostics for the findings located in ``path``."""
+    diagnostics: List[Dict[str, Any]] = []
+    for result in results:
+        for diagnostic in result.diagnostics:
+            if diagnostic.path is not None and Path(diagnostic.path) != path:
+                continue
+            line = max((diagnostic.line or 1) - 1, 0)
+            if diagnostic.col:
+                start = diagnostic.col - 1
+                range_ = {'start': {'line': line, 'character': start}, 'end': {'line': line, 'character': start + 1}}
+            else:
+                range_ = {'start': {'line': line, 'character': 0}, 'end': {'line': line + 1, 'character': 0}}
+            item: Dict[str, Any] = {
+                'range': range_,
+                'severity': SEVERITIES[diagnostic.severity],
+                'source': 'neodoo-validator',
+                'message': diagnostic.message,
+            }
+            if diagnostic.rule:
+                item['code'] = diagnostic.rule
+            diagnostics.append(item)
+    return diagnostics
+
+
+class LanguageServer:
+    """Validate open documents with ``validator`` and publish diagnostics."""
+
+    def __init__(self, validator: Any, reader: BinaryIO, writer: BinaryIO) -> None:
+        self.validator = validator
+        self.reader = reader
+        self.writer = writer
+        self.documents: Dict[str, str] = {}
+        self._shutdown = False
+
+    # ------------------------------------------------------------------
+    def _read_message(self) -> Optional[Dict[str, Any]]:
+        length = None
+        while True:
+            header = self.reader.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                break
+            name, _, value = header.decode('ascii').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value.strip())
+        if length is None:
+            return None
+        return json.loads(self.reader.read(length))
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        payload['jsonrpc'] = '2.0'
+        body = json.dumps(payload).encode('utf-8')
+        self.writer.write(f'Content-Length: {len(body)}\r\n\r\n'.encode('ascii') + body)
+        self.writer.flush()
+
+    def _publish(self, uri: str, diagnostics: List[Dict[str, Any]]) -> None:
+        self._send({
+            'method': 'textDocument/publishDiagnostics',
+            'params': {'uri': uri, 'diagnostics': diagnostics},
+        })
+
+    def _validate(self, uri: str) -> None:
+        path = uri_to_path(uri)
+        self.validator._module_roots.clear()
+        try:
+            results = self.validator.validate_source(self.documents[uri], path)
+        except Exception as exc:
+            # A failing plugin costs this document its diagnostics, not the session.
+            logger.error(f"Validation of {path} failed: {exc!r}")
+            self._publish(uri, [])
+            return
+        self._publish(uri, to_diagnostics(results, path))
+
+    # ------------------------------------------------------------------
+    def run(self) -> int:
+        """Process messages until ``exit``; returns the process exit code."""
+        while True:
+            message = self._read_message()
+            if message is None:
+                return 1
+            method = message.get('method')
+            params = message.get('params') or {}
+
+            if method == 'exit':
+                return 0 if self._shutdown else 1
+            if 'id' in message and method is not None:
+                if method in ('initialize', 'shutdown'):
+                    self._send({'id': message['id'], 'result': self._handle_request(method, params)})
+                else:
+                    self._send({
+                        'id': message['id'],
+                        'error': {'code': METHOD_NOT_FOUND, 'message': f"Unsupported method: {method}"},
+                    })
+            elif method is not None:
+                self._handle_notification(method, params)
+
+    def _handle_request(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == 'initialize':
+            return {
+                'capabilities': {
+                    'textDocumentSync': {
+                        'openClose': True,
+                        'change': TEXT_DOCUMENT_SYNC_FULL,
+                        'save': {'includeText': True},
+                    },
+                },
+                'serverInfo': {'name': 'neodoo-validator'},
+            }
+        if method == 'shutdown':
+            self._shutdown = True
+        return None
+
+    def _handle_notification(self, method: str, params: Dict[str, Any]) -> None:
+        document = params.get('textDocument') or {}
+        uri = document.get('uri')
+        if method == 'textDocument/didOpen':
+            self.documents[uri] = document.get('text', '')
+        elif method == 'textDocument/didChange':
+            changes = params.get('contentChanges') or []
+            if not changes:
+                return
+            self.documents[uri] = changes[-1].get('text', '')
+        elif method == 'textDocument/didSave':
+            if 'text' in params:
+                self.documents[uri] = params['text']
+            elif uri not in self.documents:
+                return
+        elif method == 'textDocument/didClose':
+            self.documents.pop(uri, None)
+            self._publish(uri, [])
+            return
+        else:
+            return
+        self._validate(uri)
+
+
+def serve_stdio(build_validator: Callable[[], Any]) -> int:
+    """Serve LSP on stdin/stdout with the validator returned by ``build_validator``.
+
+    Stdout carries the protocol frames only: it is kept for them and file
+    descriptor 1, like ``sys.stdout``, points at stderr while plugins are
+    loaded and run, so their ``print()`` output cannot corrupt the stream.
+    """
+    sys.stdout.flush()
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    try:
+        return LanguageServer(build_validator(), sys.stdin.buffer, protocol).run()
+    finally:
+        protocol.close()
@@ -0,0 +1,255 @@
+"""Dependency graph of Odoo modules, built from the ``depends`` of their manifests.
+
+``ModuleGraph`` maps module names to their roots and dependencies. Parsed
+manifests can be kept in a JSON file between runs, keyed by path, mtime and
+size, so an unchanged manifest is never parsed again. The graph answers the
+questions a targeted run needs:
+
+- ``order``: modules with their dependencies first, as Odoo installs them.
+- ``dependents``: modules that depend on the given ones, directly or not,
+  i.e. everything a change to them can break.
+- ``check``: ``module_depends_missing`` for a dependency that is not in the
+  graph, ``module_depends_cycle`` for modules that depend on each other.
+"""
+
+from __future__ import annotations
+
+import ast
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .plugin import ValidationResult
+from .source import SourceFile
+
+# Bump when the cached manifest data changes shape; older caches are then ignored.
+MODULE_GRAPH_FORMAT = 1
+
+# Modules Odoo loads from its own ``odoo/addons``, which is never listed in addons_path.
+IMPLICIT_MODULES = frozenset({'base'})
+
+
+def parse_manifest(source: SourceFile) -> Optional[Dict[str, Any]]:
+    """The manifest of ``source``: its first top-level dict literal, or None."""
+    manifest_node: Optional[ast.Dict] = None
+    for item in source.python_ast.body:
+        value = getattr(item, 'value', None)
+        if isinstance(value, ast.Dict):
+            manifest_node = value
+            break
+    if manifest_node is None:
+        return None
+    try:
+        obj = ast.literal_eval(manifest_node)
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+class ModuleGraph:
+    """Modules by name, with their roots and ``depends``.
+
+    The first module added under a name wins, like the first directory of
+    an addons path. With ``cache_path`` the parsed manifests are loaded from
+    and saved (``save``) to that file.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None) -> None:
+        self.cache_path = cache_path
+        self.roots: Dict[str, Path] = {}
+        self.depends: Dict[str, List[str]] = {}
+        # Manifests parsed by this instance, as opposed to served from the cache.
+        self.parsed = 0
+        self._entries: Dict[str, List[Any]] = {}  # absolute manifest path -> [mtime_ns, size, depends]
+        self._dirty = False
+        self._by_directory: Dict[str, str] = {}
+        if cache_path is not None:
+            self._load()
+
+    def add(self, root: Path) -> str:
+        """Add the module at ``root``; returns its name."""
+        name = root.name
+        if name not in self.roots:
+            self.roots[name] = root
+            self.depends[name] = self._manifest_depends(root / '__manifest__.py')
+            self._by_directory[os.path.abspath(root)] = name
+        return name
+
+    def update(self, roots: Iterable[Path]) -> None:
+        for root in roots:
+            self.add(root)
+
+    def save(self) -> None:
+        """Write the parsed manifests to ``cache_path`` if any were parsed."""
+        if self.cache_path is None or not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'format': MODULE_GRAPH_FORMAT, 'manifests': self._entries}
+        self.cache_path.write_text(json.dumps(data) + '\n', encoding='utf-8')
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    def module_of(self, path: Path) -> Optional[str]:
+        """Name of the module whose root is ``path`` or one of its parents."""
+        full = Path(os.path.abspath(path))
+        for directory in (full, *full.parents):
+            name = self._by_directory.get(str(directory))
+            if name is not None:
+                return name
+        return None
+
+    def dependents(self, names: Iterable[str]) -> Set[str]:
+        """``names`` (those in the graph) plus every module depending on them, transitively."""
+        reverse: Dict[str, List[str]] = {}
+        for name, depends in self.depends.items():
+            for dependency in depends:
+                reverse.setdefault(dependency, []).append(name)
+        affected = {name for name in names if name in self.roots}
+        pending = list(affected)
+        while pending:
+            for dependent in reverse.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return affected
+
+    def order(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """``names`` (default: every module) with each module after its dependencies.
+
+        Ties are broken by name. Modules in a dependency cycle, and the modules
+        depending on them, cannot be ordered; they come last, by name.
+        """
+        selected = set(self.roots if names is None else (name for name in names if name in self.roots))
+        waiting = {name: len({d for d in self.depends[name] if d in selected and d != name}) for name in selected}
+        dependents: Dict[str, List[str]] = {}
+        for name in selected:
+            for dependency in set(self.depends[name]):
+                if dependency in selected and dependency != name:
+                    dependents.setdefault(dependency, []).append(name)
+        ready = [name for name, count in waiting.items() if not count]
+        heapq.heapify(ready)
+        ordered: List[str] = []
+        while ready:
+            name = heapq.heappop(ready)
+            ordered.append(name)
+            for dependent in dependents.get(name, ()):
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    heapq.heappush(ready, dependent)
+        if len(ordered) < len(selected):
+            done = set(ordered)
+            ordered.extend(sorted(name for name in selected if name not in done))
+        return ordered
+
+    def missing(self) -> Dict[str, List[str]]:
+        """Dependencies of each module that are not in the graph (``base`` is always available)."""
+        found: Dict[str, List[str]] = {}
+        for name, depends in self.depends.items():
+            absent = [d for d in depends if d not in self.roots and d not in IMPLICIT_MODULES]
+            if absent:
+                found[name] = absent
+        return found
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of modules that depend on each other, each sorted by name (Tarjan's algorithm)."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        groups: List[List[str]] = []
+        for start in sorted(self.roots):
+            if start in index:
+                continue
+            # Iterative depth-first search: (module, position in its depends).
+            work = [(start, 0)]
+            while work:
+                name, position = work.pop()
+                if position == 0:
+                    index[name] = low[name] = len(index)
+                    stack.append(name)
+                    on_stack.add(name)
+                depends = [d for d in self.depends[name] if d in self.roots]
+                if position < len(depends):
+                    work.append((name, position + 1))
+                    dependency = depends[position]
+                    if dependency not in index:
+                        work.append((dependency, 0))
+                    elif dependency in on_stack:
+                        low[name] = min(low[name], index[dependency])
+                    continue
+                if low[name] == index[name]:
+                    group: List[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == name:
+                            break
+                    if len(group) > 1 or name in self.depends[name]:
+                        groups.append(sorted(group))
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[name])
+        return sorted(groups)
+
+    def check(self, names: Optional[Iterable[str]] = None, *, strict: bool = False) -> List[ValidationResult]:
+        """Missing dependencies and cycles of ``names`` (default: every module).
+
+        A missing dependency is a warning, or an error when ``strict``; a
+        cycle is always an error, since Odoo cannot install its modules.
+        Returns one result per module with findings.
+        """
+        selected = sorted(self.roots if names is None else {name for name in names if name in self.roots})
+        missing = self.missing()
+        in_cycle = {member: group for group in self.cycles() for member in group}
+        results: List[ValidationResult] = []
+        for name in selected:
+            manifest = self.roots[name] / '__manifest__.py'
+            result = ValidationResult()
+            for dependency in missing.get(name, ()):
+                message, args = "Module %s depends on %s, which is not on the addons path", (name, dependency)
+                if strict:
+                    result.add_error(message, *args, rule='module_depends_missing', path=manifest)
+                else:
+                    result.add_warning(message, *args, rule='module_depends_missing', path=manifest)
+            group = in_cycle.get(name)
+            if group is not None:
+                result.add_error(
+                    "Module %s is in a dependency cycle: %s", name, ', '.join(group),
+                    rule='module_depends_cycle', path=manifest,
+                )
+            if result.has_messages():
+                results.append(result)
+        return results
+
+    # ------------------------------------------------------------------
+    def _manifest_depends(self, manifest: Path) -> List[str]:
+        key = os.path.abspath(manifest)
+        try:
+            stat = os.stat(manifest)
+        except OSError:
+            return []
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return list(entry[2])
+        try:
+            data = parse_manifest(SourceFile(manifest))
+        except (OSError, SyntaxError, ValueError):
+            data = None
+        raw = data.get('depends') if data is not None else None
+        depends = [d for d in raw if isinstance(d, str)] if isinstance(raw, (list, tuple)) else []
+        self._entries[key] = [stat.st_mtime_ns, stat.st_size, depends]
+        self._dirty = True
+        self.parsed += 1
+        return depends
+
+    def _load(self) -> None:
+        assert self.cache_path is not None
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('format') == MODULE_GRAPH_FORMAT:
+            self._entries = dict(data.get('manifests') or {})
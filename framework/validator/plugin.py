@@ -2,32 +2,267 @@
 
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, SupportsIndex
+
+from .diagnostics import ERROR, FIX, SEVERITY_CODES, WARNING, Diagnostic, DiagnosticStore, PathLike
+from .fixes import TextEdit
+from .inventory import FileInventory
+from .profiling import Profiler
+from .source import SourceFile
+
+if TYPE_CHECKING:
+    from .symbols import FileSymbols
+    from .virtual import VirtualFileTree
+
+
+def pattern_kind(pattern: str) -> str:
+    """Classify a ``file_patterns`` entry as ``'glob'``, ``'suffix'`` or ``'name'``."""
+    if '/' in pattern or any(char in pattern for char in '*?['):
+        return 'glob'
+    return 'suffix' if pattern.startswith('.') else 'name'
+
+
+def matches_file_patterns(file_path: Path, patterns: Sequence[str]) -> bool:
+    for pattern in patterns:
+        kind = pattern_kind(pattern)
+        if kind == 'suffix' and file_path.suffix == pattern:
+            return True
+        if kind == 'name' and file_path.name == pattern:
+            return True
+        if kind == 'glob' and fnmatchcase(file_path.as_posix(), pattern):
+            return True
+    return False
+
+
+class MessageList(List[str]):
+    """The messages of one severity of a ``ValidationResult``, as a list.
+
+    It holds the messages formatted when it was created, and every change to
+    it is also made in the result's ``DiagnosticStore``, so
+    ``result.errors.append(...)`` records a finding (without rule or
+    location, like the old plain list). Copies and pickles are plain lists.
+    """
+
+    __slots__ = ('_result', '_severity')
+
+    def __init__(self, result: "ValidationResult", severity: int) -> None:
+        super().__init__(result.diagnostics.messages(severity))
+        self._result = result
+        self._severity = severity
+
+    def __reduce__(self) -> Any:
+        return list, (list(self),)
+
+    def _positions(self) -> List[int]:
+        return self._result.diagnostics.positions(self._severity)
+
+    def _refresh(self) -> None:
+        list.__init__(self, self._result.diagnostics.messages(self._severity))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        store = self._result.diagnostics
+        if not isinstance(index, slice):
+            store.set_message(self._positions()[index], value)
+            self._refresh()
+            return
+        positions = self._positions()
+        selected = positions[index]
+        values = list(value)
+        if len(values) == len(selected):
+            for position, message in zip(selected, values):
+                store.set_message(position, message)
+            self._refresh()
+            return
+        if index.step not in (None, 1):
+            raise ValueError(f"attempt to assign sequence of size {len(values)} to extended slice of size {len(selected)}")
+        start = index.indices(len(positions))[0]
+        del self[index]
+        for offset, message in enumerate(values):
+            self.insert(start + offset, message)
+
+    def __delitem__(self, index: Any) -> None:
+        store = self._result.diagnostics
+        selected = self._positions()[index]
+        for position in sorted(selected if isinstance(selected, list) else [selected], reverse=True):
+            store.delete(position)
+        self._refresh()
+
+    def insert(self, index: SupportsIndex, value: str) -> None:
+        positions = self._positions()
+        index = int(index)
+        if index < 0:
+            index = max(len(positions) + index, 0)
+        store = self._result.diagnostics
+        # Before the finding now at ``index``, or at the end of the store.
+        store.insert(positions[index] if index < len(positions) else len(store), self._severity, value)
+        self._refresh()
+
+    def append(self, value: str) -> None:
+        self.insert(len(self), value)
+
+    def extend(self, values: Iterable[str]) -> None:
+        # ``values`` may be another view of the same store (``r.errors.extend(r.errors)``).
+        for value in list(values):
+            self.append(value)
+
+    def __iadd__(self, values: Iterable[str]) -> "MessageList":  # type: ignore[override,misc]
+        self.extend(values)
+        return self
+
+    def __imul__(self, count: SupportsIndex) -> "MessageList":  # type: ignore[misc]
+        values = list(self)
+        if int(count) <= 0:
+            self.clear()
+        for _ in range(int(count) - 1):
+            self.extend(values)
+        return self
+
+    def pop(self, index: SupportsIndex = -1) -> str:
+        value = list.__getitem__(self, index)
+        del self[index]
+        return value
+
+    def remove(self, value: str) -> None:
+        del self[self.index(value)]
+
+    def clear(self) -> None:
+        del self[:]
+
+    def sort(self, *, key: Optional[Callable[[str], Any]] = None, reverse: bool = False) -> None:
+        values = list(self)
+        order = sorted(range(len(values)), key=lambda i: values[i] if key is None else key(values[i]), reverse=reverse)
+        self._result.diagnostics.permute(self._positions(), order)
+        self._refresh()
+
+    def reverse(self) -> None:
+        self._result.diagnostics.permute(self._positions(), list(reversed(range(len(self)))))
+        self._refresh()
 
 
 class ValidationResult:
-    """Aggregates validation issues detected by plugins."""
+    """Aggregates validation issues detected by plugins.
+
+    Findings live in a columnar ``DiagnosticStore``. ``errors``, ``warnings``
+    and ``auto_fixes`` are ``MessageList`` views of it: reading formats the
+    messages, and list operations on them update the store. The ``add_*``
+    helpers remain the way to report, since they also record the rule and
+    location.
+    """
 
     def __init__(self) -> None:
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
-        self.auto_fixes: List[str] = []
+        self.diagnostics = DiagnosticStore()
+        self.edits: List[TextEdit] = []
+        # What the file declares and references, for the cross-module checks (see ``symbols``).
+        self.symbols: Optional["FileSymbols"] = None
         self.is_valid: bool = True
 
-    def add_error(self, message: str) -> None:
-        self.errors.append(message)
+    def add_error(
+        self,
+        message: str,
+        *args: Any,
+        rule: Optional[str] = None,
+        path: Optional[PathLike] = None,
+        line: Optional[int] = None,
+        col: Optional[int] = None,
+    ) -> None:
+        self.diagnostics.append(ERROR, message, args, rule, path, line, col)
         self.is_valid = False
 
-    def add_warning(self, message: str) -> None:
-        self.warnings.append(message)
+    def add_warning(
+        self,
+        message: str,
+        *args: Any,
+        rule: Optional[str] = None,
+        path: Optional[PathLike] = None,
+        line: Optional[int] = None,
+        col: Optional[int] = None,
+    ) -> None:
+        self.diagnostics.append(WARNING, message, args, rule, path, line, col)
 
-    def add_auto_fix(self, message: str) -> None:
-        self.auto_fixes.append(message)
+    def add_auto_fix(
+        self,
+        message: str,
+        *args: Any,
+        rule: Optional[str] = None,
+        path: Optional[PathLike] = None,
+        line: Optional[int] = None,
+        col: Optional[int] = None,
+    ) -> None:
+        self.diagnostics.append(FIX, message, args, rule, path, line, col)
+
+    def add_edit(self, path: PathLike, start: int, end: int, replacement: str, *, rule: Optional[str] = None) -> None:
+        """Propose replacing ``text[start:end]`` of ``path`` (offsets into ``SourceFile.text``).
+
+        The validator applies edits after the run, when auto-fix is enabled;
+        plugins must not write files themselves.
+        """
+        self.edits.append(TextEdit(path, start, end, replacement, rule))
+
+    @property
+    def errors(self) -> MessageList:
+        return MessageList(self, ERROR)
+
+    @errors.setter
+    def errors(self, messages: Iterable[str]) -> None:
+        self._replace(ERROR, messages)
+
+    @property
+    def warnings(self) -> MessageList:
+        return MessageList(self, WARNING)
+
+    @warnings.setter
+    def warnings(self, messages: Iterable[str]) -> None:
+        self._replace(WARNING, messages)
+
+    @property
+    def auto_fixes(self) -> MessageList:
+        return MessageList(self, FIX)
+
+    @auto_fixes.setter
+    def auto_fixes(self, messages: Iterable[str]) -> None:
+        self._replace(FIX, messages)
+
+    def _replace(self, severity: int, messages: Iterable[str]) -> None:
+        messages = list(messages)  # may be a view of this very store
+        self.diagnostics.remove(severity)
+        for message in messages:
+            self.diagnostics.append(severity, message)
+
+    def count(self, severity: str) -> int:
+        return self.diagnostics.count(SEVERITY_CODES[severity])
 
     def has_messages(self) -> bool:
-        return bool(self.errors or self.warnings or self.auto_fixes)
+        return bool(len(self.diagnostics))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'diagnostics': [diagnostic.to_dict() for diagnostic in self.diagnostics],
+            'is_valid': self.is_valid,
+        }
+        if self.symbols is not None:
+            data['symbols'] = self.symbols.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ValidationResult":
+        result = cls()
+        if 'diagnostics' in data:
+            for item in data['diagnostics']:
+                result.diagnostics.add(Diagnostic.from_dict(item))
+        else:
+            result.errors = list(data.get('errors', []))
+            result.warnings = list(data.get('warnings', []))
+            result.auto_fixes = list(data.get('auto_fixes', []))
+        result.is_valid = bool(data.get('is_valid', not result.diagnostics.count(ERROR)))
+        if data.get('symbols') is not None:
+            from .symbols import FileSymbols  # symbols imports this module
+            result.symbols = FileSymbols.from_dict(data['symbols'])
+        return result
 
 
 @dataclass
@@ -41,6 +276,53 @@ class ValidationContext:
     verbose: bool = False
     module_name: Optional[str] = None
     scratch: Dict[str, Any] = field(default_factory=dict)
+    inventory: Optional[FileInventory] = None
+    current_source: Optional[SourceFile] = field(default=None, repr=False)
+    # Set by ``--profile``; plugins may record per-rule timings with ``profiler.add_rule``.
+    profiler: Optional[Profiler] = field(default=None, repr=False)
+    # Plugin instances serving this context. None means the plugin manager's
+    # own instances; modules scheduled together get clones of non-reentrant plugins.
+    plugins: Optional[List[Any]] = field(default=None, repr=False)
+    plugin_state: Dict[str, SimpleNamespace] = field(default_factory=dict, repr=False)
+    # In-memory files of an in-memory run; when set, plugins never see the disk.
+    files: Optional["VirtualFileTree"] = field(default=None, repr=False)
+    # Seconds spent running plugins on this context's files, summed over workers.
+    seconds: float = field(default=0.0, repr=False)
+
+    def state(self, plugin: Any) -> SimpleNamespace:
+        """Scratch namespace for ``plugin`` that lives as long as this context.
+
+        Keep per-run or per-module data here instead of on ``self``: several
+        modules may be validated at the same time by the same reentrant plugin.
+        """
+        state = self.plugin_state.get(plugin.name)
+        if state is None:
+            state = self.plugin_state.setdefault(plugin.name, SimpleNamespace())
+        return state
+
+    def get_source(self, file_path: Path) -> SourceFile:
+        """Return the shared ``SourceFile`` for ``file_path``, reading it only once per run."""
+        source = self.current_source
+        if source is None or source.path != file_path:
+            source = self.files.source(file_path) if self.files is not None else SourceFile(file_path)
+            self.current_source = source
+        return source
+
+    def exists(self, path: Path) -> bool:
+        """Whether ``path`` exists, in ``files`` for in-memory runs, otherwise on disk."""
+        return self.files.exists(path) if self.files is not None else path.exists()
+
+    def read_text(self, path: Path) -> str:
+        """Text of another file of the module (``get_source`` is for the file being validated)."""
+        return self.files.read_text(path) if self.files is not None else SourceFile(path).text
+
+    def inventory_for(self, directory: Path) -> FileInventory:
+        """The run's inventory when it covers ``directory``, otherwise a fresh scan of it."""
+        if self.inventory is not None and self.inventory.root == directory:
+            return self.inventory
+        if self.files is not None:
+            return self.files.inventory(directory)
+        return FileInventory.scan(directory)
 
 
 class ValidatorPlugin(Protocol):
@@ -61,6 +343,9 @@ class ValidatorPlugin(Protocol):
     def validate_file(self, file_path: Path, context: ValidationContext) -> Optional[ValidationResult]:
         ...
 
+    # Optional: ``validate_source(source: SourceFile, context)`` is preferred over
+    # ``validate_file`` when a plugin defines it.
+
     def finalize(self, context: ValidationContext) -> List[ValidationResult]:
         ...
 
@@ -70,6 +355,18 @@ class BaseValidatorPlugin:
 
     name = "base"
     description = "Base plugin"
+    # Suffixes (".py"), basenames ("__manifest__.py") or path globs ("*/views/*.xml")
+    # this plugin handles. None means "offer every file and let supports() decide".
+    file_patterns: Optional[Sequence[str]] = None
+    # Set to False when ``validate_file`` accumulates state that ``finalize``
+    # relies on; such plugins force a serial run even with ``--jobs``.
+    parallel_safe = True
+    # Bump when rule behaviour changes in a way the source hash cannot see.
+    version = "1"
+    # Set to True when hooks keep per-run data in ``context.state(self)`` only,
+    # so one instance can serve several modules at once. Other plugins get a
+    # ``clone()`` per module when modules are scheduled together.
+    reentrant = False
 
     def setup(self, context: ValidationContext) -> None:  # pragma: no cover - default noop
         return
@@ -77,11 +374,38 @@ class BaseValidatorPlugin:
     def validate_directory(self, directory: Path, context: ValidationContext) -> List[ValidationResult]:  # pragma: no cover - default noop
         return []
 
-    def supports(self, file_path: Path, context: ValidationContext) -> bool:  # pragma: no cover - default noop
-        return False
+    def supports(self, file_path: Path, context: ValidationContext) -> bool:
+        """Match ``file_patterns``; the plugin manager's dispatch index does this without calling us."""
+        return bool(self.file_patterns) and matches_file_patterns(file_path, self.file_patterns)
 
     def validate_file(self, file_path: Path, context: ValidationContext) -> Optional[ValidationResult]:  # pragma: no cover - default noop
         return None
 
+    def validate_source(self, source: SourceFile, context: ValidationContext) -> Optional[ValidationResult]:
+        """Validate an already loaded file; defaults to the path-based ``validate_file``."""
+        return self.validate_file(source.path, context)
+
     def finalize(self, context: ValidationContext) -> List[ValidationResult]:  # pragma: no cover - default noop
         return []
+
+    def is_cacheable(self, file_path: Path) -> bool:
+        """Return False when results for ``file_path`` depend on other files."""
+        return True
+
+    def cache_fingerprint(self) -> str:
+        """Runtime configuration that should invalidate cached results when it changes."""
+        return ""
+
+    def clone(self) -> "BaseValidatorPlugin":
+        """Independent copy used for one module when this plugin is not reentrant."""
+        return copy.deepcopy(self)
+
+
+def clone_plugin(plugin: Any) -> Any:
+    """``plugin.clone()``, or a deep copy for plugins without it; never copies profiling wrappers."""
+    clone = getattr(plugin, 'clone', None)
+    copied = clone() if callable(clone) else copy.deepcopy(plugin)
+    attributes = getattr(copied, '__dict__', {})
+    for name in [name for name, value in attributes.items() if getattr(value, '__wrapped_by_profiler__', False)]:
+        del attributes[name]
+    return copied
@@ -1,26 +1,262 @@
-"""Discovery and lifecycle management for validator plugins."""
+"""Discovery and lifecycle management for validator plugins.
+
+Plugins come from ``*.py`` files in plugin directories, from declarative
+rule packs (``*.toml``, ``*.json``, ``*.yaml``; see ``rulepacks``) next to
+them, and from the ``neodoo.validator_plugins`` entry point group of
+installed packages. Each file is loaded once per content hash: the same file
+listed through two directories, or copied into both, registers its plugins
+only once.
+
+With a manifest path (the CLI keeps it in the cache directory), discovery
+records what each plugin file declares (name, ``file_patterns``, flags and
+which hooks it overrides), keyed by path, mtime and size. Later runs
+register ``LazyPlugin`` stand-ins built from that record without importing
+the file. The module is only executed, and the plugin instantiated, once a
+file the plugin handles shows up.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import importlib.util
+import json
+import os
 import sys
-import uuid
+from fnmatch import fnmatchcase
+from importlib import metadata
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .inventory import FileInventory
+from .plugin import (
+    BaseValidatorPlugin,
+    ValidationContext,
+    ValidationResult,
+    ValidatorPlugin,
+    clone_plugin,
+    matches_file_patterns,
+    pattern_kind,
+)
+from .rulepacks import RULE_PACK_SUFFIXES, RulePackPlugin, load_rule_pack
+from .source import SourceFile
+
+ENTRY_POINT_GROUP = 'neodoo.validator_plugins'
 
-from .plugin import BaseValidatorPlugin, ValidatorPlugin
+# Bump when the manifest layout changes.
+MANIFEST_FORMAT = 2
+
+HOOK_NAMES = ('setup', 'validate_directory', 'supports', 'validate_file', 'validate_source', 'finalize')
 
 
 class PluginLoadError(Exception):
     """Raised when a plugin fails to load."""
 
 
+def describe(plugin: ValidatorPlugin) -> Dict[str, Any]:
+    """What dispatch and listing need to know about ``plugin``, as JSON-friendly data."""
+    patterns = getattr(plugin, 'file_patterns', None)
+    cls = plugin if isinstance(plugin, type) else type(plugin)
+    return {
+        'name': plugin.name,
+        'description': getattr(plugin, 'description', ''),
+        'file_patterns': list(patterns) if patterns is not None else None,
+        'parallel_safe': bool(getattr(plugin, 'parallel_safe', True)),
+        'reentrant': bool(getattr(plugin, 'reentrant', False)),
+        'version': str(getattr(plugin, 'version', '')),
+        'overrides': [
+            hook for hook in HOOK_NAMES
+            if getattr(cls, hook, None) is not None and getattr(cls, hook, None) is not getattr(BaseValidatorPlugin, hook, None)
+        ],
+    }
+
+
+class LazyPlugin:
+    """Stand-in that creates the real plugin the first time a file it handles appears.
+
+    Dispatch, listing and ``--jobs`` decisions use the recorded description.
+    Every context passed to ``setup`` is remembered (several modules may be
+    set up before any file is validated) and replayed on the real plugin
+    when it is created; ``finalize`` forgets the context again.
+    ``validate_directory`` creates the plugin only if the module holds a file
+    matching its ``file_patterns``. ``finalize`` is skipped for a plugin that
+    was never created.
+    """
+
+    def __init__(self, descriptor: Dict[str, Any], factory: Callable[[], ValidatorPlugin]) -> None:
+        self.name: str = descriptor['name']
+        self.description: str = descriptor.get('description', '')
+        patterns = descriptor.get('file_patterns')
+        self.file_patterns: Optional[Tuple[str, ...]] = tuple(patterns) if patterns is not None else None
+        self.parallel_safe: bool = descriptor.get('parallel_safe', True)
+        self.reentrant: bool = descriptor.get('reentrant', False)
+        self.version: str = descriptor.get('version', '')
+        self.overrides = frozenset(descriptor.get('overrides', ()))
+        self._descriptor = descriptor
+        self._factory = factory
+        self._plugin: Optional[ValidatorPlugin] = None
+        self._setup_contexts: Dict[int, ValidationContext] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._plugin is not None
+
+    def resolve(self) -> ValidatorPlugin:
+        """The real plugin, created (and set up for the current run) on first use."""
+        if self._plugin is None:
+            try:
+                self._plugin = self._factory()
+            except Exception as exc:
+                self._plugin = _UnavailablePlugin(self.name, exc)
+            for context in self._setup_contexts.values():
+                self._plugin.setup(context)
+            self._setup_contexts.clear()
+        return self._plugin
+
+    def clone(self) -> "LazyPlugin":
+        """A stand-in whose plugin, once needed, is a clone of this one's."""
+        return LazyPlugin(self._descriptor, lambda: clone_plugin(self.resolve()))
+
+    # ------------------------------------------------------------------
+    def setup(self, context: ValidationContext) -> None:
+        if self._plugin is None:
+            self._setup_contexts[id(context)] = context
+        else:
+            self._plugin.setup(context)
+
+    def validate_directory(self, directory: Path, context: ValidationContext) -> List[ValidationResult]:
+        if 'validate_directory' not in self.overrides:
+            return []
+        if self._plugin is None and not self._handles_any(context.inventory_for(directory)):
+            return []
+        return self.resolve().validate_directory(directory, context)
+
+    def supports(self, file_path: Path, context: ValidationContext) -> bool:
+        return self.resolve().supports(file_path, context)
+
+    def validate_file(self, file_path: Path, context: ValidationContext) -> Optional[ValidationResult]:
+        return self.resolve().validate_file(file_path, context)
+
+    def validate_source(self, source: SourceFile, context: ValidationContext) -> Optional[ValidationResult]:
+        plugin = self.resolve()
+        validate_source = getattr(plugin, 'validate_source', None)
+        if validate_source is not None:
+            return validate_source(source, context)
+        return plugin.validate_file(source.path, context)
+
+    def finalize(self, context: ValidationContext) -> List[ValidationResult]:
+        if self._plugin is None:
+            self._setup_contexts.pop(id(context), None)
+            return []
+        return self._plugin.finalize(context)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else (is_cacheable, cache_fingerprint, plugin-specific API) needs the real plugin.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def _handles_any(self, inventory: FileInventory) -> bool:
+        if self.file_patterns is None:
+            return True
+        return any(matches_file_patterns(path, self.file_patterns) for path in inventory.files)
+
+    def __repr__(self) -> str:
+        return f"LazyPlugin({self.name!r}, loaded={self.loaded})"
+
+
+class DispatchIndex:
+    """Routes files to plugins from their declared ``file_patterns``.
+
+    Patterns are classified once: ``.py`` is a suffix, ``__manifest__.py`` a
+    basename, and anything containing ``/`` or glob characters is matched with
+    ``fnmatch`` against the file's posix path (``*`` also crosses ``/``).
+    Plugins without ``file_patterns`` are offered every file, as before.
+    """
+
+    def __init__(self, plugins: Sequence[ValidatorPlugin]) -> None:
+        self._by_suffix: Dict[str, Set[int]] = {}
+        self._by_name: Dict[str, Set[int]] = {}
+        self._globs: List[Tuple[int, str]] = []
+        self._catch_all: Set[int] = set()
+        self._static: Dict[Tuple[str, str], List[int]] = {}
+        self.needs_supports: List[bool] = []
+
+        for index, plugin in enumerate(plugins):
+            patterns: Optional[Sequence[str]] = getattr(plugin, 'file_patterns', None)
+            if patterns is None:
+                self._catch_all.add(index)
+                self.needs_supports.append(True)
+                continue
+            self.needs_supports.append(_overrides_supports(plugin))
+            for pattern in patterns:
+                kind = pattern_kind(pattern)
+                if kind == 'glob':
+                    self._globs.append((index, pattern))
+                elif kind == 'suffix':
+                    self._by_suffix.setdefault(pattern, set()).add(index)
+                else:
+                    self._by_name.setdefault(pattern, set()).add(index)
+
+    def route(self, file_path: Path) -> List[int]:
+        """Indexes (in registration order) of plugins that may handle ``file_path``."""
+        key = (file_path.suffix, file_path.name)
+        static = self._static.get(key)
+        if static is None:
+            matched = set(self._catch_all)
+            matched.update(self._by_suffix.get(key[0], ()))
+            matched.update(self._by_name.get(key[1], ()))
+            static = sorted(matched)
+            self._static[key] = static
+        if not self._globs:
+            return static
+        posix = file_path.as_posix()
+        extra = {index for index, pattern in self._globs if index not in static and fnmatchcase(posix, pattern)}
+        return sorted(extra.union(static)) if extra else static
+
+
+class _UnavailablePlugin(BaseValidatorPlugin):
+    """Takes the place of a lazy plugin whose file no longer loads; reports that once."""
+
+    def __init__(self, name: str, error: Exception) -> None:
+        self.name = name
+        self.error = error
+        self._reported = False
+
+    def validate_file(self, file_path: Path, context: ValidationContext) -> Optional[ValidationResult]:
+        if self._reported:
+            return None
+        self._reported = True
+        result = ValidationResult()
+        result.add_error("Plugin %s could not be loaded: %s", self.name, self.error, rule='plugin_load_error')
+        return result
+
+    def is_cacheable(self, file_path: Path) -> bool:
+        return False
+
+
+def _overrides_supports(plugin: ValidatorPlugin) -> bool:
+    if isinstance(plugin, LazyPlugin):
+        return 'supports' in plugin.overrides
+    supports = getattr(type(plugin), 'supports', None)
+    return supports is not None and supports is not BaseValidatorPlugin.supports
+
+
 class PluginManager:
     """Keeps track of validator plugins and can discover external ones."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, manifest_path: Optional[Path] = None) -> None:
         self._plugins: List[ValidatorPlugin] = []
         self._load_errors: List[str] = []
+        self._dispatch: Optional[DispatchIndex] = None
+        self.manifest_path = manifest_path
+        self._manifest: Optional[Dict[str, Dict[str, Any]]] = None
+        self._manifest_dirty = False
+        # Content hash of every plugin file loaded so far -> its path.
+        self._digests: Dict[str, Path] = {}
+        # Plugins of each executed plugin file, by content hash.
+        self._executed: Dict[str, List[ValidatorPlugin]] = {}
+        # (skipped file, identical file already loaded)
+        self.duplicates: List[Tuple[Path, Path]] = []
 
     @property
     def plugins(self) -> List[ValidatorPlugin]:
@@ -30,8 +266,15 @@ class PluginManager:
     def load_errors(self) -> List[str]:
         return list(self._load_errors)
 
+    @property
+    def dispatch(self) -> DispatchIndex:
+        if self._dispatch is None:
+            self._dispatch = DispatchIndex(self._plugins)
+        return self._dispatch
+
     def register(self, plugin: ValidatorPlugin) -> None:
         self._plugins.append(plugin)
+        self._dispatch = None
 
     def register_many(self, plugins: List[ValidatorPlugin]) -> None:
         for plugin in plugins:
@@ -43,13 +286,53 @@ class PluginManager:
             self._load_errors.append(f"Plugin directory not found: {directory}")
             return
 
-        for path in sorted(directory.glob('*.py')):
-            if path.name.startswith('_'):
+        for path in sorted(directory.iterdir()):
+            if path.name.startswith('_') or not path.is_file():
                 continue
             try:
-                self._load_module(path)
+                if path.suffix == '.py':
+                    self._load_file(path)
+                elif path.suffix in RULE_PACK_SUFFIXES:
+                    self.load_rule_pack(path)
             except Exception as exc:  # pragma: no cover - defensive
                 self._load_errors.append(f"Failed to load plugin '{path}': {exc}")
+        self._save_manifest()
+
+    def load_rule_pack(self, file_path: Path) -> None:
+        """Register the rules of the pack at ``file_path`` as one plugin."""
+        pack = load_rule_pack(file_path.expanduser().resolve())
+        first = self._digests.get(pack.digest)
+        if first is not None:
+            self.duplicates.append((file_path, first))
+            return
+        self._digests[pack.digest] = file_path
+        self.register(RulePackPlugin(pack))
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """Register plugins that installed packages declare under the ``group`` entry point.
+
+        An entry point may name a plugin class, which is only instantiated once
+        a file it handles appears, a plugin instance, or a ``register``-style
+        callable returning one or more plugins.
+        """
+        try:
+            entry_points = list(metadata.entry_points(group=group))
+        except TypeError:  # Python < 3.10
+            entry_points = list(metadata.entry_points().get(group, []))  # type: ignore[attr-defined]
+        for entry_point in sorted(entry_points, key=lambda item: item.name):
+            try:
+                target = entry_point.load()
+                if isinstance(target, type):
+                    self.register(LazyPlugin(describe(target), target))
+                    continue
+                registered = target() if callable(target) and not hasattr(target, 'name') else target
+                plugins = list(registered) if isinstance(registered, (list, tuple)) else [registered]
+                for plugin in plugins:
+                    if not hasattr(plugin, 'name'):
+                        raise PluginLoadError(f"Plugin {plugin} missing 'name' attribute")
+                    self.register(plugin)
+            except Exception as exc:
+                self._load_errors.append(f"Failed to load plugin entry point '{entry_point.name}': {exc}")
 
     def describe_plugins(self) -> List[str]:
         descriptions = []
@@ -59,17 +342,64 @@ class PluginManager:
         return descriptions
 
     # ------------------------------------------------------------------
-    def _load_module(self, file_path: Path) -> None:
-        module_name = f"neodoo_validator_plugin_{file_path.stem}_{uuid.uuid4().hex}"
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-        if spec is None or spec.loader is None:
-            raise PluginLoadError(f"Cannot create import spec for {file_path}")
+    def _load_file(self, file_path: Path) -> None:
+        stat = file_path.stat()
+        record = self._manifest_record(file_path, stat)
+        digest = record['sha256'] if record is not None else hashlib.sha256(file_path.read_bytes()).hexdigest()
+        first = self._digests.get(digest)
+        if first is not None:
+            self.duplicates.append((file_path, first))
+            return
+        self._digests[digest] = file_path
+
+        if record is not None:
+            for index, descriptor in enumerate(record['plugins']):
+                self.register(LazyPlugin(descriptor, self._factory(file_path, digest, index, descriptor['name'])))
+            return
 
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
+        plugins = self._execute_file(file_path, digest)
+        self.register_many(plugins)
+        if self.manifest_path is not None:
+            self._manifest_entries()[str(file_path)] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': digest,
+                'plugins': [describe(plugin) for plugin in plugins],
+            }
+            self._manifest_dirty = True
+
+    def _factory(self, file_path: Path, digest: str, index: int, name: str) -> Callable[[], ValidatorPlugin]:
+        def create() -> ValidatorPlugin:
+            plugins = self._execute_file(file_path, digest)
+            if index < len(plugins) and plugins[index].name == name:
+                return plugins[index]
+            for plugin in plugins:
+                if plugin.name == name:
+                    return plugin
+            raise PluginLoadError(f"Plugin '{name}' is no longer defined in {file_path}")
+        return create
+
+    def _execute_file(self, file_path: Path, digest: str) -> List[ValidatorPlugin]:
+        """Import ``file_path`` (once per content hash) and return the plugins it defines."""
+        plugins = self._executed.get(digest)
+        if plugins is not None:
+            return plugins
+
+        module_name = f"neodoo_validator_plugin_{file_path.stem}_{digest[:16]}"
+        module = sys.modules.get(module_name)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            if spec is None or spec.loader is None:
+                raise PluginLoadError(f"Cannot create import spec for {file_path}")
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[module_name]
+                raise
 
-        plugins: List[ValidatorPlugin] = []
+        plugins = []
         if hasattr(module, 'register'):
             registered = module.register()
             if isinstance(registered, (list, tuple)):
@@ -88,4 +418,41 @@ class PluginManager:
         for plugin in plugins:
             if not hasattr(plugin, 'name'):
                 raise PluginLoadError(f"Plugin {plugin} missing 'name' attribute")
-            self.register(plugin)
+        self._executed[digest] = plugins
+        return plugins
+
+    # ------------------------------------------------------------------
+    def _manifest_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._manifest is None:
+            self._manifest = {}
+            if self.manifest_path is not None:
+                try:
+                    data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+                except (OSError, ValueError):
+                    data = None
+                if isinstance(data, dict) and data.get('format') == MANIFEST_FORMAT:
+                    self._manifest = data.get('files', {})
+        return self._manifest
+
+    def _manifest_record(self, file_path: Path, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        if self.manifest_path is None:
+            return None
+        record = self._manifest_entries().get(str(file_path))
+        if record is None or record.get('mtime_ns') != stat.st_mtime_ns or record.get('size') != stat.st_size:
+            return None
+        return record
+
+    def _save_manifest(self) -> None:
+        if self.manifest_path is None or not self._manifest_dirty:
+            return
+        entries = {path: record for path, record in self._manifest_entries().items() if Path(path).is_file()}
+        payload = json.dumps({'format': MANIFEST_FORMAT, 'files': entries}, indent=1, sort_keys=True)
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.manifest_path.with_name(f'.{self.manifest_path.name}.{os.getpid()}.tmp')
+            temp_path.write_text(payload, encoding='utf-8')
+            os.replace(temp_path, self.manifest_path)
+        except OSError as exc:
+            self._load_errors.append(f"Could not write plugin manifest {self.manifest_path}: {exc}")
+            return
+        self._manifest_dirty = False
@@ -4,22 +4,45 @@ from __future__ import annotations
 
 import ast
 import re
+import xml.etree.ElementTree as ET
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Dict, List, Optional
 
+from .. import ast_rules, symbols
+from ..cache import source_digest
+from ..inventory import FileInventory
+from ..module_graph import parse_manifest
 from ..plugin import BaseValidatorPlugin, ValidationContext, ValidationResult
+from ..source import SourceFile
+from ..symbols import FileSymbols
+from . import python_rules, xml_checks
+
+# How each AST rule id is reported: always an error, always a warning, or a
+# warning promoted to an error in strict mode (optionally except templates).
+PYTHON_RULE_SEVERITY = {
+    'compute_depends': 'error',
+    'model_description': 'error',
+    'print_call': 'strict_unless_template',
+    'debug_statement': 'strict',
+    'action_ensure_one': 'warning',
+}
 
 
 class CoreRulesPlugin(BaseValidatorPlugin):
     name = "core_rules"
     description = "Built-in Odoo 18+ compliance checks"
+    # CSV files are only read for the symbol index.
+    file_patterns = ('.py', '.xml', '.csv')
+    # Rules and the AST engine are read-only after __init__; per-run data comes from the context.
+    reentrant = True
 
     def __init__(self) -> None:
-        self.module_name: Optional[str] = None
+        self.python_engine = python_rules.build_engine()
         self.xml_rules = {
             'deprecated_tree': {
-                'pattern': r'<tree\s',
-                'replacement': '<list ',
+                'pattern': r'<tree(?=[\s/>])',
+                'replacement': '<list',
                 'message': 'Use <list> instead of <tree> in Odoo 18+'
             },
             'deprecated_tree_close': {
@@ -36,13 +59,15 @@ class CoreRulesPlugin(BaseValidatorPlugin):
 
     # ------------------------------------------------------------------
     def setup(self, context: ValidationContext) -> None:
-        if context.module_name:
-            self.module_name = context.module_name
-        else:
-            self.module_name = context.root.name
+        context.state(self).module_prefix = (context.module_name or context.root.name or '').strip()
 
-    def supports(self, file_path: Path, context: ValidationContext) -> bool:
-        return file_path.suffix in {'.py', '.xml'} or file_path.name == '__manifest__.py'
+    def cache_fingerprint(self) -> str:
+        # Python and XML rules live in helper modules that the plugin source hash does not cover.
+        return source_digest(python_rules, ast_rules, xml_checks, symbols)
+
+    def is_cacheable(self, file_path: Path) -> bool:
+        # Manifest checks look at the data files they list, not only their own content.
+        return file_path.name != '__manifest__.py'
 
     def validate_directory(self, directory: Path, context: ValidationContext) -> List[ValidationResult]:
         results: List[ValidationResult] = []
@@ -50,228 +75,307 @@ class CoreRulesPlugin(BaseValidatorPlugin):
         module_name = directory.name
         if not re.match(r'^[a-z][a-z0-9_]*$', module_name):
             res = ValidationResult()
-            res.add_error(f"Module directory '{module_name}' must be snake_case (lowercase, digits, underscores)")
+            res.add_error(f"Module directory '{module_name}' must be snake_case (lowercase, digits, underscores)", rule='module_name', path=directory)
             results.append(res)
 
-        has_access_csv = False
-        access_csv_path: Optional[Path] = None
-        for path in directory.glob('**/*'):
-            if path.name == 'ir.model.access.csv':
-                has_access_csv = True
-                access_csv_path = path
-                break
+        inventory = context.inventory_for(directory)
+        access_csvs = inventory.named('ir.model.access.csv')
+        has_access_csv = bool(access_csvs)
+        access_csv_path: Optional[Path] = access_csvs[0] if access_csvs else None
 
         if not has_access_csv:
             res = ValidationResult()
             if context.template_mode:
-                res.add_warning(f"Missing ir.model.access.csv in {directory}")
+                res.add_warning("Missing ir.model.access.csv in %s", directory, rule='access_csv_missing', path=directory)
             else:
-                res.add_error(f"Missing ir.model.access.csv in {directory}")
+                res.add_error("Missing ir.model.access.csv in %s", directory, rule='access_csv_missing', path=directory)
             results.append(res)
         elif access_csv_path is not None:
             try:
-                header = access_csv_path.read_text(encoding='utf-8').splitlines()[0].strip()
+                header = context.read_text(access_csv_path).splitlines()[0].strip()
                 expected = 'id,name,model_id:id,group_id:id,perm_read,perm_write,perm_create,perm_unlink'
                 if header.replace(' ', '') != expected:
                     res = ValidationResult()
                     message = f"{access_csv_path}: Unexpected CSV header. Expected '{expected}'"
                     if context.strict and not context.template_mode:
-                        res.add_error(message)
+                        res.add_error(message, rule='access_csv_header', path=access_csv_path, line=1)
                     else:
-                        res.add_warning(message)
+                        res.add_warning(message, rule='access_csv_header', path=access_csv_path, line=1)
                     results.append(res)
             except Exception as exc:
                 res = ValidationResult()
-                res.add_warning(f"{access_csv_path}: Could not read header ({exc})")
+                res.add_warning(f"{access_csv_path}: Could not read header ({exc})", rule='access_csv_header', path=access_csv_path)
                 results.append(res)
 
-        results.extend(self._check_models_init(directory))
+        results.extend(self._check_models_init(directory, inventory, context))
         return results
 
     def validate_file(self, file_path: Path, context: ValidationContext) -> Optional[ValidationResult]:
+        return self.validate_source(context.get_source(file_path), context)
+
+    def validate_source(self, source: SourceFile, context: ValidationContext) -> Optional[ValidationResult]:
+        file_path = source.path
         if file_path.name == '__manifest__.py':
-            return self._validate_manifest(file_path, context)
+            return self._validate_manifest(source, context)
         if file_path.suffix == '.xml':
-            return self._validate_xml(file_path, context)
+            return self._validate_xml(source, context)
         if file_path.suffix == '.py':
-            return self._validate_python(file_path, context)
+            return self._validate_python(source, context)
+        if file_path.suffix == '.csv':
+            result = ValidationResult()
+            result.symbols = symbols.csv_symbols(file_path, source.text)
+            return result
         return None
 
     # ------------------------------------------------------------------
-    def _validate_xml(self, file_path: Path, context: ValidationContext) -> ValidationResult:
+    def _validate_xml(self, source: SourceFile, context: ValidationContext) -> ValidationResult:
+        file_path = source.path
         result = ValidationResult()
         try:
-            content = file_path.read_text(encoding='utf-8')
+            try:
+                started = perf_counter()
+                with source.open() as stream:
+                    scan = xml_checks.scan_xml(stream)
+                if context.profiler is not None:
+                    context.profiler.add_rule(self.name, 'xml_scan', perf_counter() - started, len(source.raw))
+            except ET.ParseError:
+                self._validate_xml_text(source, context, result)
+                return result
+            result.symbols = FileSymbols(records=scan.records, refs=[('ref', ref) for ref in scan.refs], views=scan.views)
 
+            matched = {
+                'deprecated_tree': scan.has_tree,
+                # The parser reports ``<tree></tree>`` like ``<tree/>``; look at the text to tell them apart.
+                'deprecated_tree_close': scan.has_tree_close or (scan.has_tree and '</tree>' in source.text),
+                'deprecated_view_mode': scan.has_tree_view_mode,
+            }
             for rule_name, rule in self.xml_rules.items():
-                if re.search(rule['pattern'], content):
-                    result.add_error(f"{rule['message']} in {file_path}")
+                if matched[rule_name]:
+                    result.add_error("%s in %s", rule['message'], file_path, rule=rule_name, path=file_path)
                     if context.auto_fix and 'replacement' in rule:
-                        replacement = rule['replacement']
-                        if callable(replacement):
-                            new_content = re.sub(rule['pattern'], replacement, content)
-                        else:
-                            new_content = re.sub(rule['pattern'], rule['replacement'], content)
-                        file_path.write_text(new_content, encoding='utf-8')
-                        result.add_auto_fix(f"Fixed {rule_name} in {file_path}")
-                        content = new_content
-
-            if 'ir.actions.act_window' in content:
-                for match in re.finditer(r'<field\s+name=["\']view_mode["\']>([^<]+)</field>', content):
-                    modes = match.group(1).strip()
-                    if 'list' not in modes:
-                        self._warn_or_error(result, context, f"Action view_mode without 'list' in {file_path}: '{modes}'", strict_as_error=False)
-                    if 'list' in modes and 'form' not in modes:
-                        self._warn_or_error(result, context, f"Action view_mode should include 'form' with 'list' in {file_path}: '{modes}'", strict_as_error=False)
-
-            module_prefix = (self.module_name or '').strip()
+                        self._fix_xml_rule(source, rule_name, rule, result)
+
+            for modes in scan.action_view_modes:
+                self._check_action_view_mode(result, context, file_path, modes)
+
+            module_prefix = self._module_prefix(context)
             if module_prefix:
-                for match in re.finditer(r'<record\s+id=["\']([^"\']+)["\']', content):
-                    rec_id = match.group(1)
-                    if not rec_id.startswith(f"{module_prefix}_"):
-                        self._warn_or_error(result, context, f"XML record id '{rec_id}' should be prefixed with '{module_prefix}_' ({file_path})", strict_as_error=False)
+                for rec_id in scan.record_ids:
+                    self._check_record_prefix(result, context, file_path, rec_id, module_prefix)
         except Exception as exc:
-            result.add_error(f"Error processing {file_path}: {exc}")
+            result.add_error("Error processing %s: %s", file_path, exc, rule='internal_error', path=file_path)
         return result
 
-    def _validate_python(self, file_path: Path, context: ValidationContext) -> ValidationResult:
+    def _validate_xml_text(self, source: SourceFile, context: ValidationContext, result: ValidationResult) -> None:
+        """Regex fallback for documents the streaming parser rejects."""
+        file_path = source.path
+        for rule_name, rule in self.xml_rules.items():
+            match = re.search(rule['pattern'], source.text)
+            if match:
+                result.add_error("%s in %s", rule['message'], file_path, rule=rule_name, path=file_path, line=source.line_of(match.start()))
+                if context.auto_fix and 'replacement' in rule:
+                    self._fix_xml_rule(source, rule_name, rule, result)
+
+        content = source.text
+        if 'ir.actions.act_window' in content:
+            for match in re.finditer(r'<field\s+name=["\']view_mode["\']>([^<]+)</field>', content):
+                self._check_action_view_mode(result, context, file_path, match.group(1).strip())
+
+        module_prefix = self._module_prefix(context)
+        if module_prefix:
+            for match in re.finditer(r'<record\s+id=["\']([^"\']+)["\']', content):
+                self._check_record_prefix(result, context, file_path, match.group(1), module_prefix)
+
+    def _fix_xml_rule(self, source: SourceFile, rule_name: str, rule: Dict[str, Any], result: ValidationResult) -> None:
+        file_path = source.path
+        replacement = rule['replacement']
+        for match in re.finditer(rule['pattern'], source.text):
+            new_text = replacement(match) if callable(replacement) else match.expand(replacement)
+            result.add_edit(file_path, match.start(), match.end(), new_text, rule=rule_name)
+        result.add_auto_fix("Fixed %s in %s", rule_name, file_path, rule=rule_name, path=file_path)
+
+    def _check_action_view_mode(self, result: ValidationResult, context: ValidationContext, file_path: Path, modes: str) -> None:
+        if 'list' not in modes:
+            self._warn_or_error(result, context, "Action view_mode without 'list' in %s: '%s'", file_path, modes, strict_as_error=False, rule='action_view_mode', path=file_path)
+        if 'list' in modes and 'form' not in modes:
+            self._warn_or_error(result, context, "Action view_mode should include 'form' with 'list' in %s: '%s'", file_path, modes, strict_as_error=False, rule='action_view_mode', path=file_path)
+
+    def _check_record_prefix(self, result: ValidationResult, context: ValidationContext, file_path: Path, rec_id: str, module_prefix: str) -> None:
+        if not rec_id.startswith(f"{module_prefix}_"):
+            self._warn_or_error(result, context, "XML record id '%s' should be prefixed with '%s_' (%s)", rec_id, module_prefix, file_path, strict_as_error=False, rule='xml_id_prefix', path=file_path)
+
+    def _validate_python(self, source: SourceFile, context: ValidationContext) -> ValidationResult:
+        file_path = source.path
         result = ValidationResult()
         try:
-            content = file_path.read_text(encoding='utf-8')
-            lines = content.split('\n')
+            content = source.text
 
             if not re.search(r'# -\*- coding: utf-8 -\*-', content):
-                result.add_error(f"Missing UTF-8 encoding declaration in {file_path}")
+                result.add_error("Missing UTF-8 encoding declaration in %s", file_path, rule='utf8_header', path=file_path, line=1)
                 if context.auto_fix:
-                    if lines and lines[0].startswith('#!'):
-                        lines.insert(1, '# -*- coding: utf-8 -*-')
+                    first_line = source.lines[0]
+                    if first_line.startswith('#!'):
+                        result.add_edit(file_path, len(first_line), len(first_line), '\n# -*- coding: utf-8 -*-', rule='utf8_header')
                     else:
-                        lines.insert(0, '# -*- coding: utf-8 -*-')
-                    file_path.write_text('\n'.join(lines), encoding='utf-8')
-                    result.add_auto_fix(f"Added UTF-8 encoding to {file_path}")
-                    content = '\n'.join(lines)
-
-            for match in re.finditer(r'def (_compute_[^(]*)\(self', content):
-                method_name = match.group(1)
-                method_pos = match.start()
-                preceding_lines = content[max(0, method_pos - 200):method_pos]
-                if not re.search(r'@api\.depends', preceding_lines):
-                    result.add_error(f"Missing @api.depends for {method_name} in {file_path}")
-
-            if '_name' in content and 'models.Model' in content:
-                for match in re.finditer(r'class\s+(\w+)\(models\.Model\)', content):
-                    class_name = match.group(1)
-                    class_pos = match.start()
-                    next_lines = content[class_pos:class_pos + 500]
-                    has_name = re.search(r'_name\s*=', next_lines)
-                    has_description = re.search(r'_description\s*=', next_lines)
-                    if has_name and not has_description:
-                        result.add_error(f"Model {class_name} has _name but missing _description in {file_path}")
-
-            for i, line in enumerate(lines, start=1):
-                if re.search(r'^\s*print\(', line):
-                    self._warn_or_error(result, context, f"Avoid print() in code ({file_path}:{i}); use _logger instead", strict_as_error=not context.template_mode)
-                if 'pdb.set_trace' in line or re.search(r'^\s*breakpoint\(', line):
-                    self._warn_or_error(result, context, f"Debug statements (pdb/breakpoint) found in {file_path}:{i}", strict_as_error=True)
-
-            for match in re.finditer(r'def\s+(action_\w+|button_\w+)\(self[^\)]*\):', content):
-                start = match.end()
-                tail = content[start:]
-                stop_match = re.search(r'\n\s*def\s|\n\s*class\s', tail)
-                body = tail[:stop_match.start()] if stop_match else tail
-                if 'self.ensure_one()' not in body:
-                    self._warn_or_error(result, context, f"Method {match.group(1)} should call self.ensure_one() in {file_path}", strict_as_error=False)
+                        result.add_edit(file_path, 0, 0, '# -*- coding: utf-8 -*-\n', rule='utf8_header')
+                    result.add_auto_fix("Added UTF-8 encoding to %s", file_path, rule='utf8_header', path=file_path, line=1)
+
+            try:
+                started = perf_counter()
+                tree = source.python_ast
+            except SyntaxError as exc:
+                # Only a warning: files that never parsed used to pass, and the text checks below still run.
+                if not context.template_mode:
+                    result.add_warning("Syntax error in %s:%s: %s", file_path, exc.lineno, exc.msg, rule='syntax_error', path=file_path, line=exc.lineno, col=exc.offset)
+                self._validate_python_text(source, context, result)
+                return result
+            if context.profiler is not None:
+                context.profiler.add_rule(self.name, 'python_parse', perf_counter() - started, len(source.raw))
+            result.symbols = FileSymbols(models=symbols.python_symbols(tree))
+
+            def report(rule_id: str, node: ast.AST, message: str) -> None:
+                line = getattr(node, 'lineno', 0)
+                col = getattr(node, 'col_offset', 0) + 1
+                location = dict(rule=rule_id, path=file_path, line=line, col=col)
+                severity = PYTHON_RULE_SEVERITY[rule_id]
+                if severity == 'error':
+                    result.add_error("%s in %s:%d:%d", message, file_path, line, col, **location)
+                else:
+                    strict_as_error = severity == 'strict' or (severity == 'strict_unless_template' and not context.template_mode)
+                    self._warn_or_error(result, context, "%s in %s:%d:%d", message, file_path, line, col, strict_as_error=strict_as_error, **location)
+
+            profiler = context.profiler
+            if profiler is None:
+                self.python_engine.run(tree, report)
+            else:
+                timings: Dict[str, List[float]] = {}
+                self.python_engine.run(tree, report, timings=timings)
+                for rule_id, (calls, seconds) in timings.items():
+                    profiler.add_rule(self.name, rule_id, seconds, len(source.raw), int(calls))
         except Exception as exc:
-            result.add_error(f"Error processing {file_path}: {exc}")
+            result.add_error("Error processing %s: %s", file_path, exc, rule='internal_error', path=file_path)
         return result
 
-    def _validate_manifest(self, file_path: Path, context: ValidationContext) -> ValidationResult:
+    def _validate_python_text(self, source: SourceFile, context: ValidationContext, result: ValidationResult) -> None:
+        """Regex approximation of the AST rules for files that do not parse (e.g. templates)."""
+        file_path = source.path
+        content = source.text
+        lines = source.lines
+
+        for match in re.finditer(r'def (_compute_[^(]*)\(self', content):
+            method_name = match.group(1)
+            method_pos = match.start()
+            preceding_lines = content[max(0, method_pos - 200):method_pos]
+            if not re.search(r'@api\.depends', preceding_lines):
+                result.add_error("Missing @api.depends for %s in %s", method_name, file_path, rule='compute_depends', path=file_path, line=source.line_of(method_pos))
+
+        if '_name' in content and 'models.Model' in content:
+            for match in re.finditer(r'class\s+(\w+)\(models\.Model\)', content):
+                class_name = match.group(1)
+                class_pos = match.start()
+                next_lines = content[class_pos:class_pos + 500]
+                has_name = re.search(r'_name\s*=', next_lines)
+                has_description = re.search(r'_description\s*=', next_lines)
+                if has_name and not has_description:
+                    result.add_error("Model %s has _name but missing _description in %s", class_name, file_path, rule='model_description', path=file_path, line=source.line_of(class_pos))
+
+        for i, line in enumerate(lines, start=1):
+            if re.search(r'^\s*print\(', line):
+                self._warn_or_error(result, context, "Avoid print() in code (%s:%d); use _logger instead", file_path, i, strict_as_error=not context.template_mode, rule='print_call', path=file_path, line=i)
+            if 'pdb.set_trace' in line or re.search(r'^\s*breakpoint\(', line):
+                self._warn_or_error(result, context, "Debug statements (pdb/breakpoint) found in %s:%d", file_path, i, strict_as_error=True, rule='debug_statement', path=file_path, line=i)
+
+        for match in re.finditer(r'def\s+(action_\w+|button_\w+)\(self[^\)]*\):', content):
+            start = match.end()
+            tail = content[start:]
+            stop_match = re.search(r'\n\s*def\s|\n\s*class\s', tail)
+            body = tail[:stop_match.start()] if stop_match else tail
+            if 'self.ensure_one()' not in body:
+                self._warn_or_error(result, context, "Method %s should call self.ensure_one() in %s", match.group(1), file_path, strict_as_error=False, rule='action_ensure_one', path=file_path, line=source.line_of(match.start()))
+
+    def _validate_manifest(self, source: SourceFile, context: ValidationContext) -> ValidationResult:
+        file_path = source.path
         result = ValidationResult()
+        result.symbols = FileSymbols()
         try:
-            manifest = self._parse_manifest(file_path)
+            manifest = parse_manifest(source)
             if manifest is None:
-                result.add_error(f"{file_path}: Manifest must be a top-level dict")
+                result.add_error("%s: Manifest must be a top-level dict", file_path, rule='manifest_dict', path=file_path)
                 return result
 
             for key in ['name', 'version', 'depends', 'data']:
                 if key not in manifest:
-                    result.add_error(f"{file_path}: Missing required manifest key '{key}'")
+                    result.add_error("%s: Missing required manifest key '%s'", file_path, key, rule='manifest_required_key', path=file_path)
 
             version = str(manifest.get('version', ''))
             if not version.startswith('18.0.'):
-                result.add_warning(f"{file_path}: Version should start with '18.0.' (found '{version}')")
+                result.add_warning("%s: Version should start with '18.0.' (found '%s')", file_path, version, rule='manifest_version', path=file_path)
 
             depends = manifest.get('depends')
             if not isinstance(depends, (list, tuple)):
-                result.add_error(f"{file_path}: 'depends' must be a list")
+                result.add_error("%s: 'depends' must be a list", file_path, rule='manifest_depends', path=file_path)
 
             data_files = manifest.get('data') or []
             for rel in data_files:
                 if not isinstance(rel, str):
                     continue
                 path = file_path.parent / rel
-                if not path.exists():
-                    message = f"{file_path}: Listed data file not found: {rel}"
+                if not context.exists(path):
                     if context.strict:
-                        result.add_error(message)
+                        result.add_error("%s: Listed data file not found: %s", file_path, rel, rule='manifest_data_file', path=file_path)
                     else:
-                        result.add_warning(message)
+                        result.add_warning("%s: Listed data file not found: %s", file_path, rel, rule='manifest_data_file', path=file_path)
 
             if not manifest.get('license'):
-                result.add_error(f"{file_path}: Missing 'license' in manifest")
+                result.add_error("%s: Missing 'license' in manifest", file_path, rule='manifest_license', path=file_path)
             installable = manifest.get('installable')
             if installable is False or installable is None:
-                result.add_error(f"{file_path}: 'installable' must be True for Odoo 18+ modules")
+                result.add_error("%s: 'installable' must be True for Odoo 18+ modules", file_path, rule='manifest_installable', path=file_path)
 
             access_rel = 'security/ir.model.access.csv'
             access_file = file_path.parent / access_rel
-            if access_file.exists():
+            if context.exists(access_file):
                 listed = access_rel in (manifest.get('data') or []) or access_rel in (manifest.get('security') or [])
                 message = f"{file_path}: {access_rel} exists but is not listed in manifest 'data' or 'security'"
                 if not listed:
                     if context.strict:
-                        result.add_error(message)
+                        result.add_error(message, rule='manifest_access_listed', path=file_path)
                     else:
-                        result.add_warning(message)
+                        result.add_warning(message, rule='manifest_access_listed', path=file_path)
         except Exception as exc:
-            result.add_error(f"Error validating manifest {file_path}: {exc}")
+            result.add_error("Error validating manifest %s: %s", file_path, exc, rule='internal_error', path=file_path)
         return result
 
     # ------------------------------------------------------------------
-    def _warn_or_error(self, result: ValidationResult, context: ValidationContext, message: str, *, strict_as_error: bool) -> None:
+    def _module_prefix(self, context: ValidationContext) -> str:
+        state = context.state(self)
+        if not hasattr(state, 'module_prefix'):
+            self.setup(context)
+        return state.module_prefix
+
+    def _warn_or_error(
+        self,
+        result: ValidationResult,
+        context: ValidationContext,
+        message: str,
+        *args: Any,
+        strict_as_error: bool,
+        **location: Any,
+    ) -> None:
         if strict_as_error and context.strict:
-            result.add_error(message)
+            result.add_error(message, *args, **location)
         else:
-            result.add_warning(message)
-
-    def _parse_manifest(self, file_path: Path) -> Optional[Dict[str, Any]]:
-        text = file_path.read_text(encoding='utf-8')
-        node = ast.parse(text, filename=str(file_path))
-        manifest_node: Optional[ast.Dict] = None
-        for item in node.body:
-            value = getattr(item, 'value', None)
-            if isinstance(value, ast.Dict):
-                manifest_node = value
-                break
-        if manifest_node is None:
-            return None
-        try:
-            obj = ast.literal_eval(manifest_node)
-            if isinstance(obj, dict):
-                return obj
-            return None
-        except Exception:
-            return None
-
-    def _check_models_init(self, directory: Path) -> List[ValidationResult]:
+            result.add_warning(message, *args, **location)
+
+    def _check_models_init(self, directory: Path, inventory: FileInventory, context: ValidationContext) -> List[ValidationResult]:
         results: List[ValidationResult] = []
         models_dir = directory / 'models'
         init_file = models_dir / '__init__.py'
-        if not models_dir.exists() or not init_file.exists():
+        if init_file not in inventory:
             return results
         try:
-            init_text = init_file.read_text(encoding='utf-8')
-            modules = {py.stem for py in models_dir.glob('*.py') if py.name != '__init__.py'}
+            init_text = context.read_text(init_file)
+            modules = {py.stem for py in inventory.in_directory(models_dir, '.py') if py.name != '__init__.py'}
             missing: List[str] = []
             for module in sorted(modules):
                 pattern = rf'(from\s+\.[ ]*{re.escape(module)}\s+import)|(from\s+\.[ ]*import\s+{re.escape(module)})|(import\s+{re.escape(module)})'
@@ -279,10 +383,10 @@ class CoreRulesPlugin(BaseValidatorPlugin):
                     missing.append(module)
             if missing:
                 res = ValidationResult()
-                res.add_warning(f"models/__init__.py is not importing: {', '.join(missing)}")
+                res.add_warning("models/__init__.py is not importing: %s", ', '.join(missing), rule='models_init_import', path=init_file)
                 results.append(res)
         except Exception as exc:
             res = ValidationResult()
-            res.add_warning(f"Error checking models/__init__.py imports: {exc}")
+            res.add_warning("Error checking models/__init__.py imports: %s", exc, rule='internal_error', path=init_file)
             results.append(res)
         return results
@@ -0,0 +1,97 @@
+"""Python rules of the core plugin, evaluated by the single-pass AST engine."""
+
+from __future__ import annotations
+
+import ast
+from typing import Optional
+
+from ..ast_rules import FUNCTION_NODES, PythonRuleEngine, VisitScope
+
+DEBUG_MODULES = {'pdb', 'ipdb', 'pudb'}
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_name(node.value)
+        return f"{parent}.{node.attr}" if parent else None
+    return None
+
+
+def _is_method(node: ast.AST) -> bool:
+    args = node.args.args  # type: ignore[attr-defined]
+    return bool(args) and args[0].arg == 'self'
+
+
+def _assigned_names(body: list) -> set:
+    names = set()
+    for stmt in body:
+        if isinstance(stmt, ast.Assign):
+            names.update(target.id for target in stmt.targets if isinstance(target, ast.Name))
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            names.add(stmt.target.id)
+    return names
+
+
+def check_compute_depends(node: ast.AST, scope: VisitScope) -> None:
+    name = node.name  # type: ignore[attr-defined]
+    if not name.startswith('_compute_') or not _is_method(node):
+        return
+    for decorator in node.decorator_list:  # type: ignore[attr-defined]
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        if (_dotted_name(target) or '').startswith('api.depends'):
+            return
+    scope.report(node, f"Missing @api.depends for {name}")
+
+
+def check_model_description(node: ast.AST, scope: VisitScope) -> None:
+    if not any(_dotted_name(base) == 'models.Model' for base in node.bases):  # type: ignore[attr-defined]
+        return
+    names = _assigned_names(node.body)  # type: ignore[attr-defined]
+    if '_name' in names and '_description' not in names:
+        scope.report(node, f"Model {node.name} has _name but missing _description")  # type: ignore[attr-defined]
+
+
+def check_print_call(node: ast.AST, scope: VisitScope) -> None:
+    func = node.func  # type: ignore[attr-defined]
+    if isinstance(func, ast.Name) and func.id == 'print':
+        scope.report(node, "Avoid print() in code; use _logger instead")
+
+
+def check_debug_call(node: ast.AST, scope: VisitScope) -> None:
+    func = node.func  # type: ignore[attr-defined]
+    if isinstance(func, ast.Name) and func.id == 'breakpoint':
+        scope.report(node, "Debug statement breakpoint() found")
+    elif isinstance(func, ast.Attribute) and func.attr == 'set_trace' and _dotted_name(func.value) in DEBUG_MODULES:
+        scope.report(node, f"Debug statement {_dotted_name(func)}() found")
+
+
+def enter_action_method(node: ast.AST, scope: VisitScope) -> None:
+    name = node.name  # type: ignore[attr-defined]
+    if (name.startswith('action_') or name.startswith('button_')) and _is_method(node):
+        scope.function.data['needs_ensure_one'] = True  # type: ignore[union-attr]
+
+
+def mark_ensure_one(node: ast.AST, scope: VisitScope) -> None:
+    frame = scope.function
+    if frame is not None and _dotted_name(node.func) == 'self.ensure_one':  # type: ignore[attr-defined]
+        frame.data['has_ensure_one'] = True
+
+
+def leave_action_method(node: ast.AST, scope: VisitScope) -> None:
+    data = scope.function.data  # type: ignore[union-attr]
+    if data.get('needs_ensure_one') and not data.get('has_ensure_one'):
+        scope.report(node, f"Method {node.name} should call self.ensure_one()")  # type: ignore[attr-defined]
+
+
+def build_engine() -> PythonRuleEngine:
+    engine = PythonRuleEngine()
+    engine.register('compute_depends', FUNCTION_NODES, check_compute_depends)
+    engine.register('model_description', ast.ClassDef, check_model_description)
+    engine.register('print_call', ast.Call, check_print_call)
+    engine.register('debug_statement', ast.Call, check_debug_call)
+    engine.register('action_ensure_one', FUNCTION_NODES, enter_action_method)
+    engine.register('action_ensure_one', ast.Call, mark_ensure_one)
+    engine.register('action_ensure_one', FUNCTION_NODES, leave_action_method, on_leave=True)
+    return engine
@@ -0,0 +1,158 @@
+"""Streaming XML scan used by the core plugin.
+
+``scan_xml`` walks a document with ``iterparse`` and records everything the
+core XML rules need in a single pass. Elements are discarded as soon as they
+are closed, so memory stays bounded by the nesting depth rather than the file
+size (generated data files can be tens of MB). The same pass records the
+XML ids, references and view fields that feed the symbol index.
+"""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+ACT_WINDOW_MODEL = 'ir.actions.act_window'
+VIEW_MODEL = 'ir.ui.view'
+
+# Elements that define an XML id, and the model of the record they create.
+ID_TAGS = {
+    'template': VIEW_MODEL,
+    'menuitem': 'ir.ui.menu',
+    'act_window': ACT_WINDOW_MODEL,
+    'report': 'ir.actions.report',
+}
+# Attributes whose whole value is an XML id, by element (``groups`` holds a list of them).
+REF_ATTRIBUTES = {'field': ('ref',), 'menuitem': ('parent', 'action'), 'template': ('inherit_id',)}
+_EVAL_REF = re.compile(r"""\bref\(\s*['"]([\w.]+)['"]\s*\)""")
+_PERCENT_REF = re.compile(r'%\(([\w.]+)\)d')
+
+
+@dataclass
+class XmlScan:
+    """Facts collected from one XML document."""
+
+    has_tree: bool = False
+    has_tree_close: bool = False
+    has_tree_view_mode: bool = False
+    action_view_modes: List[str] = field(default_factory=list)
+    record_ids: List[str] = field(default_factory=list)
+    # Symbols: (XML id, model) of every record, referenced XML ids, and
+    # (view id, model, top-level arch fields) of every view record.
+    records: List[Tuple[str, str]] = field(default_factory=list)
+    refs: List[str] = field(default_factory=list)
+    views: List[Tuple[str, str, Tuple[str, ...]]] = field(default_factory=list)
+
+
+class _ViewRecord:
+    """A view record being read: its model and the fields of its arch."""
+
+    __slots__ = ('view_id', 'model', 'fields', 'arch_depth', 'nested_fields')
+
+    def __init__(self, view_id: str) -> None:
+        self.view_id = view_id
+        self.model = ''
+        self.fields: List[str] = []
+        self.arch_depth = 0  # stack depth of the arch field while inside it, 0 otherwise
+        self.nested_fields = 0  # open <field> elements inside the arch
+
+
+def _collect_refs(scan: XmlScan, tag: str, attrib: Dict[str, str]) -> None:
+    for name in REF_ATTRIBUTES.get(tag, ()):
+        value = attrib.get(name)
+        if value:
+            scan.refs.append(value)
+    groups = attrib.get('groups')
+    if groups:
+        scan.refs.extend(group.strip().lstrip('!') for group in groups.split(',') if group.strip())
+    for value in attrib.values():
+        if 'ref(' in value:
+            scan.refs.extend(_EVAL_REF.findall(value))
+        if '%(' in value:
+            scan.refs.extend(_PERCENT_REF.findall(value))
+
+
+def _mentions_tree_view_mode(name: str, value: str) -> bool:
+    if name == 'view_mode':
+        return 'tree' in value
+    if 'view_mode' not in value:
+        return False
+    # Context dicts such as "{'view_mode': 'tree,form'}"
+    tail = value.split('view_mode', 1)[1]
+    return tail[:1] in ('"', "'") and 'tree' in tail
+
+
+def scan_xml(stream: BinaryIO) -> XmlScan:
+    """Scan ``stream`` in one pass; raises ``ET.ParseError`` on malformed XML."""
+    scan = XmlScan()
+    # Open elements as [element, has_child_element] pairs.
+    stack: List[list] = []
+    record_models: List[Optional[str]] = []
+    view: Optional[_ViewRecord] = None
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if stack:
+                stack[-1][1] = True
+            stack.append([elem, False])
+            attrib = elem.attrib
+            if tag == 'record':
+                model = elem.get('model')
+                record_models.append(model)
+                rec_id = elem.get('id')
+                if rec_id:
+                    scan.record_ids.append(rec_id)
+                    scan.records.append((rec_id, model or ''))
+                    if model == VIEW_MODEL:
+                        view = _ViewRecord(rec_id)
+            elif tag == 'tree':
+                scan.has_tree = True
+            elif tag in ID_TAGS and elem.get('id'):
+                scan.records.append((elem.get('id'), ID_TAGS[tag]))
+            if tag == 'field' and view is not None:
+                if view.arch_depth:
+                    if view.nested_fields == 0 and elem.get('name'):
+                        view.fields.append(elem.get('name'))
+                    view.nested_fields += 1
+                elif elem.get('name') == 'arch':
+                    view.arch_depth = len(stack)
+            if attrib:
+                _collect_refs(scan, tag, attrib)
+            if not scan.has_tree_view_mode:
+                for name, value in elem.attrib.items():
+                    if _mentions_tree_view_mode(name, value):
+                        scan.has_tree_view_mode = True
+                        break
+            continue
+
+        _, has_child = stack.pop()
+        if view is not None and tag == 'field':
+            if view.arch_depth == len(stack) + 1:
+                view.arch_depth = 0
+            elif view.arch_depth:
+                view.nested_fields -= 1
+            elif elem.get('name') == 'model':
+                view.model = (elem.text or '').strip()
+        if tag == 'tree' and (has_child or (elem.text or '').strip()):
+            scan.has_tree_close = True
+        elif tag == 'field' and elem.get('name') == 'view_mode':
+            modes = (elem.text or '').strip()
+            if 'tree' in modes:
+                scan.has_tree_view_mode = True
+            if modes and record_models and record_models[-1] == ACT_WINDOW_MODEL:
+                scan.action_view_modes.append(modes)
+        elif tag == 'record':
+            record_models.pop()
+            if view is not None:
+                if view.model:
+                    scan.views.append((view.view_id, view.model, tuple(view.fields)))
+                view = None
+
+        elem.clear()
+        if stack:
+            stack[-1][0].remove(elem)
+
+    return scan
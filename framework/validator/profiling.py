@@ -0,0 +1,194 @@
+"""Opt-in profiler for validator plugins (``validate.py --profile``).
+
+When profiling is off nothing here runs: the validator calls plugin methods
+directly. ``Profiler.instrument`` replaces each plugin's hooks (``setup``,
+``validate_directory``, ``supports``, ``validate_file``, ``validate_source``,
+``finalize``) with timed wrappers set on the plugin instance, and
+``restore`` removes them again. Each entry records calls, wall time and the
+bytes of the files the hook was given. Plugins can add finer entries per
+rule id with ``add_rule``; the core plugin does this for its AST rules and
+XML checks through ``context.profiler``.
+
+Forked workers profile into their own copy of the profiler. ``drain``
+returns the counts collected since the last drain as plain data, and the
+parent combines them with ``merge``. The daemon uses the same mechanism.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+HOOK_NAMES = ('setup', 'validate_directory', 'supports', 'validate_file', 'validate_source', 'finalize')
+
+# Hooks that receive one file, so their time and bytes are also charged to that file.
+FILE_HOOKS = ('supports', 'validate_file', 'validate_source')
+
+Key = Tuple[str, str]  # (plugin, hook or rule id)
+
+
+def _loaded_size(source: Any) -> int:
+    """Bytes of a ``SourceFile`` that has been read, 0 otherwise (never reads it)."""
+    raw = getattr(source, '_raw', None)
+    return len(raw) if raw is not None else 0
+
+
+class Profiler:
+    """Calls, seconds and bytes per plugin hook and per rule, plus seconds per file."""
+
+    def __init__(self) -> None:
+        # Each stats entry is [calls, seconds, bytes].
+        self.hooks: Dict[Key, List[float]] = {}
+        self.rules: Dict[Key, List[float]] = {}
+        self.files: Dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    def add_hook(self, plugin: str, hook: str, seconds: float, nbytes: int = 0, calls: int = 1) -> None:
+        stats = self.hooks.get((plugin, hook))
+        if stats is None:
+            self.hooks[(plugin, hook)] = [calls, seconds, nbytes]
+        else:
+            stats[0] += calls
+            stats[1] += seconds
+            stats[2] += nbytes
+
+    def add_rule(self, plugin: str, rule: str, seconds: float, nbytes: int = 0, calls: int = 1) -> None:
+        stats = self.rules.get((plugin, rule))
+        if stats is None:
+            self.rules[(plugin, rule)] = [calls, seconds, nbytes]
+        else:
+            stats[0] += calls
+            stats[1] += seconds
+            stats[2] += nbytes
+
+    def add_file(self, path: Any, seconds: float) -> None:
+        key = str(path)
+        self.files[key] = self.files.get(key, 0.0) + seconds
+
+    # ------------------------------------------------------------------
+    def instrument(self, plugins: Iterable[Any]) -> None:
+        """Wrap the hooks of ``plugins`` so every call is recorded."""
+        for plugin in plugins:
+            attributes = getattr(plugin, '__dict__', None)
+            if attributes is None:
+                continue  # __slots__ plugins cannot take per-instance wrappers
+            for hook in HOOK_NAMES:
+                if hook in attributes:
+                    continue  # already instrumented, or set per instance by the plugin itself
+                method = getattr(plugin, hook, None)
+                if callable(method):
+                    attributes[hook] = self._wrap(plugin.name, hook, method)
+
+    def restore(self, plugins: Iterable[Any]) -> None:
+        """Remove the wrappers installed by ``instrument``."""
+        for plugin in plugins:
+            attributes = getattr(plugin, '__dict__', {})
+            for hook in HOOK_NAMES:
+                if getattr(attributes.get(hook), '__wrapped_by_profiler__', False):
+                    del attributes[hook]
+
+    def _wrap(self, plugin: str, hook: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        clock = time.perf_counter
+        if hook in FILE_HOOKS:
+            source_hook = hook == 'validate_source'
+
+            @functools.wraps(method)
+            def wrapper(target: Any, context: Any, *args: Any, **kwargs: Any) -> Any:
+                started = clock()
+                try:
+                    return method(target, context, *args, **kwargs)
+                finally:
+                    elapsed = clock() - started
+                    if source_hook:
+                        path, nbytes = target.path, _loaded_size(target)
+                    elif hook == 'supports':
+                        path, nbytes = target, 0
+                    else:
+                        source = context.current_source
+                        path = target
+                        nbytes = _loaded_size(source) if source is not None and source.path == target else 0
+                    self.add_hook(plugin, hook, elapsed, nbytes)
+                    self.add_file(path, elapsed)
+        else:
+            @functools.wraps(method)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self.add_hook(plugin, hook, clock() - started)
+
+        wrapper.__wrapped_by_profiler__ = True  # type: ignore[attr-defined]
+        return wrapper
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self.hooks.clear()
+        self.rules.clear()
+        self.files.clear()
+
+    def drain(self) -> Dict[str, Any]:
+        """Counts collected since the last drain, as picklable/JSON data; resets the profiler."""
+        data = self.to_dict()
+        self.clear()
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'hooks': [[plugin, hook, *stats] for (plugin, hook), stats in self.hooks.items()],
+            'rules': [[plugin, rule, *stats] for (plugin, rule), stats in self.rules.items()],
+            'files': self.files.copy(),
+        }
+
+    def merge(self, data: Optional[Dict[str, Any]]) -> None:
+        """Add counts produced by ``drain``/``to_dict`` (e.g. in a worker or the daemon)."""
+        if not data:
+            return
+        for plugin, hook, calls, seconds, nbytes in data.get('hooks', ()):
+            self.add_hook(plugin, hook, seconds, nbytes, calls)
+        for plugin, rule, calls, seconds, nbytes in data.get('rules', ()):
+            self.add_rule(plugin, rule, seconds, nbytes, calls)
+        for path, seconds in data.get('files', {}).items():
+            self.add_file(path, seconds)
+
+    # ------------------------------------------------------------------
+    def report(self, *, limit: int = 20) -> Dict[str, Any]:
+        """JSON artifact: every hook and rule by descending time, and the slowest files."""
+        def rows(table: Dict[Key, List[float]], label: str) -> List[Dict[str, Any]]:
+            ordered = sorted(table.items(), key=lambda item: item[1][1], reverse=True)
+            return [
+                {'plugin': plugin, label: name, 'calls': int(calls), 'seconds': round(seconds, 6), 'bytes': int(nbytes)}
+                for (plugin, name), (calls, seconds, nbytes) in ordered
+            ]
+
+        slowest_files = sorted(self.files.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return {
+            'hooks': rows(self.hooks, 'hook'),
+            'rules': rows(self.rules, 'rule'),
+            'slowest_files': [{'path': path, 'seconds': round(seconds, 6)} for path, seconds in slowest_files],
+        }
+
+    def format_table(self, *, limit: int = 20) -> str:
+        """Plain-text tables of hooks, rules and files, slowest first."""
+        report = self.report(limit=limit)
+        lines: List[str] = []
+        for title, rows, label in (
+            ('Plugin hooks', report['hooks'], 'hook'),
+            ('Rules', report['rules'][:limit], 'rule'),
+        ):
+            if not rows:
+                continue
+            lines.append(f"{title}:")
+            lines.append(f"  {'plugin':<24} {label:<28} {'calls':>8} {'seconds':>10} {'KiB':>9}")
+            for row in rows:
+                lines.append(
+                    f"  {row['plugin'][:24]:<24} {row[label][:28]:<28} {row['calls']:>8} "
+                    f"{row['seconds']:>10.4f} {row['bytes'] / 1024:>9.1f}"
+                )
+        if report['slowest_files']:
+            lines.append("Slowest files:")
+            for row in report['slowest_files']:
+                lines.append(f"  {row['seconds']:>10.4f}  {Path(row['path'])}")
+        return '\n'.join(lines)
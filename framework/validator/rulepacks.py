@@ -0,0 +1,538 @@
+"""Declarative rule packs: rules written as data instead of plugin code.
+
+A rule pack is a TOML, JSON or YAML file (YAML needs PyYAML) placed in a
+plugin directory or passed with ``--rule-pack``::
+
+    name = "acme_rules"
+    description = "AcmeCorp conventions"
+    files = [".py"]                      # default file patterns for the rules
+
+    [[rules]]
+    id = "acme_no_print"
+    literal = "print("                   # or: pattern = 'regex', or: ast = 'selector'
+    severity = "error"                   # error | warning | strict (error with --strict)
+    message = "Forbidden print( in {path}"
+    once = true                          # report the first hit per file only
+    exclude = ["__manifest__.py"]        # optional file patterns to skip
+
+Every pack becomes one ``RulePackPlugin``. For each file, the regex and
+literal rules that apply to it are compiled into one ``MultiPatternScanner``:
+a single alternation of lookaheads, one named group per rule. The file is
+therefore scanned once however many rules are active. AST rules use a small
+selector language and are registered in the single-pass ``PythonRuleEngine``
+used by the core plugin, so each file's tree is also walked only once.
+
+Selectors name a node type followed by predicates on its attributes, with
+``,`` between alternatives::
+
+    FunctionDef[name^=action_][!docstring], Call[func.id=print]
+
+Operators are ``=``, ``!=``, ``^=`` (starts with), ``$=`` (ends with),
+``*=`` (contains) and ``~=`` (regex search). ``[attr]`` tests that an
+attribute is truthy and ``[!attr]`` that it is not. ``docstring`` is
+available on functions, classes and modules.
+
+Messages are ``str.format`` templates. Regex rules get ``{0}`` (the match),
+``{1}``... (its groups), ``{path}`` and ``{line}``. AST rules get ``{node}``
+(e.g. ``{node.name}``), ``{path}`` and ``{line}``. A regex rule may define
+``fix``, a replacement template in ``re`` syntax (``\\1``), which
+``--auto-fix`` applies to every match.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ast_rules import PythonRuleEngine, VisitScope
+from .plugin import BaseValidatorPlugin, ValidationContext, ValidationResult, matches_file_patterns, pattern_kind
+from .source import SourceFile
+from .workers import FileTimeout, time_budget
+
+RULE_PACK_SUFFIXES = ('.toml', '.json', '.yaml', '.yml')
+SEVERITIES = ('error', 'warning', 'strict')
+
+_FLAGS = {
+    'ignorecase': re.IGNORECASE,
+    'multiline': re.MULTILINE,
+    'dotall': re.DOTALL,
+    'verbose': re.VERBOSE,
+}
+_SCOPED_FLAGS = ((re.ASCII, 'a'), (re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+# Inline global flags such as ``(?i)``; only allowed at the start of a whole pattern.
+_GLOBAL_FLAGS = re.compile(r'(?:\(\?[aiLmsux]+\))+')
+# Numbered backreferences would point at the wrong group once patterns are combined.
+_NUMBERED_BACKREF = re.compile(r'\\[1-9]|\(\?P=')
+
+
+class RulePackError(ValueError):
+    """A rule pack file is unreadable or declares an invalid rule."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    files: Tuple[str, ...]
+    message: str
+    exclude: Tuple[str, ...] = ()
+    severity: str = 'warning'
+    pattern: Optional[str] = None
+    ast: Optional[str] = None
+    flags: int = 0
+    once: bool = False
+    unless: Optional[str] = None
+    fix: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RulePack:
+    name: str
+    description: str
+    version: str
+    rules: Tuple[Rule, ...]
+    digest: str
+    path: Optional[Path] = None
+
+
+# ----------------------------------------------------------------------
+# Loading
+
+def _read_pack_data(path: Path) -> Tuple[Dict[str, Any], bytes]:
+    raw = path.read_bytes()
+    suffix = path.suffix.lower()
+    try:
+        if suffix == '.json':
+            data = json.loads(raw.decode('utf-8'))
+        elif suffix == '.toml':
+            if sys.version_info >= (3, 11):
+                import tomllib
+            else:  # pragma: no cover - depends on the interpreter
+                try:
+                    import tomli as tomllib  # type: ignore[no-redef]
+                except ImportError as exc:
+                    raise RulePackError(f"{path}: reading TOML rule packs needs Python 3.11+ or the 'tomli' package") from exc
+            data = tomllib.loads(raw.decode('utf-8'))
+        elif suffix in ('.yaml', '.yml'):
+            try:
+                import yaml  # type: ignore[import-untyped]
+            except ImportError as exc:
+                raise RulePackError(f"{path}: reading YAML rule packs needs the 'PyYAML' package") from exc
+            data = yaml.safe_load(raw.decode('utf-8'))
+        else:
+            raise RulePackError(f"{path}: unsupported rule pack format '{suffix}'")
+    except RulePackError:
+        raise
+    except Exception as exc:
+        raise RulePackError(f"{path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise RulePackError(f"{path}: a rule pack must be a mapping with a 'rules' list")
+    return data, raw
+
+
+def _parse_rule(item: Any, default_files: Sequence[str], where: str) -> Rule:
+    if not isinstance(item, dict):
+        raise RulePackError(f"{where}: each rule must be a mapping")
+    rule_id = item.get('id')
+    if not rule_id or not isinstance(rule_id, str):
+        raise RulePackError(f"{where}: rule without an 'id'")
+    where = f"{where}: rule '{rule_id}'"
+
+    kinds = [key for key in ('pattern', 'literal', 'ast') if item.get(key) is not None]
+    if len(kinds) != 1:
+        raise RulePackError(f"{where}: define exactly one of 'pattern', 'literal' or 'ast'")
+    severity = item.get('severity', 'warning')
+    if severity not in SEVERITIES:
+        raise RulePackError(f"{where}: severity must be one of {', '.join(SEVERITIES)}")
+    files = item.get('files', default_files)
+    if isinstance(files, str):
+        files = [files]
+    if not files:
+        raise RulePackError(f"{where}: no 'files' patterns (set them on the rule or the pack)")
+    exclude = item.get('exclude', ())
+    if isinstance(exclude, str):
+        exclude = [exclude]
+    message = item.get('message')
+    if not message:
+        raise RulePackError(f"{where}: missing 'message'")
+
+    flags = 0
+    for name in item.get('flags', ()):
+        if name not in _FLAGS:
+            raise RulePackError(f"{where}: unknown flag '{name}' (use {', '.join(_FLAGS)})")
+        flags |= _FLAGS[name]
+
+    pattern = item.get('pattern')
+    if item.get('literal') is not None:
+        pattern = re.escape(item['literal'])
+    selector = item.get('ast')
+    if selector is not None and (item.get('fix') is not None or flags):
+        raise RulePackError(f"{where}: 'fix' and 'flags' only apply to 'pattern' and 'literal' rules")
+
+    try:
+        if pattern is not None:
+            # Also check the form it takes inside a combined scanner.
+            MultiPatternScanner([(pattern, flags)])
+        if item.get('unless') is not None:
+            re.compile(item['unless'], flags)
+        if selector is not None:
+            compile_selector(selector)
+    except (re.error, ValueError) as exc:
+        raise RulePackError(f"{where}: {exc}") from exc
+
+    return Rule(
+        id=rule_id,
+        files=tuple(files),
+        message=str(message),
+        exclude=tuple(exclude),
+        severity=severity,
+        pattern=pattern,
+        ast=selector,
+        flags=flags,
+        once=bool(item.get('once', False)),
+        unless=item.get('unless'),
+        fix=item.get('fix'),
+    )
+
+
+def load_rule_pack(path: Path) -> RulePack:
+    """Read and check the rule pack at ``path``; raises ``RulePackError``."""
+    data, raw = _read_pack_data(path)
+    rules_data = data.get('rules')
+    if not isinstance(rules_data, list) or not rules_data:
+        raise RulePackError(f"{path}: a rule pack needs a non-empty 'rules' list")
+    default_files = data.get('files', ())
+    if isinstance(default_files, str):
+        default_files = [default_files]
+    rules = tuple(_parse_rule(item, default_files, str(path)) for item in rules_data)
+    seen: Dict[str, None] = {}
+    for rule in rules:
+        if rule.id in seen and rule.ast is None:
+            raise RulePackError(f"{path}: duplicate rule id '{rule.id}'")
+        seen[rule.id] = None
+    return RulePack(
+        name=str(data.get('name') or path.stem),
+        description=str(data.get('description', '')),
+        version=str(data.get('version', '1')),
+        rules=rules,
+        digest=hashlib.sha256(raw).hexdigest(),
+        path=path,
+    )
+
+
+# ----------------------------------------------------------------------
+# Regex scanning
+
+def _scoped(compiled: 're.Pattern[str]') -> str:
+    """``compiled`` as a group that keeps its flags inside a larger pattern.
+
+    Leading inline flags (``(?i)todo``) are already in ``compiled.flags`` and
+    would be an error anywhere but at the start, so they are dropped.
+    """
+    pattern = compiled.pattern
+    leading = _GLOBAL_FLAGS.match(pattern)
+    if leading is not None:
+        pattern = pattern[leading.end():]
+    letters = ''.join(letter for flag, letter in _SCOPED_FLAGS if compiled.flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+
+
+class MultiPatternScanner:
+    """Find the matches of many patterns in one pass over the text.
+
+    The patterns are joined into one alternation of lookaheads, one named
+    group per pattern, so ``finditer`` stops at every position where any of
+    them matches without consuming text. Each pattern's own matches are
+    then taken as ``re.finditer`` would take them: leftmost first and
+    non-overlapping. Patterns that cannot be combined, because they use
+    named groups or backreferences, are scanned on their own.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, int]]) -> None:
+        self.patterns = [re.compile(pattern, flags) for pattern, flags in patterns]
+        self._combined_indexes: List[int] = []
+        self._standalone: List[int] = []
+        for index, compiled in enumerate(self.patterns):
+            if compiled.groupindex or _NUMBERED_BACKREF.search(compiled.pattern):
+                self._standalone.append(index)
+            else:
+                self._combined_indexes.append(index)
+        parts = [f"(?=(?P<_{index}>{_scoped(self.patterns[index])}))" for index in self._combined_indexes]
+        self._combined = re.compile('|'.join(parts)) if parts else None
+
+    def scan(self, text: str) -> List[Tuple[int, 're.Match[str]']]:
+        """``(pattern index, match)`` pairs, ordered by position then pattern index."""
+        hits: List[Tuple[int, int, 're.Match[str]']] = []
+        if self._combined is not None:
+            patterns = self.patterns
+            order = self._combined_indexes
+            position_in_order = {index: rank for rank, index in enumerate(order)}
+            resume = [0] * len(patterns)
+            for found in self._combined.finditer(text):
+                start = found.start()
+                first = int(found.lastgroup[1:])  # type: ignore[index]
+                # Later alternatives may match at the same position too.
+                for index in order[position_in_order[first]:]:
+                    if start < resume[index]:
+                        continue
+                    match = patterns[index].match(text, start)
+                    if match is None:
+                        continue
+                    resume[index] = match.end() if match.end() > start else start + 1
+                    hits.append((start, index, match))
+        for index in self._standalone:
+            hits.extend((match.start(), index, match) for match in self.patterns[index].finditer(text))
+        hits.sort(key=lambda hit: (hit[0], hit[1]))
+        return [(index, match) for _, index, match in hits]
+
+
+# ----------------------------------------------------------------------
+# AST selectors
+
+_SELECTOR_PART = re.compile(r'\s*([A-Za-z_]\w*)((?:\[[^\]]*\])*)\s*')
+_PREDICATE = re.compile(r'\[\s*(!?)\s*([A-Za-z_][\w.]*)\s*(?:(=|!=|\^=|\$=|\*=|~=)\s*(.*?))?\s*\]')
+
+Predicate = Callable[[ast.AST], bool]
+
+
+def _attribute(node: Any, path: str) -> Any:
+    value = node
+    for name in path.split('.'):
+        if name == 'docstring' and isinstance(value, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Module)):
+            value = ast.get_docstring(value)
+        else:
+            value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value
+
+
+def _predicate(negate: bool, path: str, operator: Optional[str], raw_value: Optional[str]) -> Predicate:
+    if not operator:
+        return (lambda node: not _attribute(node, path)) if negate else (lambda node: bool(_attribute(node, path)))
+    value = (raw_value or '').strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        value = value[1:-1]
+    if operator == '~=':
+        regex = re.compile(value)
+        test: Callable[[str], bool] = lambda text: regex.search(text) is not None
+    else:
+        test = {
+            '=': lambda text: text == value,
+            '!=': lambda text: text != value,
+            '^=': lambda text: text.startswith(value),
+            '$=': lambda text: text.endswith(value),
+            '*=': lambda text: value in text,
+        }[operator]
+
+    def check(node: ast.AST) -> bool:
+        attribute = _attribute(node, path)
+        result = test('' if attribute is None else str(attribute))
+        return not result if negate else result
+    return check
+
+
+def compile_selector(selector: str) -> List[Tuple[type, List[Predicate]]]:
+    """Parse ``selector`` into ``(node type, predicates)`` alternatives; raises ``ValueError``."""
+    alternatives: List[Tuple[type, List[Predicate]]] = []
+    for part in selector.split(','):
+        match = _SELECTOR_PART.fullmatch(part)
+        if match is None:
+            raise ValueError(f"invalid AST selector '{part.strip()}'")
+        node_type = getattr(ast, match.group(1), None)
+        if not (isinstance(node_type, type) and issubclass(node_type, ast.AST)):
+            raise ValueError(f"unknown AST node type '{match.group(1)}'")
+        predicates_text = match.group(2)
+        predicates = [_predicate(bool(neg), path, op, value) for neg, path, op, value in _PREDICATE.findall(predicates_text)]
+        if len(_PREDICATE.sub('', predicates_text).strip()):
+            raise ValueError(f"invalid predicate in '{part.strip()}'")
+        alternatives.append((node_type, predicates))
+    return alternatives
+
+
+# ----------------------------------------------------------------------
+# Plugin
+
+def _format_message(template: str, *args: Any, **kwargs: Any) -> str:
+    try:
+        return template.format(*args, **kwargs)
+    except (IndexError, KeyError, AttributeError, ValueError):
+        return template
+
+
+class RulePackPlugin(BaseValidatorPlugin):
+    """Runs the rules of one ``RulePack``."""
+
+    reentrant = True
+
+    def __init__(self, pack: RulePack) -> None:
+        self.pack = pack
+        self.name = pack.name
+        self.description = pack.description
+        self.version = pack.version
+        patterns: Dict[str, None] = {}
+        for rule in pack.rules:
+            patterns.update(dict.fromkeys(rule.files))
+        self.file_patterns = tuple(patterns)
+        self._has_globs = any(
+            pattern_kind(pattern) == 'glob' for rule in pack.rules for pattern in rule.files + rule.exclude
+        )
+        self._text_rules = [rule for rule in pack.rules if rule.ast is None]
+        self._ast_rules = [rule for rule in pack.rules if rule.ast is not None]
+        self._routes: Dict[Tuple[str, str], Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+        self._scanners: Dict[Tuple[int, ...], MultiPatternScanner] = {}
+        self._engines: Dict[Tuple[int, ...], PythonRuleEngine] = {}
+
+    def cache_fingerprint(self) -> str:
+        return self.pack.digest
+
+    # ------------------------------------------------------------------
+    def _route(self, file_path: Path) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        key = (file_path.suffix, file_path.name)
+        route = None if self._has_globs else self._routes.get(key)
+        if route is None:
+            route = (
+                tuple(i for i, rule in enumerate(self._text_rules) if self._applies(rule, file_path)),
+                tuple(i for i, rule in enumerate(self._ast_rules) if self._applies(rule, file_path)),
+            )
+            if not self._has_globs:
+                self._routes[key] = route
+        return route
+
+    @staticmethod
+    def _applies(rule: Rule, file_path: Path) -> bool:
+        return matches_file_patterns(file_path, rule.files) and not (
+            rule.exclude and matches_file_patterns(file_path, rule.exclude)
+        )
+
+    def _scanner(self, indexes: Tuple[int, ...]) -> MultiPatternScanner:
+        scanner = self._scanners.get(indexes)
+        if scanner is None:
+            rules = [self._text_rules[i] for i in indexes]
+            scanner = MultiPatternScanner([(rule.pattern or '', rule.flags) for rule in rules])
+            self._scanners[indexes] = scanner
+        return scanner
+
+    def _blame_scan(self, scanner: MultiPatternScanner, indexes: Tuple[int, ...], text: str, seconds: float) -> None:
+        """Find the rule that made ``scan`` overrun its time budget.
+
+        The combined pattern does not tell which rule was matching, so each
+        pattern is run on its own for the ``seconds`` the scan had. The
+        ``FileTimeout`` of the one that overruns is raised from here, with
+        ``rule_id`` set for ``workers.blame``.
+        """
+        for position, pattern in enumerate(scanner.patterns):
+            rule_id = self._text_rules[indexes[position]].id  # noqa: F841 - read by ``blame``
+            with time_budget(seconds):
+                for _ in pattern.finditer(text):
+                    pass
+
+    def _engine(self, indexes: Tuple[int, ...]) -> PythonRuleEngine:
+        engine = self._engines.get(indexes)
+        if engine is None:
+            engine = PythonRuleEngine()
+            for index in indexes:
+                rule = self._ast_rules[index]
+                for node_type, predicates in compile_selector(rule.ast or ''):
+                    engine.register(str(index), node_type, self._ast_handler(predicates))
+            self._engines[indexes] = engine
+        return engine
+
+    @staticmethod
+    def _ast_handler(predicates: List[Predicate]) -> Callable[[ast.AST, VisitScope], None]:
+        def handle(node: ast.AST, scope: VisitScope) -> None:
+            if all(predicate(node) for predicate in predicates):
+                scope.report(node, '')
+        return handle
+
+    def _report(self, result: ValidationResult, context: ValidationContext, rule: Rule, message: str, **location: Any) -> None:
+        if rule.severity == 'error' or (rule.severity == 'strict' and context.strict):
+            result.add_error(message, rule=rule.id, **location)
+        else:
+            result.add_warning(message, rule=rule.id, **location)
+
+    # ------------------------------------------------------------------
+    def validate_source(self, source: SourceFile, context: ValidationContext) -> Optional[ValidationResult]:
+        file_path = source.path
+        text_indexes, ast_indexes = self._route(file_path)
+        if not text_indexes and not ast_indexes:
+            return None
+        result = ValidationResult()
+        text = source.text
+        profiler = context.profiler
+        suppressed: Dict[str, bool] = {}
+
+        def is_suppressed(rule: Rule) -> bool:
+            if rule.unless is None:
+                return False
+            if rule.id not in suppressed:
+                suppressed[rule.id] = re.search(rule.unless, text, rule.flags) is not None
+            return suppressed[rule.id]
+
+        if text_indexes:
+            reported: Dict[int, None] = {}
+            fixed: Dict[str, None] = {}
+            started = time.perf_counter()
+            scanner = self._scanner(text_indexes)
+            try:
+                hits = scanner.scan(text)
+            except FileTimeout:
+                self._blame_scan(scanner, text_indexes, text, time.perf_counter() - started)
+                raise
+            if profiler is not None:
+                profiler.add_rule(self.name, 'scan', time.perf_counter() - started, len(source.raw))
+            for position, match in hits:
+                rule = self._text_rules[text_indexes[position]]
+                if is_suppressed(rule):
+                    continue
+                if context.auto_fix and rule.fix is not None:
+                    result.add_edit(file_path, match.start(), match.end(), match.expand(rule.fix), rule=rule.id)
+                    fixed.setdefault(rule.id)
+                if rule.once and position in reported:
+                    continue
+                reported.setdefault(position)
+                line = source.line_of(match.start())
+                groups = [group or '' for group in match.groups()]
+                message = _format_message(rule.message, match.group(0), *groups, path=file_path, line=line)
+                self._report(result, context, rule, message, path=file_path, line=line)
+            for rule_id in fixed:
+                result.add_auto_fix("Fixed %s in %s", rule_id, file_path, rule=rule_id, path=file_path)
+
+        if ast_indexes and file_path.suffix == '.py':
+            try:
+                tree = source.python_ast
+            except SyntaxError:
+                tree = None
+            if tree is not None:
+                reported_ast: Dict[str, None] = {}
+
+                def report(key: str, node: ast.AST, _: str) -> None:
+                    rule = self._ast_rules[int(key)]
+                    if (rule.once and rule.id in reported_ast) or is_suppressed(rule):
+                        return
+                    reported_ast.setdefault(rule.id)
+                    line = getattr(node, 'lineno', 0)
+                    col = getattr(node, 'col_offset', 0) + 1
+                    message = _format_message(rule.message, node=node, path=file_path, line=line)
+                    self._report(result, context, rule, message, path=file_path, line=line, col=col)
+
+                engine = self._engine(ast_indexes)
+                if profiler is None:
+                    engine.run(tree, report)
+                else:
+                    timings: Dict[str, List[float]] = {}
+                    engine.run(tree, report, timings=timings)
+                    for key, (calls, seconds) in timings.items():
+                        profiler.add_rule(self.name, self._ast_rules[int(key)].id, seconds, len(source.raw), int(calls))
+
+        return result if result.has_messages() else None
+
+
+def load_rule_pack_plugin(path: Path) -> RulePackPlugin:
+    return RulePackPlugin(load_rule_pack(path))
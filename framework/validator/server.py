@@ -0,0 +1,194 @@
+"""Long-lived validator daemon answering JSON requests over a Unix socket.
+
+Starting the validator costs Python start-up, plugin discovery and rule
+compilation on every run. ``validate.py --serve`` pays that once and keeps
+the plugins, module-root memo and result cache warm; ``validate.py --daemon``
+(or any ``DaemonClient``) sends work to it and falls back to validating
+in-process when no daemon is listening.
+
+The protocol is one JSON object per line in each direction::
+
+    -> {"id": 1, "method": "validate_files", "params": {"paths": ["a.py"], "cwd": "/repo", "options": {...}}}
+    <- {"id": 1, "result": [{"diagnostics": [{"severity": "error", "rule": ..., "path": ..., "message": ...}], "is_valid": false}]}
+
+Methods: ``ping``, ``validate_files``, ``validate_changes``,
+``validate_directory``, ``validate_source`` (unsaved text for a path) and
+``shutdown``. A request with ``"profile": true`` in its params also gets a
+``"profile"`` member holding the hook and rule timings of that request.
+Requests are handled one at a time, so plugins never see concurrent calls.
+
+A request carrying ``options`` or ``plugins`` (see
+``client.plugin_set_fingerprint``) that differ from the daemon's own is
+refused with ``options_mismatch`` or ``plugins_mismatch``, and the client
+validates in-process instead. The client side lives in ``client``, so that
+sending a request never loads plugins.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# The client side is also importable from here, next to the server it talks to.
+from .client import DEFAULT_SOCKET_PATH, OPTION_NAMES, DaemonClient, DaemonUnavailable, plugin_set_fingerprint  # noqa: F401
+
+
+def validator_options(validator: Any) -> Dict[str, bool]:
+    return {name: bool(getattr(validator, name)) for name in OPTION_NAMES}
+
+
+@contextmanager
+def _working_directory(path: Optional[str]) -> Iterator[None]:
+    if not path:
+        yield
+        return
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class ValidatorServer(socketserver.UnixStreamServer):
+    """Serve one ``Odoo18Validator`` on ``socket_path`` until ``shutdown`` is requested."""
+
+    def __init__(self, validator: Any, socket_path: Path = DEFAULT_SOCKET_PATH) -> None:
+        self.validator = validator
+        # Taken at start-up: plugin files changed since then no longer match the client's.
+        self.plugin_set = plugin_set_fingerprint(validator.plugin_dirs, validator.rule_packs, validator.timeout)
+        self.socket_path = Path(socket_path).resolve()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def _remove_stale_socket(self) -> None:
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise DaemonUnavailable(f"A validator daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    def handle_request_data(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one decoded request; errors are reported in the response, never raised."""
+        response: Dict[str, Any] = {'id': request.get('id')}
+        method = request.get('method')
+        params = request.get('params') or {}
+        handler = getattr(self, f'_method_{method}', None)
+        if handler is None:
+            response['error'] = f"Unknown method: {method}"
+            return response
+
+        options = params.get('options')
+        if options is not None and options != validator_options(self.validator):
+            response['error'] = 'options_mismatch'
+            return response
+        plugins = params.get('plugins')
+        if plugins is not None and plugins != self.plugin_set:
+            response['error'] = 'plugins_mismatch'
+            return response
+
+        # ``"profile": true`` profiles this request only and returns the counts with its result.
+        profile = bool(params.get('profile'))
+        already_profiling = self.validator.profiler is not None
+        try:
+            if profile:
+                self.validator.start_profiling().clear()
+            with _working_directory(params.get('cwd')):
+                # Module roots may have appeared or vanished since the last request.
+                self.validator._module_roots.clear()
+                response['result'] = handler(params)
+            if profile:
+                response['profile'] = self.validator.profiler.drain()
+        except Exception as exc:  # pragma: no cover - reported to the client
+            response['error'] = f"{type(exc).__name__}: {exc}"
+        finally:
+            if profile and not already_profiling:
+                self.validator.stop_profiling()
+        return response
+
+    def _method_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'options': validator_options(self.validator),
+            'plugins': [plugin.name for plugin in self.validator.plugin_manager.plugins],
+        }
+
+    def _method_validate_files(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        paths = [Path(path) for path in params.get('paths', [])]
+        modules = [Path(path) for path in params.get('modules', [])]
+        results = self.validator.validate_files(
+            paths,
+            module_checks=bool(params.get('module_checks')),
+            modules=modules,
+        )
+        return [result.to_dict() for result in results]
+
+    def _method_validate_changes(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        results = self.validator.validate_changes([Path(path) for path in params.get('paths', [])])
+        return [result.to_dict() for result in results]
+
+    def _method_validate_directory(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        path = Path(params['path'])
+        if path.is_dir():
+            results = self.validator.validate_directory(path)
+        else:
+            results = self.validator.validate_file(path)
+        return [result.to_dict() for result in results]
+
+    def _method_validate_source(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        results = self.validator.validate_source(params['text'], Path(params['path']))
+        return [result.to_dict() for result in results]
+
+    def _method_shutdown(self, params: Dict[str, Any]) -> bool:
+        # ``shutdown`` blocks until serve_forever returns, so call it from another thread.
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: ValidatorServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                response: Dict[str, Any] = {'id': None, 'error': f"Invalid JSON: {exc}"}
+            else:
+                response = self.server.handle_request_data(request)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+def serve(validator: Any, socket_path: Path = DEFAULT_SOCKET_PATH) -> None:
+    """Run the daemon in the foreground until a ``shutdown`` request or Ctrl+C."""
+    server = ValidatorServer(validator, socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
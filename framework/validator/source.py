@@ -0,0 +1,108 @@
+"""Lazily populated view of a file shared by every plugin in a run."""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+_UNSET = object()
+
+
+class SourceFile:
+    """One file's bytes, text, line index and parse trees, each computed on first use.
+
+    The validator builds a single ``SourceFile`` per file and hands it to every
+    plugin, so a file is read and decoded once no matter how many plugins look
+    at it. Parse failures are cached too and re-raised on every access.
+    """
+
+    def __init__(self, path: Path, data: Optional[bytes] = None) -> None:
+        self.path = path
+        self._raw: Optional[bytes] = data
+        self._text: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._line_offsets: Optional[List[int]] = None
+        self._python_ast: object = _UNSET
+        self._xml_root: object = _UNSET
+
+    # ------------------------------------------------------------------
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            self._raw = self.path.read_bytes()
+        return self._raw
+
+    @property
+    def text(self) -> str:
+        """UTF-8 text with universal newlines, matching ``Path.read_text``."""
+        if self._text is None:
+            text = self.raw.decode('utf-8')
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            self._text = text
+        return self._text
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Offset in ``text`` of the first character of each line."""
+        if self._line_offsets is None:
+            offsets = [0]
+            text = self.text
+            index = text.find('\n')
+            while index != -1:
+                offsets.append(index + 1)
+                index = text.find('\n', index + 1)
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    def open(self) -> BinaryIO:
+        """Binary stream over the content without forcing the whole file into memory."""
+        if self._raw is not None:
+            return io.BytesIO(self._raw)
+        return self.path.open('rb')
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number containing ``offset``."""
+        return bisect.bisect_right(self.line_offsets, offset)
+
+    @property
+    def python_ast(self) -> ast.Module:
+        if self._python_ast is _UNSET:
+            try:
+                self._python_ast = ast.parse(self.text, filename=str(self.path))
+            except SyntaxError as exc:
+                self._python_ast = exc
+        if isinstance(self._python_ast, SyntaxError):
+            raise self._python_ast
+        return self._python_ast  # type: ignore[return-value]
+
+    @property
+    def xml_root(self) -> ET.Element:
+        if self._xml_root is _UNSET:
+            try:
+                self._xml_root = ET.fromstring(self.raw)
+            except ET.ParseError as exc:
+                self._xml_root = exc
+        if isinstance(self._xml_root, ET.ParseError):
+            raise self._xml_root
+        return self._xml_root  # type: ignore[return-value]
+
+    # ------------------------------------------------------------------
+    def update(self, text: str) -> None:
+        """Replace the content after a plugin rewrote the file on disk."""
+        self._raw = text.encode('utf-8')
+        self._text = text
+        self._lines = None
+        self._line_offsets = None
+        self._python_ast = _UNSET
+        self._xml_root = _UNSET
@@ -0,0 +1,411 @@
+"""Project-wide symbol index for checks that span files and modules.
+
+While it validates a file, the core plugin records the file's symbols on its
+result (``ValidationResult.symbols``). Python files give the models they
+define or extend, with their fields. XML files give the XML ids they define,
+the ids they reference (``ref``, ``parent``, ``groups``, ``ref('...')``,
+``%(...)d``) and the fields used by each view. CSV files give their row ids;
+``ir.model.access.csv`` also gives the models its rows refer to. No file is
+read twice: the symbols come from the same parse that the file's own checks
+use.
+
+The validator merges these facts into a ``SymbolIndex``, keyed by module
+root, and runs the global checks once the files of a run are done. The
+index is stored in the result cache, next to the cached results, so a run
+that validates only some files still sees the rest of the project. The
+checks build their lookup tables once per run, so each is linear in the
+size of the index:
+
+- ``xml_id_duplicate``: an XML id defined twice in one module.
+- ``xml_ref_unknown``: a reference to an id that its module never defines.
+- ``access_model_unknown``: an access rule for a model that has no model id.
+- ``view_field_unknown``: a view field that its model does not define.
+
+A reference is only checked when every file of the target module is in the
+index, so modules outside the run (``base``, ``mail``...) never cause false
+reports.
+"""
+
+from __future__ import annotations
+
+import ast
+import csv
+import io
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .inventory import FileInventory
+from .plugin import ValidationResult, matches_file_patterns
+
+# Files the core plugin extracts symbols from; a module is complete once all of them are indexed.
+SYMBOL_FILE_PATTERNS = ('.py', '.xml', '.csv')
+
+# Fields every model has without declaring them.
+MAGIC_FIELDS = frozenset({'id', 'display_name', 'create_uid', 'create_date', 'write_uid', 'write_date'})
+
+
+@dataclass
+class ModelSymbol:
+    """A model class: the model it defines or extends, its parents and its fields."""
+
+    name: str
+    parents: Tuple[str, ...] = ()
+    fields: Tuple[str, ...] = ()
+    defines: bool = False
+    delegates: bool = False
+    line: int = 0
+
+
+@dataclass
+class FileSymbols:
+    """Symbols of one file, as recorded by the core plugin."""
+
+    models: List[ModelSymbol] = field(default_factory=list)
+    # (XML id as written, model of the record)
+    records: List[Tuple[str, str]] = field(default_factory=list)
+    # (kind, XML id as written); kind is 'ref', or 'model' for access rules
+    refs: List[Tuple[str, str]] = field(default_factory=list)
+    # (view XML id, model, fields used at the top level of its arch)
+    views: List[Tuple[str, str, Tuple[str, ...]]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'models': [[m.name, list(m.parents), list(m.fields), m.defines, m.delegates, m.line] for m in self.models],
+            'records': [list(item) for item in self.records],
+            'refs': [list(item) for item in self.refs],
+            'views': [[view_id, model, list(names)] for view_id, model, names in self.views],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileSymbols":
+        return cls(
+            models=[
+                ModelSymbol(name, tuple(parents), tuple(names), defines, delegates, line)
+                for name, parents, names, defines, delegates, line in data.get('models', ())
+            ],
+            records=[(xml_id, model) for xml_id, model in data.get('records', ())],
+            refs=[(kind, target) for kind, target in data.get('refs', ())],
+            views=[(view_id, model, tuple(names)) for view_id, model, names in data.get('views', ())],
+        )
+
+
+# ----------------------------------------------------------------------
+# Extraction
+
+def _string_list(node: Optional[ast.expr]) -> Optional[List[str]]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [item.value for item in node.elts if isinstance(item, ast.Constant) and isinstance(item.value, str)]
+    return None
+
+
+def python_symbols(tree: ast.Module) -> List[ModelSymbol]:
+    """Models declared by the top-level classes of ``tree``; looks at class bodies only."""
+    models: List[ModelSymbol] = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        name: Optional[str] = None
+        inherit: List[str] = []
+        delegates = False
+        field_names: List[str] = []
+        for statement in node.body:
+            if not isinstance(statement, ast.Assign) or len(statement.targets) != 1:
+                continue
+            target = statement.targets[0]
+            if not isinstance(target, ast.Name):
+                continue
+            value = statement.value
+            if target.id == '_name':
+                names = _string_list(value)
+                name = names[0] if names else None
+            elif target.id == '_inherit':
+                inherit = _string_list(value) or []
+            elif target.id == '_inherits':
+                delegates = True
+            elif (
+                isinstance(value, ast.Call)
+                and isinstance(value.func, ast.Attribute)
+                and isinstance(value.func.value, ast.Name)
+                and value.func.value.id == 'fields'
+            ):
+                field_names.append(target.id)
+        model = name or (inherit[0] if len(inherit) == 1 else None)
+        if model is None:
+            continue
+        models.append(ModelSymbol(
+            name=model,
+            parents=tuple(parent for parent in inherit if parent != model),
+            fields=tuple(field_names),
+            defines=name is not None and name not in inherit,
+            delegates=delegates,
+            line=node.lineno,
+        ))
+    return models
+
+
+def csv_symbols(file_path: Path, text: str) -> FileSymbols:
+    """Row ids of a CSV data file, plus the model and group references of access rules."""
+    symbols = FileSymbols()
+    rows = csv.reader(io.StringIO(text))
+    header = [column.strip() for column in next(rows, [])]
+    if 'id' not in header:
+        return symbols
+    id_column = header.index('id')
+    access = file_path.name == 'ir.model.access.csv'
+    model_column = header.index('model_id:id') if access and 'model_id:id' in header else None
+    group_column = header.index('group_id:id') if access and 'group_id:id' in header else None
+    record_model = 'ir.model.access' if access else file_path.stem
+    for row in rows:
+        if len(row) <= id_column or not row[id_column].strip():
+            continue
+        symbols.records.append((row[id_column].strip(), record_model))
+        if model_column is not None and len(row) > model_column and row[model_column].strip():
+            symbols.refs.append(('model', row[model_column].strip()))
+        if group_column is not None and len(row) > group_column and row[group_column].strip():
+            symbols.refs.append(('ref', row[group_column].strip()))
+    return symbols
+
+
+# ----------------------------------------------------------------------
+# Index
+
+def model_xml_id(model: str) -> str:
+    return 'model_' + model.replace('.', '_')
+
+
+def _split(xml_id: str, module: str) -> Tuple[str, str]:
+    owner, _, local = xml_id.rpartition('.')
+    return (owner or module), local
+
+
+class SymbolIndex:
+    """Symbols of every indexed file, grouped by module root."""
+
+    def __init__(self, scan: Callable[[Path], FileInventory] = FileInventory.scan) -> None:
+        # Lists a module's files for ``is_complete``; in-memory runs pass their tree's inventory.
+        self._scan = scan
+        self._modules: Dict[Path, Dict[Path, FileSymbols]] = {}
+        self._roots: Dict[Path, Path] = {}  # file -> module root
+        self._by_name: Dict[str, Set[Path]] = {}
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._roots
+
+    def __len__(self) -> int:
+        return len(self._roots)
+
+    @property
+    def modules(self) -> List[Path]:
+        return list(self._modules)
+
+    def update(self, root: Path, file_path: Path, symbols: FileSymbols) -> None:
+        """Replace the symbols recorded for ``file_path`` (a file of module ``root``)."""
+        previous = self._roots.get(file_path)
+        if previous is not None and previous != root:
+            self.remove(file_path)
+        self._roots[file_path] = root
+        self._modules.setdefault(root, {})[file_path] = symbols
+        self._by_name.setdefault(root.name, set()).add(root)
+
+    def remove(self, file_path: Path) -> None:
+        root = self._roots.pop(file_path, None)
+        if root is None:
+            return
+        files = self._modules[root]
+        files.pop(file_path, None)
+        if not files:
+            del self._modules[root]
+            self._by_name[root.name].discard(root)
+
+    def files(self, root: Path) -> Dict[Path, FileSymbols]:
+        return self._modules.get(root, {})
+
+    def root_of(self, file_path: Path) -> Optional[Path]:
+        return self._roots.get(file_path)
+
+    def is_complete(self, root: Path) -> bool:
+        """Whether every file of ``root`` that carries symbols is indexed."""
+        files = self._modules.get(root)
+        if not files:
+            return False
+        inventory = self._scan(root)
+        return all(
+            path in files
+            for path in inventory.files
+            if matches_file_patterns(path, SYMBOL_FILE_PATTERNS)
+        )
+
+    # ------------------------------------------------------------------
+    def check(self, roots: Iterable[Path], *, strict: bool = False) -> List[ValidationResult]:
+        """Run the global checks for the modules at ``roots``; findings are errors when ``strict``.
+
+        Returns one result per module with findings.
+        """
+        return list(self.check_modules(roots, strict=strict).values())
+
+    def check_modules(
+        self,
+        roots: Iterable[Path],
+        *,
+        strict: bool = False,
+        shown_roots: Optional[Dict[Path, Path]] = None,
+    ) -> Dict[Path, ValidationResult]:
+        """Like ``check``, keyed by module root (modules without findings are left out).
+
+        ``shown_roots`` maps module roots to the form the caller refers to
+        them by; the paths of their files are reported under that form.
+        """
+        tables = _Tables(self)
+
+        def shown(path: Path) -> Path:
+            root = self._roots.get(path)
+            if root is None or not shown_roots or root not in shown_roots:
+                return path
+            return shown_roots[root] / path.relative_to(root)
+
+        def add(result: ValidationResult, message: str, args: Tuple[Any, ...], rule: str, path: Path) -> None:
+            args = tuple(shown(arg) if isinstance(arg, Path) else arg for arg in args)
+            path = shown(path)
+            if strict:
+                result.add_error(message, *args, rule=rule, path=path)
+            else:
+                result.add_warning(message, *args, rule=rule, path=path)
+
+        results: Dict[Path, ValidationResult] = {}
+        for root in roots:
+            files = self._modules.get(root)
+            if not files:
+                continue
+            result = ValidationResult()
+            module = root.name
+
+            # Duplicate ids, in file order.
+            first_seen: Dict[str, Path] = {}
+            for path in sorted(files):
+                for xml_id, _ in files[path].records:
+                    owner, local = _split(xml_id, module)
+                    if owner != module or '{' in xml_id:
+                        continue
+                    first = first_seen.get(local)
+                    if first is None:
+                        first_seen[local] = path
+                    else:
+                        add(result, "Duplicate XML id '%s' in %s (already defined in %s)",
+                            (local, path, first), 'xml_id_duplicate', path)
+
+            for path in sorted(files):
+                symbols = files[path]
+                reported: Set[Tuple[str, str]] = set()
+                for kind, target in symbols.refs:
+                    if '{' in target or (kind, target) in reported:
+                        continue
+                    owner, local = _split(target, module)
+                    if tables.resolves(owner, local, root):
+                        continue
+                    reported.add((kind, target))
+                    if kind == 'model':
+                        add(result, "Access rule in %s refers to unknown model id '%s'", (path, target), 'access_model_unknown', path)
+                    else:
+                        add(result, "Reference to unknown XML id '%s' in %s", (target, path), 'xml_ref_unknown', path)
+
+                for view_id, model, names in symbols.views:
+                    known = tables.model_fields(model, root)
+                    if known is None:
+                        continue
+                    for name in names:
+                        if name not in known and '{' not in name:
+                            add(result, "View '%s' in %s uses field '%s', which model %s does not define",
+                                (view_id, path, name, model), 'view_field_unknown', path)
+
+            if result.has_messages():
+                results[root] = result
+        return results
+
+
+class _Tables:
+    """Lookup tables for one ``SymbolIndex.check`` call, built on first use."""
+
+    def __init__(self, index: SymbolIndex) -> None:
+        self.index = index
+        self._ids: Dict[Path, Set[str]] = {}
+        self._complete: Dict[Path, bool] = {}
+        self._models: Optional[Dict[str, List[Tuple[Path, ModelSymbol]]]] = None
+        self._fields: Dict[Tuple[str, Path], Optional[Set[str]]] = {}
+
+    def _complete_root(self, root: Path) -> bool:
+        complete = self._complete.get(root)
+        if complete is None:
+            complete = self._complete[root] = self.index.is_complete(root)
+        return complete
+
+    def ids(self, root: Path) -> Set[str]:
+        ids = self._ids.get(root)
+        if ids is None:
+            ids = set()
+            module = root.name
+            for symbols in self.index.files(root).values():
+                for xml_id, _ in symbols.records:
+                    owner, local = _split(xml_id, module)
+                    if owner == module:
+                        ids.add(local)
+                for model in symbols.models:
+                    prefix = model_xml_id(model.name)
+                    ids.add(prefix)
+                    ids.update(f"field_{prefix[6:]}__{name}" for name in model.fields)
+            self._ids[root] = ids
+        return ids
+
+    def resolves(self, owner: str, local: str, root: Path) -> bool:
+        """False only when every module named ``owner`` is fully indexed and none defines ``local``."""
+        candidates = [root] if owner == root.name else sorted(self.index._by_name.get(owner, ()))
+        if not candidates:
+            return True
+        for candidate in candidates:
+            if not self._complete_root(candidate) or local in self.ids(candidate):
+                return True
+        return False
+
+    def models(self) -> Dict[str, List[Tuple[Path, ModelSymbol]]]:
+        if self._models is None:
+            self._models = {}
+            for root, files in self.index._modules.items():
+                for symbols in files.values():
+                    for model in symbols.models:
+                        self._models.setdefault(model.name, []).append((root, model))
+        return self._models
+
+    def model_fields(self, model: str, root: Path) -> Optional[Set[str]]:
+        """Fields of ``model`` as seen from module ``root``, or ``None`` when they cannot be known.
+
+        Only models defined in ``root`` itself are checked: no other module can
+        add fields that ``root``'s views may use, except through the model's
+        parents, which must be defined somewhere in the index too.
+        """
+        key = (model, root)
+        if key not in self._fields:
+            self._fields[key] = self._collect_fields(model, root)
+        return self._fields[key]
+
+    def _collect_fields(self, model: str, root: Path) -> Optional[Set[str]]:
+        symbols = self.models().get(model, [])
+        if not any(owner == root and symbol.defines for owner, symbol in symbols) or not self._complete_root(root):
+            return None
+        known = set(MAGIC_FIELDS)
+        pending, seen = [model], set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            declared = self.models().get(name)
+            if not declared or not any(symbol.defines for _, symbol in declared):
+                return None
+            for _, symbol in declared:
+                if symbol.delegates:
+                    return None
+                known.update(symbol.fields)
+                pending.extend(symbol.parents)
+        return known
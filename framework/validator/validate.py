@@ -6,25 +6,97 @@ from __future__ import annotations
 
 import argparse
 import logging
+import multiprocessing
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
-    from framework.validator.plugin import ValidationContext, ValidationResult  # type: ignore[import-not-found]
-    from framework.validator.plugin_manager import PluginManager  # type: ignore[import-not-found]
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+# ``--daemon`` sends the request before anything below loads plugins: that
+# start-up cost is what the daemon saves. ``daemon_main`` only returns when
+# the run has to happen in-process after all.
+_DAEMON_TRIED = False
+if __name__ == "__main__" and '--daemon' in sys.argv[1:]:
+    if __package__ in (None, ""):
+        from framework.validator.cli import daemon_main  # type: ignore[import-not-found]
+    else:
+        from .cli import daemon_main
+    daemon_main()
+    _DAEMON_TRIED = True
+
+if __package__ in (None, ""):
+    from framework.validator.addons import AddonsPath, AddonsPathError  # type: ignore[import-not-found]
+    from framework.validator.cache import MISS, ValidationCache  # type: ignore[import-not-found]
+    from framework.validator.changes import ChangeDetectionError, changed_files  # type: ignore[import-not-found]
+    from framework.validator.cli import build_parser, check_args, file_request, load_baseline, log_details, log_totals, report_run, run_daemon_request, RunTotals  # type: ignore[import-not-found]
+    from framework.validator.client import plugin_directories  # type: ignore[import-not-found]
+    from framework.validator.fixes import FixEngine  # type: ignore[import-not-found]
+    from framework.validator.inventory import FileInventory  # type: ignore[import-not-found]
+    from framework.validator.lsp import serve_stdio  # type: ignore[import-not-found]
+    from framework.validator.module_graph import ModuleGraph  # type: ignore[import-not-found]
+    from framework.validator.plugin import ValidationContext, ValidationResult, ValidatorPlugin, clone_plugin  # type: ignore[import-not-found]
+    from framework.validator.plugin_manager import LazyPlugin, PluginManager  # type: ignore[import-not-found]
     from framework.validator.plugins import CoreRulesPlugin  # type: ignore[import-not-found]
+    from framework.validator.profiling import Profiler  # type: ignore[import-not-found]
+    from framework.validator.rulepacks import RulePackError  # type: ignore[import-not-found]
+    from framework.validator.server import serve  # type: ignore[import-not-found]
+    from framework.validator.source import SourceFile  # type: ignore[import-not-found]
+    from framework.validator.symbols import FileSymbols, SymbolIndex  # type: ignore[import-not-found]
+    from framework.validator.virtual import VirtualFileTree  # type: ignore[import-not-found]
+    from framework.validator.watch import watch  # type: ignore[import-not-found]
+    from framework.validator.workers import FileTimeout, WorkerPool, blame, mark, time_budget  # type: ignore[import-not-found]
 else:
-    from .plugin import ValidationContext, ValidationResult
-    from .plugin_manager import PluginManager
+    from .addons import AddonsPath, AddonsPathError
+    from .cache import MISS, ValidationCache
+    from .changes import ChangeDetectionError, changed_files
+    from .cli import build_parser, check_args, file_request, load_baseline, log_details, log_totals, report_run, run_daemon_request, RunTotals
+    from .client import plugin_directories
+    from .fixes import FixEngine
+    from .inventory import FileInventory
+    from .lsp import serve_stdio
+    from .module_graph import ModuleGraph
+    from .plugin import ValidationContext, ValidationResult, ValidatorPlugin, clone_plugin
+    from .plugin_manager import LazyPlugin, PluginManager
     from .plugins import CoreRulesPlugin
+    from .profiling import Profiler
+    from .rulepacks import RulePackError
+    from .server import serve
+    from .source import SourceFile
+    from .symbols import FileSymbols, SymbolIndex
+    from .virtual import VirtualFileTree
+    from .watch import watch
+    from .workers import FileTimeout, WorkerPool, blame, mark, time_budget
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Validator and context shared with forked workers. Set by the parent right
+# before the pool is created so children inherit fully set-up plugins instead
+# of re-running ``setup`` (or pickling plugins loaded from arbitrary files).
+_WORKER_STATE: Optional[Tuple["Odoo18Validator", List[ValidationContext]]] = None
+
+
+def _init_worker() -> None:
+    # A forked profiler starts with the parent's counts; workers only report their own.
+    if _WORKER_STATE is not None and _WORKER_STATE[0].profiler is not None:
+        _WORKER_STATE[0].profiler.clear()
+
+
+def _validate_chunk(
+    tasks: List[Tuple[int, Path, List[int]]],
+) -> Tuple[List[List[Optional[ValidationResult]]], List[float], Optional[Dict[str, object]]]:
+    assert _WORKER_STATE is not None, "worker started without validator state"
+    validator, contexts = _WORKER_STATE
+    raw, seconds = validator._run_tasks(tasks, contexts)
+    return raw, seconds, (validator.profiler.drain() if validator.profiler is not None else None)
+
 
 class Odoo18Validator:
     """Coordinates validator plugins and aggregates results."""
@@ -37,37 +109,90 @@ class Odoo18Validator:
         template_mode: bool = False,
         verbose: bool = False,
         plugin_dirs: Optional[Iterable[Path]] = None,
+        rule_packs: Optional[Iterable[Path]] = None,
+        jobs: int = 1,
+        cache_dir: Optional[Path] = None,
+        fix_diff: bool = False,
+        profile: bool = False,
+        timeout: Optional[float] = None,
     ) -> None:
-        self.auto_fix = auto_fix
+        self.auto_fix = auto_fix or fix_diff
+        self.fix_diff = fix_diff
         self.strict = strict
         self.template_mode = template_mode
         self.verbose = verbose
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.cache = ValidationCache(cache_dir) if cache_dir is not None else None
+        self._module_roots: Dict[Path, Optional[Path]] = {}
+        # Auto-fix edits are applied once per file at the end of each run; in
+        # --fix-diff mode they are collected as unified patches instead.
+        self.fixes = FixEngine(write=not fix_diff)
+        # Seconds each plugin may spend on one file; see ``workers``.
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.patches: List[str] = []
+        # Symbols of every file seen (and, with the cache, of earlier runs) for
+        # the cross-module checks; modules touched since the last check.
+        self.symbols = SymbolIndex()
+        self._symbols_loaded = False
+        self._symbol_roots: Set[Path] = set()
+        # Module roots as the run gave them, by absolute root: findings of the
+        # cross-module checks use the same paths as the other findings.
+        self._shown_roots: Dict[Path, Path] = {}
+        # Seconds per module of the last ``iter_modules`` run.
+        self.module_seconds: Dict[Path, float] = {}
 
-        self.plugin_manager = PluginManager()
+        # Plugin discovery is remembered next to the result cache, so unchanged
+        # plugin files are not imported until a file they handle shows up.
+        self.plugin_manager = PluginManager(
+            manifest_path=self.cache.directory / 'plugins.json' if self.cache is not None else None,
+        )
         self.plugin_manager.register(CoreRulesPlugin())
+        self.plugin_manager.load_entry_points()
 
-        directories: List[Path] = []
-        env_dirs = os.environ.get("NEODOO_VALIDATOR_PLUGINS", "")
-        if env_dirs:
-            directories.extend(
-                Path(entry).expanduser()
-                for entry in env_dirs.split(os.pathsep)
-                if entry.strip()
-            )
-
-        if plugin_dirs:
-            directories.extend(Path(directory) for directory in plugin_dirs)
+        # Kept for the daemon, which compares them with its clients' (see ``client``).
+        self.plugin_dirs = plugin_directories(plugin_dirs)
+        self.rule_packs = [Path(pack) for pack in rule_packs or ()]
 
-        for directory in directories:
+        for directory in self.plugin_dirs:
             self.plugin_manager.load_directory(directory)
+        for pack in self.rule_packs:
+            try:
+                self.plugin_manager.load_rule_pack(Path(pack))
+            except (OSError, RulePackError) as exc:
+                logger.warning(f"Failed to load rule pack '{pack}': {exc}")
 
         for error in self.plugin_manager.load_errors:
             logger.warning(error)
+        if verbose:
+            for duplicate, original in self.plugin_manager.duplicates:
+                logger.info(f"Skipped plugin file {duplicate}: identical to {original}")
+
+        self.profiler: Optional[Profiler] = None
+        if profile:
+            self.start_profiling()
 
     # ------------------------------------------------------------------
     def list_plugins(self) -> List[str]:
         return self.plugin_manager.describe_plugins()
 
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
+
+    def start_profiling(self) -> Profiler:
+        """Record hook and rule timings from now on; returns the active profiler."""
+        if self.profiler is None:
+            self.profiler = Profiler()
+            self.profiler.instrument(self.plugin_manager.plugins)
+        return self.profiler
+
+    def stop_profiling(self) -> Optional[Profiler]:
+        """Remove the profiling wrappers; returns the profiler with what it recorded."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.restore(self.plugin_manager.plugins)
+        return profiler
+
     # ------------------------------------------------------------------
     def validate_file(self, file_path: Path) -> List[ValidationResult]:
         if not file_path.exists():
@@ -81,19 +206,65 @@ class Odoo18Validator:
             strict=self.strict,
             template_mode=self.template_mode,
             verbose=self.verbose,
+            profiler=self.profiler,
             module_name=self._infer_module_name(file_path),
         )
 
         for plugin in self.plugin_manager.plugins:
             plugin.setup(context)
 
-        results: List[ValidationResult] = []
+        results = self._validate_many([file_path], context)[0]
+
         for plugin in self.plugin_manager.plugins:
-            if not plugin.supports(file_path, context):
-                continue
-            result = plugin.validate_file(file_path, context)
-            if result and (result.has_messages() or self.verbose):
-                results.append(result)
+            for result in plugin.finalize(context):
+                self._collect_fixes(result)
+                if result and (result.has_messages() or self.verbose):
+                    results.append(result)
+
+        results.extend(self._symbol_results())
+        results.extend(self._commit_fixes())
+        return results
+
+    def validate_source(
+        self,
+        text: str,
+        virtual_path: Path,
+        module_root: Optional[Path] = None,
+        *,
+        files: Optional[VirtualFileTree] = None,
+    ) -> List[ValidationResult]:
+        """Validate unsaved ``text`` as if it were the content of ``virtual_path``.
+
+        Used by the daemon and editor integrations, and to check generated
+        code before it is written. Passing ``module_root`` (the module the file
+        belongs to) or ``files`` (the rest of the module, see ``validate_tree``)
+        makes the run in-memory: other files are looked up in ``files`` only
+        and nothing is read from disk. Nothing is written back either, so
+        auto-fix is always off and results are never cached.
+        """
+        virtual_path = Path(virtual_path)
+        if files is None and module_root is not None:
+            files = VirtualFileTree(module_root)
+            files.add(virtual_path, text)
+        if module_root is None:
+            module_root = files.module_root_of(virtual_path) if files is not None else self._module_root(virtual_path)
+        context = ValidationContext(
+            root=virtual_path,
+            auto_fix=False,
+            strict=self.strict,
+            template_mode=self.template_mode,
+            verbose=self.verbose,
+            profiler=self.profiler,
+            module_name=module_root.name if module_root is not None else _guess_module_name(virtual_path),
+            files=files,
+        )
+
+        for plugin in self.plugin_manager.plugins:
+            plugin.setup(context)
+
+        context.current_source = SourceFile(virtual_path, text.encode('utf-8'))
+        raw = self._run_plugins(virtual_path, context, self.plugin_manager.dispatch.route(virtual_path))
+        results = [result for result in raw if result and (result.has_messages() or self.verbose)]
 
         for plugin in self.plugin_manager.plugins:
             for result in plugin.finalize(context):
@@ -102,97 +273,739 @@ class Odoo18Validator:
 
         return results
 
+    def validate_tree(self, tree: VirtualFileTree) -> List[ValidationResult]:
+        """Validate in-memory files the way ``validate_directory`` validates ``tree.root``.
+
+        The same plugin hooks run in the same order, followed by the
+        cross-module checks over the tree's own symbols, but every file is
+        read from ``tree``: nothing touches the disk. As with
+        ``validate_source``, auto-fix is off and nothing is cached.
+        """
+        context = ValidationContext(
+            root=tree.root,
+            auto_fix=False,
+            strict=self.strict,
+            template_mode=self.template_mode,
+            verbose=self.verbose,
+            profiler=self.profiler,
+            module_name=tree.root.name,
+            inventory=tree.inventory(),
+            files=tree,
+        )
+        results: List[ValidationResult] = []
+
+        def keep(result: Optional[ValidationResult]) -> None:
+            if result and (result.has_messages() or self.verbose):
+                results.append(result)
+
+        for plugin in self.plugin_manager.plugins:
+            plugin.setup(context)
+        for plugin in self.plugin_manager.plugins:
+            for result in plugin.validate_directory(tree.root, context):
+                if result:
+                    result.diagnostics.fill_path(tree.root)
+                keep(result)
+
+        index = SymbolIndex(scan=tree.inventory)
+        roots: Set[Path] = set()
+        for file_path in tree.files:
+            raw = self._run_plugins(file_path, context, self.plugin_manager.dispatch.route(file_path))
+            for result in raw:
+                keep(result)
+            root = tree.module_root_of(file_path)
+            symbols = next((result.symbols for result in raw if result is not None and result.symbols is not None), None)
+            if root is not None and symbols is not None:
+                index.update(root, file_path, symbols)
+                roots.add(root)
+
+        for plugin in self.plugin_manager.plugins:
+            for result in plugin.finalize(context):
+                keep(result)
+        results.extend(index.check(sorted(roots), strict=self.strict and not self.template_mode))
+        return results
+
+    # ------------------------------------------------------------------
+    def validate_files(
+        self,
+        file_paths: Iterable[Path],
+        *,
+        module_checks: bool = False,
+        modules: Iterable[Path] = (),
+    ) -> List[ValidationResult]:
+        """Validate a batch of files (e.g. staged files) in one run.
+
+        Files are grouped by owning module so each plugin's ``setup`` and
+        ``finalize`` run once per module instead of once per file. With
+        ``module_checks`` each affected module also gets the plugins'
+        ``validate_directory`` checks. ``modules`` lists extra module roots to
+        check even when none of their files are in the batch, for example
+        modules that only lost files.
+        """
+        results: List[ValidationResult] = []
+        for _, scope_results in self.iter_files(file_paths, module_checks=module_checks, modules=modules):
+            results.extend(scope_results)
+        return results
+
+    def iter_files(
+        self,
+        file_paths: Iterable[Path],
+        *,
+        module_checks: Union[bool, Collection[Path]] = False,
+        modules: Iterable[Path] = (),
+        symbol_checks: bool = True,
+    ) -> Iterator[Tuple[Path, List[ValidationResult]]]:
+        """Run ``validate_files`` lazily, yielding ``(scope, results)`` pairs.
+
+        The scope is the file path for per-file results and the module root
+        for module-level results (``validate_directory`` and ``finalize``).
+        ``module_checks`` may be a collection of module roots to limit the
+        module-level checks to those modules. With ``symbol_checks=False`` the
+        cross-module checks are left for the caller to run (``check_symbols``).
+        """
+        return self._iter_run(self._iter_file_groups(file_paths, module_checks, modules), symbol_checks=symbol_checks)
+
+    def iter_modules(
+        self,
+        module_roots: Iterable[Path],
+        *,
+        graph: Optional[ModuleGraph] = None,
+    ) -> Iterator[Tuple[Path, List[ValidationResult]]]:
+        """Validate whole modules in one run, e.g. every module of an addons path.
+
+        Each module gets the results ``validate_directory`` would give it, but
+        all modules are set up first and their files share one worker pool,
+        and the cross-module checks see every module at once. With ``graph``
+        the modules' dependencies are also checked against it (missing
+        dependencies, cycles). Yields ``(scope, results)`` pairs like
+        ``iter_files``. ``module_seconds`` maps each finished module to the
+        seconds spent on it: its module-level hooks plus its files' plugin
+        time, summed over workers.
+        """
+        self.module_seconds = {}
+        scopes: List[Tuple[Path, ValidationContext, bool, List[Path]]] = []
+        for root in module_roots:
+            context = ValidationContext(
+                root=root,
+                auto_fix=self.auto_fix,
+                strict=self.strict,
+                template_mode=self.template_mode,
+                verbose=self.verbose,
+                profiler=self.profiler,
+                module_name=root.name,
+                inventory=FileInventory.scan(root),
+            )
+            scopes.append((root, context, True, context.inventory.files))  # type: ignore[union-attr]
+
+        def scoped() -> Iterator[Tuple[Path, List[ValidationResult]]]:
+            yield from self._iter_scopes(scopes)
+            if graph is not None:
+                names = [root.name for root, _, _, _ in scopes]
+                for result in graph.check(names, strict=self.strict and not self.template_mode):
+                    yield Path(result.diagnostics.paths[0]), [result]
+
+        return self._iter_run(scoped())
+
+    def _iter_run(
+        self,
+        scoped: Iterator[Tuple[Path, List[ValidationResult]]],
+        *,
+        symbol_checks: bool = True,
+    ) -> Iterator[Tuple[Path, List[ValidationResult]]]:
+        """Follow ``scoped`` with the cross-module checks and the results of applying fixes."""
+        try:
+            yield from scoped
+            if symbol_checks:
+                for result in self._symbol_results():
+                    yield Path(result.diagnostics.paths[0]), [result]
+        finally:
+            skipped = self._commit_fixes()
+        for result in skipped:
+            yield Path(result.diagnostics.paths[0]), [result]
+
+    def _iter_file_groups(
+        self,
+        file_paths: Iterable[Path],
+        module_checks: Union[bool, Collection[Path]],
+        modules: Iterable[Path],
+    ) -> Iterator[Tuple[Path, List[ValidationResult]]]:
+        groups: Dict[Tuple[Optional[Path], Optional[str]], List[Path]] = {}
+        if module_checks:
+            for module_root in modules:
+                groups.setdefault((module_root, module_root.name), [])
+        seen: set = set()
+        for file_path in file_paths:
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            if not file_path.is_file():
+                res = ValidationResult()
+                res.add_error(f"File not found: {file_path}")
+                yield file_path, [res]
+                continue
+            root = self._module_root(file_path)
+            module_name = root.name if root is not None else self._infer_module_name(file_path)
+            groups.setdefault((root, module_name), []).append(file_path)
+
+        scopes: List[Tuple[Path, ValidationContext, bool, List[Path]]] = []
+        for (root, module_name), files in groups.items():
+            group_root = root if root is not None else files[0].parent
+            context = ValidationContext(
+                root=group_root,
+                auto_fix=self.auto_fix,
+                strict=self.strict,
+                template_mode=self.template_mode,
+                verbose=self.verbose,
+                profiler=self.profiler,
+                module_name=module_name,
+            )
+            run_module_checks = root is not None and (
+                module_checks is True or (not isinstance(module_checks, bool) and root in module_checks)
+            )
+            if run_module_checks:
+                context.inventory = FileInventory.scan(root)
+            scopes.append((group_root, context, run_module_checks, files))
+        yield from self._iter_scopes(scopes)
+
+    def _iter_scopes(self, scopes: List[Tuple[Path, ValidationContext, bool, List[Path]]]) -> Iterator[Tuple[Path, List[ValidationResult]]]:
+        """Validate ``(root, context, run_module_checks, files)`` scopes, sharing one scheduler."""
+        clock = time.perf_counter
+        # Every module is set up before any file is validated, so the files of
+        # all modules can share one worker pool. Modules therefore overlap, and
+        # each gets its own clone of the plugins that are not reentrant.
+        if len(scopes) > 1:
+            for _, context, _, _ in scopes:
+                context.plugins = self._module_plugins()
+
+        module_results: List[List[ValidationResult]] = []
+        for group_root, context, run_module_checks, _ in scopes:
+            started = clock()
+            plugins = self._plugins(context)
+            for plugin in plugins:
+                plugin.setup(context)
+            scope_results: List[ValidationResult] = []
+            if run_module_checks:
+                for plugin in plugins:
+                    for result in plugin.validate_directory(group_root, context):
+                        self._collect_fixes(result)
+                        if result and (result.has_messages() or self.verbose):
+                            result.diagnostics.fill_path(group_root)
+                            scope_results.append(result)
+            context.seconds += clock() - started
+            module_results.append(scope_results)
+
+        file_results = self._iter_scheduled([(path, context) for _, context, _, files in scopes for path in files])
+        try:
+            for (group_root, context, run_module_checks, files), scope_results in zip(scopes, module_results):
+                if run_module_checks:
+                    yield group_root, scope_results
+                for file_path in files:
+                    yield file_path, next(file_results)
+
+                started = clock()
+                finalize_results: List[ValidationResult] = []
+                for plugin in self._plugins(context):
+                    for result in plugin.finalize(context):
+                        self._collect_fixes(result)
+                        if result and (result.has_messages() or self.verbose):
+                            finalize_results.append(result)
+                context.seconds += clock() - started
+                self.module_seconds[group_root] = context.seconds
+                yield group_root, finalize_results
+        finally:
+            file_results.close()
+
+    def validate_changes(self, changed: Iterable[Path]) -> List[ValidationResult]:
+        """Validate changed files plus module-level checks of every module they touch.
+
+        ``changed`` may include deleted paths; their modules still get their
+        module-level checks re-run (e.g. an XML file removed but still listed in
+        the manifest).
+        """
+        existing: List[Path] = []
+        lost_modules = set()
+        for path in changed:
+            if path.is_file():
+                existing.append(path)
+                continue
+            if path.exists():
+                continue
+            parent = path.parent
+            while not parent.exists() and parent != parent.parent:
+                parent = parent.parent
+            module_root = self._module_root(parent)
+            if module_root is not None:
+                lost_modules.add(module_root)
+        return self.validate_files(existing, module_checks=True, modules=sorted(lost_modules))
+
     # ------------------------------------------------------------------
     def validate_directory(self, directory_path: Path) -> List[ValidationResult]:
-        if not directory_path.exists() or not directory_path.is_dir():
+        if not directory_path.is_dir():
             res = ValidationResult()
             res.add_error(f"Directory not found: {directory_path}")
             return [res]
+        return list(self.iter_validate(directory_path))
+
+    def iter_validate(self, path: Path) -> Iterator[ValidationResult]:
+        """Validate a file or directory, yielding results as soon as each file is done.
+
+        Yields the same results, in the same order, as ``validate_directory``
+        (or ``validate_file``), without holding them all in memory. Stop
+        iterating to abort the run; ``finalize`` is then skipped.
+        """
+        if not path.is_dir():
+            yield from self.validate_file(path)
+            return
 
         context = ValidationContext(
-            root=directory_path,
+            root=path,
             auto_fix=self.auto_fix,
             strict=self.strict,
             template_mode=self.template_mode,
             verbose=self.verbose,
-            module_name=directory_path.name,
+            profiler=self.profiler,
+            module_name=path.name,
+            inventory=FileInventory.scan(path),
         )
 
+        try:
+            yield from self._iter_directory(path, context)
+            yield from self._symbol_results()
+        finally:
+            skipped = self._commit_fixes()
+        yield from skipped
+
+    def _iter_directory(self, path: Path, context: ValidationContext) -> Iterator[ValidationResult]:
         for plugin in self.plugin_manager.plugins:
             plugin.setup(context)
 
-        results: List[ValidationResult] = []
-
         for plugin in self.plugin_manager.plugins:
-            for result in plugin.validate_directory(directory_path, context):
+            for result in plugin.validate_directory(path, context):
+                self._collect_fixes(result)
                 if result and (result.has_messages() or self.verbose):
-                    results.append(result)
+                    result.diagnostics.fill_path(path)
+                    yield result
 
-        for path in sorted(directory_path.glob('**/*')):
-            if not path.is_file():
-                continue
-            for plugin in self.plugin_manager.plugins:
-                if not plugin.supports(path, context):
-                    continue
-                result = plugin.validate_file(path, context)
-                if result and (result.has_messages() or self.verbose):
-                    results.append(result)
+        for file_results in self._iter_many(context.inventory.files, context):
+            yield from file_results
 
         for plugin in self.plugin_manager.plugins:
             for result in plugin.finalize(context):
+                self._collect_fixes(result)
                 if result and (result.has_messages() or self.verbose):
-                    results.append(result)
+                    yield result
 
-        return results
+    # ------------------------------------------------------------------
+    def _plugins(self, context: ValidationContext) -> List[ValidatorPlugin]:
+        return context.plugins if context.plugins is not None else self.plugin_manager.plugins
+
+    def _module_plugins(self) -> List[ValidatorPlugin]:
+        """Plugin instances for one of several modules in flight: shared when reentrant, cloned otherwise."""
+        plugins = [
+            plugin if getattr(plugin, 'reentrant', False) else clone_plugin(plugin)
+            for plugin in self.plugin_manager.plugins
+        ]
+        if self.profiler is not None:
+            self.profiler.instrument(plugins)
+        return plugins
+
+    def _run_plugins(self, file_path: Path, context: ValidationContext, indexes: List[int]) -> List[Optional[ValidationResult]]:
+        """Run the plugins at ``indexes`` on one file, returning one raw result per plugin."""
+        plugins = self._plugins(context)
+        needs_supports = self.plugin_manager.dispatch.needs_supports
+        source = context.get_source(file_path)
+        raw: List[Optional[ValidationResult]] = []
+        try:
+            for index in indexes:
+                plugin = plugins[index]
+                if self.timeout is None:
+                    result = self._call_plugin(plugin, file_path, source, context, needs_supports[index])
+                else:
+                    mark(index)
+                    try:
+                        with time_budget(self.timeout):
+                            result = self._call_plugin(plugin, file_path, source, context, needs_supports[index])
+                    except FileTimeout as exc:
+                        result = self._timeout_result(file_path, plugin, blame(exc.__traceback__))
+                if result is not None:
+                    result.diagnostics.fill_path(file_path)
+                raw.append(result)
+        finally:
+            context.current_source = None
+        return raw
+
+    @staticmethod
+    def _call_plugin(
+        plugin: ValidatorPlugin,
+        file_path: Path,
+        source: SourceFile,
+        context: ValidationContext,
+        needs_supports: bool,
+    ) -> Optional[ValidationResult]:
+        if needs_supports and not plugin.supports(file_path, context):
+            return None
+        validate_source = getattr(plugin, 'validate_source', None)
+        if validate_source is not None:
+            return validate_source(source, context)
+        return plugin.validate_file(file_path, context)
+
+    def _timeout_result(
+        self,
+        file_path: Path,
+        plugin: ValidatorPlugin,
+        where: Optional[str],
+        *,
+        crashed: bool = False,
+    ) -> ValidationResult:
+        """Report that ``plugin`` did not finish ``file_path``; an error with ``--strict``."""
+        result = ValidationResult()
+        detail = f", {where}" if where else ''
+        if crashed:
+            message, args, rule = "Worker process died validating %s (plugin %s%s); file skipped", (file_path, plugin.name, detail), 'worker_crashed'
+        else:
+            message, args, rule = "Timed out after %gs validating %s (plugin %s%s); file skipped", (self.timeout, file_path, plugin.name, detail), 'timeout'
+        if self.strict:
+            result.add_error(message, *args, rule=rule, path=file_path)
+        else:
+            result.add_warning(message, *args, rule=rule, path=file_path)
+        return result
+
+    def _validate_many(self, paths: List[Path], context: ValidationContext) -> List[List[ValidationResult]]:
+        return list(self._iter_many(paths, context))
+
+    def _iter_many(self, paths: Sequence[Path], context: ValidationContext) -> Iterator[List[ValidationResult]]:
+        return self._iter_scheduled([(path, context) for path in paths])
+
+    def _iter_scheduled(self, items: Sequence[Tuple[Path, ValidationContext]]) -> Iterator[List[ValidationResult]]:
+        """Run per-file plugin work, yielding each file's results in the order of ``items``.
+
+        Each item pairs a file with the context (module) it belongs to. Files
+        are processed in windows so results stream out while later files are
+        still pending and memory stays bounded by the window size. With
+        ``jobs > 1`` one process pool serves every window and every module.
+        Plugin results already in the cache are replayed; only the remaining
+        (file, plugin) pairs are executed, so parallel and cached runs report
+        exactly what a serial, uncached run would.
+        """
+        global _WORKER_STATE
+        if not items:
+            return
+        contexts = list({id(context): context for _, context in items}.values())
+        window = max(self.jobs * 32, 64)
+        pool: Union[ProcessPoolExecutor, WorkerPool, None] = None
+        if self.timeout is not None and self._can_fork():
+            # Even a single file runs in a worker, so it can be killed if it hangs.
+            _WORKER_STATE = (self, contexts)
+            pool = WorkerPool(self.jobs, _validate_chunk, initializer=_init_worker)
+        elif self.jobs > 1 and len(items) > 1 and self._can_fork():
+            _WORKER_STATE = (self, contexts)
+            pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker,
+            )
+        try:
+            for start in range(0, len(items), window):
+                yield from self._run_window(items[start:start + window], contexts, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+                _WORKER_STATE = None
+
+    def _run_window(
+        self,
+        items: Sequence[Tuple[Path, ValidationContext]],
+        contexts: List[ValidationContext],
+        pool: Union[ProcessPoolExecutor, WorkerPool, None],
+    ) -> List[List[ValidationResult]]:
+        dispatch = self.plugin_manager.dispatch
+        cache = self.cache if not self.auto_fix else None
+        context_index = {id(context): index for index, context in enumerate(contexts)}
+
+        # Per file: plugin index -> raw result, and plugin index -> cache key.
+        per_file: List[Dict[int, Optional[ValidationResult]]] = []
+        keys: List[Dict[int, Optional[str]]] = []
+        tasks: List[Tuple[int, Path, List[int]]] = []
+        task_files: List[int] = []
+        for position, (path, context) in enumerate(items):
+            routed = dispatch.route(path)
+            slots: Dict[int, Optional[ValidationResult]] = {}
+            file_keys: Dict[int, Optional[str]] = {}
+            pending: List[int] = []
+            if cache and routed:
+                plugins = self._plugins(context)
+                file_keys = dict(zip(routed, cache.keys_for(path, [plugins[i] for i in routed], context)))
+            for index in routed:
+                key = file_keys.get(index)
+                cached = cache.get(key) if (cache and key) else MISS
+                if cached is MISS:
+                    pending.append(index)
+                else:
+                    slots[index] = cached  # type: ignore[assignment]
+            per_file.append(slots)
+            keys.append(file_keys)
+            if pending:
+                tasks.append((context_index[id(context)], path, pending))
+                task_files.append(position)
+
+        if pool is not None:
+            # Lazy plugins must exist in this process too, or their finalize would be skipped.
+            for scope, _, indexes in tasks:
+                plugins = self._plugins(contexts[scope])
+                for index in indexes:
+                    if isinstance(plugins[index], LazyPlugin):
+                        plugins[index].resolve()
+
+        raws, seconds = self._execute(tasks, contexts, pool)
+        for position, (scope, _, indexes), raw, elapsed in zip(task_files, tasks, raws, seconds):
+            contexts[scope].seconds += elapsed
+            for index, result in zip(indexes, raw):
+                per_file[position][index] = result
+                self._collect_fixes(result)
+                key = keys[position].get(index)
+                if cache and key and not _incomplete(result):
+                    cache.put(key, result)
+
+        self._index_symbols(items, per_file)
+        if cache:
+            cache.flush()
+
+        return [
+            [result for _, result in sorted(slots.items()) if result and (result.has_messages() or self.verbose)]
+            for slots in per_file
+        ]
+
+    def _execute(
+        self,
+        tasks: List[Tuple[int, Path, List[int]]],
+        contexts: List[ValidationContext],
+        pool: Union[ProcessPoolExecutor, WorkerPool, None],
+    ) -> Tuple[List[List[Optional[ValidationResult]]], List[float]]:
+        """Run ``tasks``; returns each task's raw results and the seconds it took."""
+        if isinstance(pool, WorkerPool):
+            return self._execute_killable(tasks, contexts, pool)
+        if pool is None or len(tasks) <= 1:
+            return self._run_tasks(tasks, contexts)
+        chunk_size = max(1, len(tasks) // (self.jobs * 4))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        results: List[List[Optional[ValidationResult]]] = []
+        seconds: List[float] = []
+        for raw, elapsed, profile in pool.map(_validate_chunk, chunks):
+            results.extend(raw)
+            seconds.extend(elapsed)
+            if profile is not None and self.profiler is not None:
+                self.profiler.merge(profile)
+        return results, seconds
+
+    def _run_tasks(
+        self,
+        tasks: List[Tuple[int, Path, List[int]]],
+        contexts: List[ValidationContext],
+    ) -> Tuple[List[List[Optional[ValidationResult]]], List[float]]:
+        clock = time.perf_counter
+        results: List[List[Optional[ValidationResult]]] = []
+        seconds: List[float] = []
+        for scope, path, indexes in tasks:
+            started = clock()
+            results.append(self._run_plugins(path, contexts[scope], indexes))
+            seconds.append(clock() - started)
+        return results, seconds
+
+    def _execute_killable(
+        self,
+        tasks: List[Tuple[int, Path, List[int]]],
+        contexts: List[ValidationContext],
+        pool: WorkerPool,
+    ) -> Tuple[List[List[Optional[ValidationResult]]], List[float]]:
+        """Run one file per worker; a worker past its deadline is killed and the file's
+        remaining plugins are retried in a fresh one."""
+        assert self.timeout is not None
+        results: List[List[Optional[ValidationResult]]] = [[None] * len(indexes) for _, _, indexes in tasks]
+        seconds = [0.0] * len(tasks)
+        remaining = {position: list(indexes) for position, (_, _, indexes) in enumerate(tasks)}
+        grace = max(1.0, self.timeout)
+        while remaining:
+            positions = list(remaining)
+            batch = [[(tasks[position][0], tasks[position][1], remaining[position])] for position in positions]
+            outcomes = pool.map(batch, [self.timeout * len(remaining[position]) + grace for position in positions])
+            for position, outcome in zip(positions, outcomes):
+                scope, path, indexes = tasks[position]
+                pending = remaining.pop(position)
+                seconds[position] += outcome.seconds
+                if not (outcome.killed or outcome.crashed):
+                    raw, _, profile = outcome.value
+                    for index, result in zip(pending, raw[0]):
+                        results[position][indexes.index(index)] = result
+                    if profile is not None and self.profiler is not None:
+                        self.profiler.merge(profile)
+                    continue
+                culprit = outcome.activity if outcome.activity in pending else pending[0]
+                plugin = self._plugins(contexts[scope])[culprit]
+                results[position][indexes.index(culprit)] = self._timeout_result(path, plugin, None, crashed=outcome.crashed)
+                rest = [index for index in pending if index != culprit]
+                if rest:
+                    remaining[position] = rest
+        return results, seconds
+
+    def _can_fork(self) -> bool:
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            return False
+        unsafe = [plugin.name for plugin in self.plugin_manager.plugins if not getattr(plugin, 'parallel_safe', True)]
+        if unsafe:
+            if self.verbose:
+                logger.info(f"Running serially; plugins not parallel-safe: {', '.join(unsafe)}")
+            return False
+        return True
+
+    def _index_symbols(
+        self,
+        items: Sequence[Tuple[Path, ValidationContext]],
+        per_file: List[Dict[int, Optional[ValidationResult]]],
+    ) -> None:
+        """Record the symbols reported for each file of a window in ``self.symbols``."""
+        store = self.cache if not self.auto_fix else None
+        if store is not None and not self._symbols_loaded:
+            for file_path, root, data in store.load_symbols():
+                if file_path not in self.symbols:
+                    self.symbols.update(root, file_path, FileSymbols.from_dict(data))
+        self._symbols_loaded = True
+
+        for (file_path, _), slots in zip(items, per_file):
+            root = self._module_root(file_path)
+            if root is None:
+                continue
+            # Absolute paths, so runs from other directories share the stored index.
+            shown_root = root
+            file_path, root = Path(os.path.abspath(file_path)), Path(os.path.abspath(root))
+            self._shown_roots[root] = shown_root
+            symbols = next((result.symbols for result in slots.values() if result is not None and result.symbols is not None), None)
+            if symbols is None:
+                if file_path not in self.symbols:
+                    continue
+                self.symbols.remove(file_path)
+            else:
+                self.symbols.update(root, file_path, symbols)
+            self._symbol_roots.add(root)
+            if store is not None:
+                store.put_symbols(file_path, root, symbols.to_dict() if symbols is not None else None)
+
+    def forget_files(self, file_paths: Iterable[Path]) -> None:
+        """Drop deleted files from the symbol index; their modules are checked again next time."""
+        store = self.cache if not self.auto_fix else None
+        for file_path in file_paths:
+            file_path = Path(os.path.abspath(file_path))
+            root = self.symbols.root_of(file_path)
+            if root is None:
+                continue
+            self.symbols.remove(file_path)
+            self._symbol_roots.add(root)
+            if store is not None:
+                store.put_symbols(file_path, root, None)
+
+    def check_symbols(self) -> Dict[Path, List[ValidationResult]]:
+        """Cross-module checks for the modules whose files were validated since the last call.
+
+        Keyed by absolute module root; every module checked has an entry,
+        empty when its findings are gone.
+        """
+        roots, self._symbol_roots = self._symbol_roots, set()
+        if not roots:
+            return {}
+        found = self.symbols.check_modules(
+            sorted(roots), strict=self.strict and not self.template_mode, shown_roots=self._shown_roots,
+        )
+        return {root: [found[root]] if root in found else [] for root in sorted(roots)}
+
+    def _symbol_results(self) -> List[ValidationResult]:
+        return [result for results in self.check_symbols().values() for result in results]
+
+    def _collect_fixes(self, result: Optional[ValidationResult]) -> None:
+        if result is not None and result.edits and self.auto_fix:
+            for edit in result.edits:
+                self.fixes.add(edit)
+
+    def _commit_fixes(self) -> List[ValidationResult]:
+        """Apply the run's pending edits; returns warnings for edits skipped as overlapping."""
+        if not self.fixes:
+            return []
+        skipped_results: List[ValidationResult] = []
+        for outcome in self.fixes.commit():
+            if outcome.patch:
+                self.patches.append(outcome.patch)
+            if not outcome.skipped:
+                continue
+            res = ValidationResult()
+            for edit, kept in outcome.skipped:
+                res.add_warning(
+                    "Skipped auto-fix %s in %s: overlaps %s; run the auto-fix again",
+                    edit.rule or 'edit', outcome.path, kept.rule or 'another edit',
+                    rule=edit.rule, path=outcome.path,
+                )
+            skipped_results.append(res)
+        return skipped_results
 
     # ------------------------------------------------------------------
-    def _infer_module_name(self, file_path: Path) -> Optional[str]:
-        cur = file_path if file_path.is_dir() else file_path.parent
+    def _module_root(self, file_path: Path) -> Optional[Path]:
+        """Nearest ancestor (up to 5 levels) holding a ``__manifest__.py``; memoized per directory."""
+        start = file_path if file_path.is_dir() else file_path.parent
+        visited: List[Path] = []
+        cur = start
+        root: Optional[Path] = None
         for _ in range(5):
-            manifest = cur / '__manifest__.py'
-            if manifest.exists():
-                return cur.name
+            if cur in self._module_roots:
+                root = self._module_roots[cur]
+                break
+            visited.append(cur)
+            if (cur / '__manifest__.py').exists():
+                root = cur
+                break
             if cur.parent == cur:
                 break
             cur = cur.parent
-        parts = list(file_path.parts)
-        if 'models' in parts:
-            try:
-                index = parts.index('models')
-                return Path(*parts[:index]).name
-            except Exception:
-                pass
-        return file_path.parent.name if file_path.parent else None
+        for directory in visited:
+            self._module_roots[directory] = root
+        return root
+
+    def _infer_module_name(self, file_path: Path) -> Optional[str]:
+        root = self._module_root(file_path)
+        if root is not None:
+            return root.name
+        return _guess_module_name(file_path)
+
+
+def _incomplete(result: Optional[ValidationResult]) -> bool:
+    """Whether ``result`` reports a plugin that did not finish (never cached)."""
+    return result is not None and any(rule in ('timeout', 'worker_crashed') for rule in result.diagnostics.rules)
+
+
+def _guess_module_name(file_path: Path) -> Optional[str]:
+    """Module name of a file outside any module with a manifest, from its path alone."""
+    parts = list(file_path.parts)
+    if 'models' in parts:
+        try:
+            index = parts.index('models')
+            return Path(*parts[:index]).name
+        except Exception:
+            pass
+    return file_path.parent.name if file_path.parent else None
 
 
 # ----------------------------------------------------------------------
 
-def _summarise_results(results: List[ValidationResult], verbose: bool) -> bool:
-    valid = all(result.is_valid for result in results)
-    error_count = sum(len(result.errors) for result in results)
-    warning_count = sum(len(result.warnings) for result in results)
-    fix_count = sum(len(result.auto_fixes) for result in results)
+def _summarise_results(results: List[ValidationResult], verbose: bool, *, details: bool = True) -> bool:
+    totals = RunTotals()
+    for result in results:
+        totals.add(result)
 
-    if not valid:
-        logger.error(f"Validation failed: {error_count} errors, {warning_count} warnings")
-    elif warning_count:
-        logger.warning(f"Validation passed with {warning_count} warnings")
-    else:
-        logger.info("Validation passed")
+    log_totals(totals)
 
-    if verbose or not valid:
+    if details and (verbose or not totals.valid):
         for result in results:
-            for message in result.errors:
-                logger.error(f"  - {message}")
-            for message in result.warnings:
-                logger.warning(f"  - {message}")
-            for message in result.auto_fixes:
-                logger.info(f"  ✓ {message}")
+            log_details(result)
 
-    if fix_count:
-        logger.info(f"Applied {fix_count} auto-fixes")
+    if totals.fixes:
+        logger.info(f"Applied {totals.fixes} auto-fixes")
 
-    return valid
+    return totals.valid
 
 
 def validate_path(
@@ -203,6 +1016,8 @@ def validate_path(
     strict: bool = False,
     template_mode: bool = False,
     plugin_dirs: Optional[Iterable[str]] = None,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
 ) -> bool:
     path = Path(path_str)
     validator = Odoo18Validator(
@@ -211,6 +1026,8 @@ def validate_path(
         template_mode=template_mode,
         verbose=verbose,
         plugin_dirs=[Path(p) for p in plugin_dirs] if plugin_dirs else None,
+        jobs=jobs,
+        cache_dir=Path(cache_dir) if cache_dir else None,
     )
 
     results = (
@@ -218,31 +1035,77 @@ def validate_path(
         if path.is_dir()
         else validator.validate_file(path)
     )
+    validator.close()
 
     return _summarise_results(results, verbose)
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Neodoo18Framework Universal Validator")
-    parser.add_argument('path', nargs='?', help="File or directory to validate")
-    parser.add_argument('--auto-fix', action='store_true', help="Auto-fix issues when possible")
-    parser.add_argument('--verbose', '-v', action='store_true', help="Show detailed validation information")
-    parser.add_argument('--strict', action='store_true', help="Enable strict mode (promote selected warnings to errors)")
-    parser.add_argument('--template-mode', action='store_true', help="Permit template placeholders and missing optional files as warnings")
-    parser.add_argument('--plugins-dir', action='append', default=[], help="Additional directory to load validator plugins from")
-    parser.add_argument('--list-plugins', action='store_true', help="List available validator plugins and exit")
-
-    args = parser.parse_args()
-
-    validator = Odoo18Validator(
+def _build_validator(args: argparse.Namespace, *, cache_dir_absolute: bool = False) -> Odoo18Validator:
+    cache_dir = None if args.no_cache else Path(args.cache_dir)
+    if cache_dir is not None and cache_dir_absolute:
+        cache_dir = cache_dir.resolve()
+    return Odoo18Validator(
         auto_fix=args.auto_fix,
         strict=args.strict,
         template_mode=args.template_mode,
         verbose=args.verbose,
         plugin_dirs=[Path(p) for p in args.plugins_dir] if args.plugins_dir else None,
+        rule_packs=[Path(p) for p in args.rule_pack] if args.rule_pack else None,
+        jobs=args.jobs,
+        cache_dir=cache_dir,
+        fix_diff=args.fix_diff,
+        profile=args.profile,
+        timeout=args.timeout,
     )
 
+
+def _iter_request(
+    validator: Odoo18Validator,
+    method: str,
+    params: Dict[str, object],
+    *,
+    graph: Optional[ModuleGraph] = None,
+) -> Iterator[ValidationResult]:
+    """Run a CLI request in-process, streaming results; mirrors the daemon's methods."""
+    if method == 'validate_directory':
+        yield from validator.iter_validate(Path(str(params['path'])))
+        return
+    paths = [Path(path) for path in params['paths']]  # type: ignore[attr-defined]
+    if method == 'validate_modules':
+        for _, scope_results in validator.iter_modules(paths, graph=graph):
+            yield from scope_results
+        return
+    if method == 'validate_changes':
+        yield from validator.validate_changes(paths)
+        return
+    for _, scope_results in validator.iter_files(paths):
+        yield from scope_results
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(parser, args)
+    baseline, baseline_path = load_baseline(parser, args)
+    graph: Optional[ModuleGraph] = None
+
+    if args.lsp:
+        sys.exit(serve_stdio(lambda: _build_validator(args)))
+    if args.serve:
+        logger.info(f"Validator daemon listening on {args.socket}")
+        serve(_build_validator(args, cache_dir_absolute=True), Path(args.socket))
+        sys.exit(0)
+
+    if args.watch:
+        if not args.path or not Path(args.path).is_dir():
+            parser.error("--watch requires a directory path")
+        validator = _build_validator(args)
+        watch(validator, Path(args.path), polling=args.watch_polling)
+        validator.close()
+        sys.exit(0)
+
     if args.list_plugins:
+        validator = _build_validator(args)
         print("Available validator plugins:")
         for line in validator.list_plugins():
             print(f" - {line}")
@@ -252,24 +1115,51 @@ def main() -> None:
                 print(f" - {err}")
         sys.exit(0)
 
-    if not args.path:
-        parser.error("path is required unless --list-plugins is provided")
-
-    success = validate_path(
-        args.path,
-        auto_fix=args.auto_fix,
-        verbose=args.verbose,
-        strict=args.strict,
-        template_mode=args.template_mode,
-        plugin_dirs=args.plugins_dir,
-    )
+    if args.daemon and not _DAEMON_TRIED:
+        status = run_daemon_request(parser, args)
+        if status is not None:
+            sys.exit(status)
 
-    if success:
-        logger.info("✅ Validation successful!")
-        sys.exit(0)
+    if args.odoo_conf:
+        try:
+            addons_path = AddonsPath.from_conf(Path(args.odoo_conf))
+        except AddonsPathError as exc:
+            parser.error(str(exc))
+        modules = addons_path.modules()
+        for issue in addons_path.issues:
+            logger.warning(issue)
+        if not modules:
+            parser.error(f"No modules found on the addons_path of {args.odoo_conf}")
+        if args.verbose:
+            logger.info(f"{len(modules)} module(s) in {len(addons_path.directories)} addons director(ies) of {args.odoo_conf}")
+        graph = ModuleGraph(None if args.no_cache else Path(args.cache_dir) / 'modules.json')
+        graph.update(modules)
+        graph.save()
+        if args.changed_since:
+            try:
+                changed = changed_files(args.changed_since, Path(args.odoo_conf).resolve().parent)
+            except ChangeDetectionError as exc:
+                parser.error(str(exc))
+            touched = {name for name in map(graph.module_of, changed) if name is not None}
+            names = graph.order(graph.dependents(touched))
+            if args.verbose:
+                logger.info(f"{len(touched)} module(s) changed since {args.changed_since}; {len(names)} affected")
+        else:
+            names = graph.order()
+        if args.list_affected:
+            for name in names:
+                print(name)
+            sys.exit(0)
+        method, params = 'validate_modules', {'paths': [str(graph.roots[name]) for name in names]}
     else:
-        logger.error("❌ Validation failed!")
-        sys.exit(1)
+        method, params = file_request(parser, args)
+
+    started = time.perf_counter()
+    validator = _build_validator(args)
+    results = _iter_request(validator, method, params, graph=graph)
+    sys.exit(report_run(
+        args, results, method=method, baseline=baseline, baseline_path=baseline_path, started=started, validator=validator,
+    ))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""In-memory module files for validating generated code without touching disk."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Union
+
+from .inventory import FileInventory
+from .source import SourceFile
+
+PathLike = Union[str, Path]
+Content = Union[str, bytes]
+
+
+class VirtualFileTree:
+    """Files held in memory under a virtual ``root``, standing in for the disk.
+
+    Paths may be given relative to ``root`` (``'models/sale.py'``) or as
+    absolute paths below it; they are stored as ``root / relative``, the same
+    paths a directory run would report. Set as ``ValidationContext.files``,
+    the tree answers every ``get_source``, ``exists`` and ``inventory_for``
+    lookup of the run, so nothing is read from or written to disk.
+    """
+
+    def __init__(self, root: PathLike = '.', files: Optional[Mapping[PathLike, Content]] = None) -> None:
+        self.root = Path(root)
+        self._files: Dict[Path, bytes] = {}
+        self._dirs: Dict[Path, int] = {}  # directory -> number of files below it
+        for path, content in (files or {}).items():
+            self.add(path, content)
+
+    @classmethod
+    def from_directory(cls, directory: PathLike) -> "VirtualFileTree":
+        """Load every file of ``directory`` (pruned like a validator run) into memory."""
+        inventory = FileInventory.scan(Path(directory))
+        return cls(directory, {path: path.read_bytes() for path in inventory.files})
+
+    # ------------------------------------------------------------------
+    def add(self, path: PathLike, content: Content) -> Path:
+        """Add or replace a file; returns its full path."""
+        full = self.path(path)
+        if full not in self._files:
+            for parent in self._parents(full):
+                self._dirs[parent] = self._dirs.get(parent, 0) + 1
+        self._files[full] = content.encode('utf-8') if isinstance(content, str) else bytes(content)
+        return full
+
+    def remove(self, path: PathLike) -> None:
+        full = self.path(path)
+        if self._files.pop(full, None) is None:
+            return
+        for parent in self._parents(full):
+            self._dirs[parent] -= 1
+            if not self._dirs[parent]:
+                del self._dirs[parent]
+
+    def path(self, path: PathLike) -> Path:
+        """Full path of ``path`` in the tree; raises ``ValueError`` when it lies outside ``root``."""
+        path = Path(path)
+        if not path.is_absolute() and not (self.root.parts and path.parts[:len(self.root.parts)] == self.root.parts):
+            path = self.root / path
+        try:
+            relative = path.relative_to(self.root)
+        except ValueError:
+            raise ValueError(f"{path} is outside the virtual tree at {self.root}") from None
+        if '..' in relative.parts:
+            raise ValueError(f"{path} is outside the virtual tree at {self.root}")
+        return self.root / relative
+
+    # ------------------------------------------------------------------
+    def read_bytes(self, path: PathLike) -> bytes:
+        try:
+            return self._files[self.path(path)]
+        except (KeyError, ValueError):
+            raise FileNotFoundError(f"No such file in the virtual tree: {path}") from None
+
+    def read_text(self, path: PathLike) -> str:
+        return self.source(path).text
+
+    def source(self, path: PathLike) -> SourceFile:
+        full = self.path(path)
+        return SourceFile(full, self.read_bytes(full))
+
+    def is_file(self, path: PathLike) -> bool:
+        try:
+            return self.path(path) in self._files
+        except ValueError:
+            return False
+
+    def is_dir(self, path: PathLike) -> bool:
+        try:
+            full = self.path(path)
+        except ValueError:
+            return False
+        return full in self._dirs or (full == self.root and bool(self._files))
+
+    def exists(self, path: PathLike) -> bool:
+        return self.is_file(path) or self.is_dir(path)
+
+    @property
+    def files(self) -> List[Path]:
+        return sorted(self._files)
+
+    @property
+    def module_roots(self) -> List[Path]:
+        """Directories holding a ``__manifest__.py``."""
+        return sorted(path.parent for path in self._files if path.name == '__manifest__.py')
+
+    def module_root_of(self, path: PathLike) -> Optional[Path]:
+        """Nearest directory above ``path`` (or ``path`` itself) holding a ``__manifest__.py``."""
+        full = self.path(path)
+        for directory in (full, *full.parents):
+            if directory / '__manifest__.py' in self._files:
+                return directory
+            if directory == self.root:
+                break
+        return None
+
+    def inventory(self, directory: Optional[PathLike] = None) -> FileInventory:
+        """A ``FileInventory`` of the files below ``directory`` (default: the whole tree)."""
+        base = self.root if directory is None else self.path(directory)
+        files = [path for path in self._files if path == base or base in path.parents]
+        roots = [root for root in self.module_roots if root == base or base in root.parents]
+        return FileInventory(base, files, roots)
+
+    def write(self, target: Optional[PathLike] = None) -> List[Path]:
+        """Write the files below ``target`` (default: ``root``); returns the paths written."""
+        base = self.root if target is None else Path(target)
+        written: List[Path] = []
+        for path, data in sorted(self._files.items()):
+            destination = base / path.relative_to(self.root)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_bytes(data)
+            written.append(destination)
+        return written
+
+    # ------------------------------------------------------------------
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, (str, Path)) and self.is_file(path)
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _parents(self, path: Path) -> Iterator[Path]:
+        for parent in path.parents:
+            if parent == self.root or self.root in parent.parents:
+                yield parent
+            else:
+                break
@@ -0,0 +1,349 @@
+"""Watch a directory and revalidate only what changed.
+
+``validate.py --watch DIR`` validates the tree once, then keeps the validator
+loaded and reacts to file changes. It uses inotify on Linux, through ctypes so
+no extra dependency is needed, and polls modification times elsewhere. Bursts
+of events (an editor writing a temp file and renaming it, ``git checkout``)
+are debounced into one batch. Only the files in the batch are revalidated.
+Module-level checks are re-run for modules whose manifest, ``__init__.py`` or
+access file changed, and for modules that gained or lost files. Cross-module
+checks (XML ids, access rules, view fields) are re-run for every module with a
+revalidated or deleted file and kept apart from the per-file findings. Output
+is the difference from the previous state: new findings prefixed with ``+``
+and resolved ones with ``-``.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .inventory import DEFAULT_PRUNE, FileInventory
+
+# Files whose change can alter a module-level verdict.
+MODULE_TRIGGER_NAMES = frozenset({'__manifest__.py', '__init__.py', 'ir.model.access.csv'})
+
+Finding = Tuple[str, str]  # (severity, message)
+
+
+class PollingWatcher:
+    """Detect changes by comparing ``(mtime_ns, size)`` snapshots of a fresh inventory."""
+
+    def __init__(self, root: Path, *, interval: float = 1.0) -> None:
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        for path in FileInventory.scan(self.root).files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float]) -> Set[Path]:
+        """Paths created, modified or deleted, waiting up to ``timeout`` seconds (forever if None)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._take_snapshot()
+            previous, self._snapshot = self._snapshot, current
+            changed = {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            wait = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(wait)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Recursive inotify watch of ``root``; raises ``OSError`` where inotify is unavailable."""
+
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ATTRIB
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self, root: Path, *, prune: FrozenSet[str] = DEFAULT_PRUNE) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.prune = prune
+        self._dirs: Dict[int, Path] = {}
+        self._known_files: List[Path] = []
+        self._overflowed = False
+        self._watch_tree(root)
+
+    def _watch_tree(self, directory: Path) -> None:
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            wd = self._add_watch(self._fd, os.fsencode(current), self.MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    raise OSError(error, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                continue
+            self._dirs[wd] = current
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and entry.name not in self.prune:
+                            pending.append(Path(entry.path))
+            except OSError:
+                continue
+
+    def poll(self, timeout: Optional[float]) -> Set[Path]:
+        """Paths touched by events arriving within ``timeout`` seconds (forever if None)."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed: Set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                self._handle_event(wd, mask, os.fsdecode(name), changed)
+        if self._overflowed:
+            # Events were dropped: report every file so the caller rescans.
+            self._overflowed = False
+            changed.update(FileInventory.scan(self.root).files)
+        return changed
+
+    def _handle_event(self, wd: int, mask: int, name: str, changed: Set[Path]) -> None:
+        if mask & self.IN_Q_OVERFLOW:
+            self._overflowed = True
+            return
+        directory = self._dirs.get(wd)
+        if mask & self.IN_IGNORED:
+            self._dirs.pop(wd, None)
+            return
+        if directory is None or not name:
+            return
+        path = directory / name
+        if mask & self.IN_ISDIR:
+            if name in self.prune:
+                return
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._watch_tree(path)
+                # Files may have landed before the watch was in place.
+                changed.update(FileInventory.scan(path).files)
+            elif mask & self.IN_MOVED_FROM:
+                changed.update(known for known in self._known_files if path in known.parents)
+            return
+        changed.add(path)
+
+    def remember(self, files: List[Path]) -> None:
+        """Record the current files so a directory moved away can be reported as deleted."""
+        self._known_files = files
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(root: Path, *, polling: bool = False, interval: float = 1.0) -> Any:
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval=interval)
+
+
+def _findings(results: List[Any]) -> Set[Finding]:
+    findings: Set[Finding] = set()
+    for result in results:
+        findings.update(('error', message) for message in result.errors)
+        findings.update(('warning', message) for message in result.warnings)
+        findings.update(('fix', message) for message in result.auto_fixes)
+    return findings
+
+
+class WatchSession:
+    """Current findings per scope (file or module root) and the diffs between runs.
+
+    ``symbol_state`` holds the cross-module findings, per absolute module root.
+    """
+
+    def __init__(self, validator: Any, root: Path, emit: Callable[[str], None] = print) -> None:
+        self.validator = validator
+        self.root = root
+        self.emit = emit
+        self.state: Dict[Path, Set[Finding]] = {}
+        self.symbol_state: Dict[Path, Set[Finding]] = {}
+        self.inventory = FileInventory.scan(root)
+
+    def initial_run(self) -> None:
+        inventory = self.inventory
+        roots = set(inventory.module_roots)
+        self._apply(
+            self.validator.iter_files(inventory.files, module_checks=roots, modules=sorted(roots), symbol_checks=False),
+            module_roots=roots,
+            quiet=True,
+        )
+        self._summary("Initial validation")
+
+    def process(self, changed: Set[Path]) -> None:
+        """Revalidate ``changed`` paths and print what appeared or disappeared."""
+        self.validator._module_roots.clear()
+        previous = self.inventory
+        if any((path in previous) != path.is_file() for path in changed):
+            self.inventory = FileInventory.scan(self.root)
+        inventory = self.inventory
+
+        files: List[Path] = []
+        removed: List[Path] = []
+        module_roots: Set[Path] = set()
+        for path in sorted(changed):
+            exists = path in inventory
+            root = inventory.module_root_of(path) if exists else self._module_of_removed(path)
+            if not exists:
+                removed.append(path)
+                if path in self.state:
+                    self._update(path, set())
+                if path in previous and root is not None:
+                    module_roots.add(root)
+                continue
+            files.append(path)
+            if root is not None and (path.name in MODULE_TRIGGER_NAMES or path not in previous):
+                module_roots.add(root)
+
+        # Modules that disappeared entirely take their findings with them.
+        for scope in [scope for scope in self.state if not scope.exists()]:
+            self._update(scope, set())
+        for root in [root for root in self.symbol_state if not root.exists()]:
+            self._update(root, set(), state=self.symbol_state)
+        module_roots = {root for root in module_roots if root.is_dir()}
+        self.validator.forget_files(removed)
+
+        if not files and not module_roots:
+            self._apply_symbols()
+            return
+        self._apply(
+            self.validator.iter_files(files, module_checks=module_roots, modules=sorted(module_roots), symbol_checks=False),
+            module_roots=module_roots,
+        )
+        self._summary(f"Revalidated {len(files)} file(s)")
+
+    # ------------------------------------------------------------------
+    def _module_of_removed(self, path: Path) -> Optional[Path]:
+        parent = path.parent
+        while not parent.exists() and parent != parent.parent:
+            parent = parent.parent
+        return self.inventory.module_root_of(parent)
+
+    def _apply(self, scoped_results: Any, *, module_roots: Set[Path], quiet: bool = False) -> None:
+        collected: Dict[Path, Set[Finding]] = {}
+        for scope, results in scoped_results:
+            # Module scopes only carry a full verdict when their checks ran.
+            if scope.is_dir() and scope not in module_roots:
+                continue
+            collected.setdefault(scope, set()).update(_findings(results))
+        for scope, findings in collected.items():
+            self._update(scope, findings, quiet=quiet)
+        self._apply_symbols(quiet=quiet)
+
+    def _apply_symbols(self, *, quiet: bool = False) -> None:
+        """Replace the cross-module findings of every module the validator just checked."""
+        for root, results in self.validator.check_symbols().items():
+            self._update(root, _findings(results), quiet=quiet, state=self.symbol_state)
+
+    def _update(
+        self,
+        scope: Path,
+        findings: Set[Finding],
+        *,
+        quiet: bool = False,
+        state: Optional[Dict[Path, Set[Finding]]] = None,
+    ) -> None:
+        state = self.state if state is None else state
+        old = state.get(scope, set())
+        if findings:
+            state[scope] = findings
+        else:
+            state.pop(scope, None)
+        added = sorted(findings - old)
+        removed = sorted(old - findings)
+        if quiet or not (added or removed):
+            return
+        self.emit(str(scope) if state is self.state else f"{os.path.relpath(scope)} (cross-module checks)")
+        for severity, message in removed:
+            self.emit(f"  - {severity}: {message}")
+        for severity, message in added:
+            self.emit(f"  + {severity}: {message}")
+
+    def _summary(self, label: str) -> None:
+        buckets = [*self.state.values(), *self.symbol_state.values()]
+        errors = sum(1 for findings in buckets for severity, _ in findings if severity == 'error')
+        warnings = sum(1 for findings in buckets for severity, _ in findings if severity == 'warning')
+        self.emit(f"{label}: {errors} errors, {warnings} warnings")
+
+
+def watch(
+    validator: Any,
+    root: Path,
+    *,
+    polling: bool = False,
+    interval: float = 1.0,
+    debounce: float = 0.2,
+    emit: Callable[[str], None] = print,
+) -> None:
+    """Validate ``root`` and keep revalidating changes until interrupted."""
+    session = WatchSession(validator, root, emit)
+    watcher = create_watcher(root, polling=polling, interval=interval)
+    emit(f"Watching {root} ({'polling' if isinstance(watcher, PollingWatcher) else 'inotify'})")
+    try:
+        session.initial_run()
+        while True:
+            if isinstance(watcher, InotifyWatcher):
+                watcher.remember(session.inventory.files)
+            changed = watcher.poll(None)
+            # Debounce: keep collecting until the tree has been quiet for ``debounce`` seconds.
+            while True:
+                more = watcher.poll(debounce)
+                if not more:
+                    break
+                changed |= more
+            session.process(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
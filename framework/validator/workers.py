@@ -0,0 +1,233 @@
+"""Time budgets and killable worker processes (``validate.py --timeout``).
+
+A budget is enforced at two levels. Inside the process running a plugin,
+``time_budget`` arms ``SIGALRM`` so a plugin that overruns is interrupted
+with ``FileTimeout``. This covers slow Python code and backtracking
+regexes, because the ``re`` engine checks for signals. ``blame`` then names
+the rule that was running, from the interrupted frames. Code that never
+returns to the interpreter cannot be interrupted that way, so with a budget
+the files are validated in ``WorkerPool`` processes. The parent kills and
+replaces any worker that misses its deadline. Each worker publishes the
+index of the plugin it is running in shared memory (``mark``), so a killed
+task can still be attributed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import os
+import signal
+import sysconfig
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from types import TracebackType
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+_CAN_ALARM = hasattr(signal, 'SIGALRM') and hasattr(signal, 'setitimer')
+_STDLIB = sysconfig.get_paths().get('stdlib', '')
+
+# Index of the plugin the current worker is running (-1 between plugins); set in workers only.
+_ACTIVITY: Optional[Any] = None
+
+
+class FileTimeout(BaseException):
+    """Raised in a plugin that exceeded its time budget.
+
+    Derives from ``BaseException`` so ``except Exception`` handlers in
+    plugins do not swallow it.
+    """
+
+
+def _raise_timeout(signum: int, frame: Any) -> None:
+    raise FileTimeout()
+
+
+@contextlib.contextmanager
+def time_budget(seconds: float) -> Iterator[None]:
+    """Raise ``FileTimeout`` in the body once it ran for ``seconds``.
+
+    Only effective in the main thread of platforms with ``SIGALRM``;
+    elsewhere the body runs unbounded (workers still bound it by killing).
+    """
+    if not _CAN_ALARM or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def blame(tb: Optional[TracebackType]) -> Optional[str]:
+    """Describe what was running when ``tb`` was interrupted.
+
+    Returns ``"rule <id>"`` when an interrupted frame holds a ``rule_id`` or
+    ``rule_name`` string or a ``rule`` with an ``id`` (the innermost one
+    wins); otherwise the innermost frame outside the standard library.
+    """
+    rule: Optional[str] = None
+    where: Optional[str] = None
+    while tb is not None:
+        frame = tb.tb_frame
+        names = frame.f_locals
+        for name in ('rule_id', 'rule_name'):
+            if isinstance(names.get(name), str):
+                rule = names[name]
+        rule_id = getattr(names.get('rule'), 'id', None)
+        if isinstance(rule_id, str):
+            rule = rule_id
+        filename = frame.f_code.co_filename
+        if filename != __file__ and not (_STDLIB and filename.startswith(_STDLIB)):
+            where = f"{frame.f_code.co_name}() at {os.path.basename(filename)}:{tb.tb_lineno}"
+        tb = tb.tb_next
+    return f"rule {rule}" if rule else where
+
+
+def mark(index: int) -> None:
+    """Publish the plugin index the current worker is about to run."""
+    if _ACTIVITY is not None:
+        _ACTIVITY.value = index
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class Outcome:
+    """What a worker made of one task: its value, or the plugin it was killed in."""
+
+    value: Any = None
+    killed: bool = False
+    crashed: bool = False  # the worker died on its own rather than being killed
+    activity: int = -1
+    seconds: float = 0.0  # from sending the task to its reply (or kill)
+
+
+class _Worker:
+    __slots__ = ('process', 'conn', 'activity', 'task', 'started', 'deadline')
+
+    def __init__(self, process: Any, conn: Connection, activity: Any) -> None:
+        self.process = process
+        self.conn = conn
+        self.activity = activity
+        self.task: Optional[int] = None
+        self.started = 0.0
+        self.deadline = 0.0
+
+
+def _worker_main(conn: Connection, activity: Any, target: Callable[[Any], Any], initializer: Optional[Callable[[], None]]) -> None:
+    global _ACTIVITY
+    _ACTIVITY = activity
+    if initializer is not None:
+        initializer()
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        activity.value = -1
+        try:
+            reply = (True, target(task))
+        except BaseException as exc:  # reported to the parent, which re-raises it
+            reply = (False, f"{type(exc).__name__}: {exc}\n{traceback.format_exc()}")
+        activity.value = -1
+        conn.send(reply)
+
+
+class WorkerPool:
+    """Forked processes that run ``target`` on one task at a time and can be killed mid-task.
+
+    Unlike ``ProcessPoolExecutor``, killing a worker does not break the
+    pool: the worker is replaced and the other tasks carry on.
+    """
+
+    def __init__(self, size: int, target: Callable[[Any], Any], *, initializer: Optional[Callable[[], None]] = None) -> None:
+        self._context = multiprocessing.get_context('fork')
+        self._target = target
+        self._initializer = initializer
+        self._workers: List[_Worker] = [self._spawn() for _ in range(max(1, size))]
+
+    def map(self, tasks: Sequence[Any], deadlines: Sequence[float]) -> List[Outcome]:
+        """Run ``tasks``, killing any worker still busy ``deadlines[i]`` seconds after starting task i."""
+        outcomes: List[Optional[Outcome]] = [None] * len(tasks)
+        pending: Deque[int] = deque(range(len(tasks)))
+        busy: Dict[Connection, _Worker] = {}
+
+        while pending or busy:
+            for worker in self._workers:
+                if not pending:
+                    break
+                if worker.task is None:
+                    worker.task = pending.popleft()
+                    worker.started = time.monotonic()
+                    worker.deadline = worker.started + deadlines[worker.task]
+                    worker.conn.send(tasks[worker.task])
+                    busy[worker.conn] = worker
+
+            next_deadline = min(worker.deadline for worker in busy.values())
+            for conn in wait(list(busy), timeout=max(0.0, next_deadline - time.monotonic())):
+                worker = busy.pop(conn)  # type: ignore[arg-type]
+                index, worker.task = worker.task, None
+                try:
+                    ok, value = conn.recv()  # type: ignore[union-attr]
+                except (EOFError, OSError):
+                    seconds = time.monotonic() - worker.started
+                    outcomes[index] = Outcome(crashed=True, activity=worker.activity.value, seconds=seconds)  # type: ignore[index]
+                    self._replace(worker)
+                    continue
+                if not ok:
+                    raise RuntimeError(f"Validator worker failed:\n{value}")
+                outcomes[index] = Outcome(value, seconds=time.monotonic() - worker.started)  # type: ignore[index]
+
+            now = time.monotonic()
+            for conn, worker in list(busy.items()):
+                if worker.deadline <= now:
+                    del busy[conn]
+                    outcomes[worker.task] = Outcome(killed=True, activity=worker.activity.value, seconds=now - worker.started)  # type: ignore[index]
+                    worker.task = None
+                    self._replace(worker)
+        return outcomes  # type: ignore[return-value]
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Stop every worker (same signature as ``ProcessPoolExecutor.shutdown``)."""
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            if wait:
+                worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.conn.close()
+        self._workers = []
+
+    # ------------------------------------------------------------------
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        activity = self._context.RawValue('i', -1)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, activity, self._target, self._initializer),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn, activity)
+
+    def _replace(self, worker: _Worker) -> None:
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        self._workers[self._workers.index(worker)] = self._spawn()
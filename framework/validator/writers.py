@@ -0,0 +1,154 @@
+"""Streaming output writers for machine-readable reports (``--format``).
+
+Each writer receives ``ValidationResult`` objects one at a time through
+``write`` and emits them right away. Only what the format's trailer needs is
+kept until ``close``: SARIF's rule table and JUnit's totals, with the JUnit
+test cases spooled to a temporary file.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from typing import Dict, List, Optional, TextIO, Type
+from xml.sax.saxutils import escape, quoteattr
+
+from .diagnostics import ERROR, FIX, WARNING
+from .plugin import ValidationResult
+
+TOOL_NAME = 'neodoo-validator'
+
+
+def _path_text(path: object) -> Optional[str]:
+    if path is None:
+        return None
+    return str(path).replace('\\', '/')
+
+
+class DiagnosticWriter:
+    """Base writer: ``write`` each result as it is produced, then ``close``."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def write(self, result: ValidationResult) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class JsonLinesWriter(DiagnosticWriter):
+    """One JSON object per finding."""
+
+    def write(self, result: ValidationResult) -> None:
+        store = result.diagnostics
+        for index in range(len(store)):
+            data = store[index].to_dict()
+            data['path'] = _path_text(store.paths[index])
+            self.stream.write(json.dumps(data, ensure_ascii=False))
+            self.stream.write('\n')
+
+
+class SarifWriter(DiagnosticWriter):
+    """SARIF 2.1.0 log with one run.
+
+    Results are streamed as they arrive. The ``tool`` section, which lists
+    every rule seen, is written after them; JSON object members are unordered,
+    so consumers read the log the same way.
+    """
+
+    LEVELS = {ERROR: 'error', WARNING: 'warning', FIX: 'note'}
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._rules: Dict[str, int] = {}
+        self._first = True
+        self.stream.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+            '"version": "2.1.0", "runs": [{"results": ['
+        )
+
+    def write(self, result: ValidationResult) -> None:
+        store = result.diagnostics
+        for index in range(len(store)):
+            diagnostic = store[index]
+            rule = diagnostic.rule or 'general'
+            rule_index = self._rules.setdefault(rule, len(self._rules))
+            sarif_result: Dict[str, object] = {
+                'ruleId': rule,
+                'ruleIndex': rule_index,
+                'level': self.LEVELS[store.severities[index]],
+                'message': {'text': diagnostic.message},
+            }
+            path = _path_text(diagnostic.path)
+            if path is not None:
+                physical: Dict[str, object] = {'artifactLocation': {'uri': path}}
+                if diagnostic.line:
+                    region: Dict[str, int] = {'startLine': diagnostic.line}
+                    if diagnostic.col:
+                        region['startColumn'] = diagnostic.col
+                    physical['region'] = region
+                sarif_result['locations'] = [{'physicalLocation': physical}]
+            self.stream.write('' if self._first else ', ')
+            self.stream.write(json.dumps(sarif_result, ensure_ascii=False))
+            self._first = False
+
+    def close(self) -> None:
+        rules = [{'id': rule} for rule in sorted(self._rules, key=self._rules.__getitem__)]
+        tool = {'driver': {'name': TOOL_NAME, 'informationUri': 'https://github.com/neoand/neodoo18framework', 'rules': rules}}
+        self.stream.write('], "tool": ' + json.dumps(tool) + '}]}\n')
+        super().close()
+
+
+class JUnitWriter(DiagnosticWriter):
+    """JUnit XML with a test case per file and result; errors fail it, warnings go to system-out.
+
+    The suite header carries totals, so test cases are spooled to a temporary
+    file and copied behind the header on ``close``.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self._spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.tests = 0
+        self.failures = 0
+
+    def write(self, result: ValidationResult) -> None:
+        store = result.diagnostics
+        by_path: Dict[str, List[List[str]]] = {}
+        for index in range(len(store)):
+            path = _path_text(store.paths[index]) or '(run)'
+            by_path.setdefault(path, [[], [], []])[store.severities[index]].append(store[index].message)
+        for path, (errors, warnings, fixes) in by_path.items():
+            self.tests += 1
+            self._spool.write(f'<testcase classname="{TOOL_NAME}" name={quoteattr(path)}>')
+            if errors:
+                self.failures += 1
+                self._spool.write(
+                    f'<failure message={quoteattr(errors[0])} type="error">{escape(chr(10).join(errors))}</failure>'
+                )
+            if warnings or fixes:
+                self._spool.write(f'<system-out>{escape(chr(10).join(warnings + fixes))}</system-out>')
+            self._spool.write('</testcase>\n')
+
+    def close(self) -> None:
+        self.stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.stream.write(
+            f'<testsuites name="{TOOL_NAME}" tests="{self.tests}" failures="{self.failures}">\n'
+            f'<testsuite name="{TOOL_NAME}" tests="{self.tests}" failures="{self.failures}" errors="0">\n'
+        )
+        self._spool.seek(0)
+        shutil.copyfileobj(self._spool, self.stream)
+        self.stream.write('</testsuite>\n</testsuites>\n')
+        self._spool.close()
+        super().close()
+
+
+WRITERS: Dict[str, Type[DiagnosticWriter]] = {
+    'jsonl': JsonLinesWriter,
+    'sarif': SarifWriter,
+    'junit': JUnitWriter,
+}
+